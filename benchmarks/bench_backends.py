@@ -0,0 +1,39 @@
+"""Compare the thread, interpreter and process backends of `scan_parallel()`.
+
+The interpreter backend needs Python 3.14; on older versions it falls
+back to the process pool, so those two rows should read alike.
+"""
+
+import os
+import sys
+import timeit
+
+import re101
+
+PATTERNS = ['EMAIL', 'IPV4', 'STRICT_SSN']
+DOCS = [
+    f'{i} login u{i}@example.com from 10.1.{i % 256}.7 ssn 123-45-{i % 10000:04d} ' * 20
+    for i in range(5_000)
+]
+
+
+def main() -> None:
+    workers = os.cpu_count() or 1
+    print(f'{sys.version.split()[0]}, {workers} workers, {len(DOCS):,} documents')
+    base = min(timeit.repeat(lambda: [re101.scan(d, PATTERNS) for d in DOCS], number=1, repeat=3))
+    print(f'serial scan():  {base:.3f}s')
+    for backend in ('thread', 'interpreter', 'process'):
+        t = min(
+            timeit.repeat(
+                lambda backend=backend: re101.scan_parallel(
+                    DOCS, PATTERNS, threads=workers, backend=backend
+                ),
+                number=1,
+                repeat=3,
+            )
+        )
+        print(f'{backend:<12}    {t:.3f}s  ({base / t:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
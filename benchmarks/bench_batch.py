@@ -0,0 +1,45 @@
+"""Compare a per-value Python loop with `re101.batch` on a column of short strings.
+
+Both sides produce the same columns: first-match spans for search, and
+(index, start, end, match) for findall.
+"""
+
+import sys
+import timeit
+
+import re101
+from re101 import batch
+
+VALUES = [f'{i:05d}' if i % 3 else f'ZIP {i:05d}-1234' for i in range(1_000_000)]
+
+
+def loop_search(regex):
+    spans = []
+    for v in VALUES:
+        m = regex.search(v)
+        spans.append(m.span() if m else (-1, -1))
+    return spans
+
+
+def loop_findall(regex):
+    return [(i, *m.span(), m.group()) for i, v in enumerate(VALUES) for m in regex.finditer(v)]
+
+
+def main() -> None:
+    print(f'{sys.version.split()[0]}, {len(VALUES):,} values')
+    regex = re101.US_ZIPCODE
+    rows = [
+        ('loop search()', lambda: loop_search(regex)),
+        ('batch.search()', lambda: batch.search(regex, VALUES)),
+        ('loop finditer()', lambda: loop_findall(regex)),
+        ('batch.findall()', lambda: batch.findall(regex, VALUES)),
+        ('loop count', lambda: [sum(1 for _ in regex.finditer(v)) for v in VALUES]),
+        ('batch.count()', lambda: batch.count(regex, VALUES)),
+    ]
+    for label, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{label:<18} {t:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compare scanning `readinto()` buffers in place with slicing and decoding them.
+
+Usage: python benchmarks/bench_buffers.py [PACKETS]   (default 2,000)
+"""
+
+import io
+import sys
+import timeit
+
+import re101
+
+PATTERNS = ['EMAIL', 'IPV4', 'STRICT_SSN']
+PACKET_SIZE = 16 << 10
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    line = b'GET /api/v1/items?id=42 from 10.0.3.7 user ops@example.com ssn 123-45-6789\n'
+    stream = line * (PACKET_SIZE * n // len(line))
+    buf = bytearray(PACKET_SIZE)
+    view = memoryview(buf)
+    print(f'{sys.version.split()[0]}, {len(stream) / 1e6:.0f} MB in {PACKET_SIZE:,}-byte reads')
+
+    def copied():
+        f = io.BytesIO(stream)
+        while size := f.readinto(buf):
+            re101.scan(bytes(buf[:size]).decode(), PATTERNS)
+
+    def in_place():
+        f = io.BytesIO(stream)
+        while size := f.readinto(buf):
+            re101.scan(view, PATTERNS, 0, size)
+
+    def count_in_place():
+        f = io.BytesIO(stream)
+        while size := f.readinto(buf):
+            re101.count(view[:size], PATTERNS)
+
+    for name, fn in [
+        ('slice + decode', copied),
+        ('memoryview window', in_place),
+        ('count(), in place', count_in_place),
+    ]:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{name:<18} {t:.3f}s  {len(stream) / t / 1e6:6.1f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
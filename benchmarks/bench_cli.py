@@ -0,0 +1,71 @@
+"""Compare `python -m re101 scan` with `grep -P -o -b` on a generated log.
+
+Usage: python benchmarks/bench_cli.py [LINES]   (default 500,000)
+
+Both write every match with its byte offset, so the work is comparable;
+grep is skipped where it is missing or built without -P.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# The same expressions as re101's constants, for grep.
+GREP_PATTERNS = {
+    'EMAIL': r'[\w.+-]+@[\w-]+\.[\w.-]+',
+    'IPV4': r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
+}
+
+
+def timed(argv: list[str], out: Path) -> float:
+    # Not /dev/null: GNU grep notices it and stops at the first match.
+    with out.open('wb') as f:
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=f, check=False)
+        return time.perf_counter() - start
+
+
+def has_grep_p() -> bool:
+    if shutil.which('grep') is None:
+        return False
+    proc = subprocess.run(['grep', '-P', 'x', os.devnull], capture_output=True, check=False)
+    return proc.returncode in (0, 1)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'access.log'
+        path.write_text(
+            ''.join(
+                f'GET /p/{i} from 10.0.{i % 256}.7 user u{i}@example.com 200\n' for i in range(n)
+            )
+        )
+        size = path.stat().st_size
+        print(f'{sys.version.split()[0]}, {n:,} lines, {size / 1e6:.1f} MB')
+        cli = [sys.executable, '-m', 're101', 'scan']
+        rows = [
+            ('startup (no input)', [*cli, '-p', 'EMAIL', os.devnull]),
+            ('re101 scan', [*cli, '-p', 'EMAIL,IPV4', str(path)]),
+            ('re101 scan --count', [*cli, '-p', 'EMAIL,IPV4', '--count', str(path)]),
+            ('re101 scan --any', [*cli, '-p', 'EMAIL,IPV4', '--any', str(path)]),
+        ]
+        if has_grep_p():
+            # grep -P takes a single pattern, so alternate them.
+            regex = '|'.join(f'(?:{p})' for p in GREP_PATTERNS.values())
+            rows.append(('grep -P -o -b', ['grep', '-P', '-o', '-b', regex, str(path)]))
+            rows.append(('grep -P -c', ['grep', '-P', '-c', regex, str(path)]))
+            rows.append(('grep -P -q', ['grep', '-P', '-q', regex, str(path)]))
+        else:
+            print('grep -P is not available; skipping it')
+        for label, argv in rows:
+            t = min(timed(argv, Path(tmp) / 'out') for _ in range(3))
+            print(f'{label:<20} {t:.3f}s  {size / t / 1e6:8.1f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Compare decompress-then-scan with `scan_file()` on a gzip-compressed log."""
+
+import gzip
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import re101
+
+PATTERNS = ['EMAIL', 'IPV4']
+LINES = 200_000
+
+
+def main() -> None:
+    data = ''.join(
+        f'{i} GET /a from 10.1.{i % 256}.7 by u{i}@example.com\n' for i in range(LINES)
+    ).encode()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'access.log.gz'
+        path.write_bytes(gzip.compress(data))
+        print(f'{sys.version.split()[0]}, {len(data) / 1e6:.1f} MB uncompressed')
+
+        def decompress_then_scan() -> int:
+            plain = Path(tmp) / 'access.log'
+            plain.write_bytes(gzip.decompress(path.read_bytes()))
+            return len(re101.scan(plain.read_text(), PATTERNS))
+
+        base = min(timeit.repeat(decompress_then_scan, number=1, repeat=3))
+        print(f'decompress to disk + scan(): {base:.3f}s')
+        t = min(
+            timeit.repeat(
+                lambda: sum(1 for _ in re101.scan_file(path, PATTERNS)), number=1, repeat=3
+            )
+        )
+        print(f'scan_file():                 {t:.3f}s  ({base / t:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
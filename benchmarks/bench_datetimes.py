@@ -0,0 +1,55 @@
+"""Compare `re101.extract_datetimes()` with parsing each match as a string.
+
+dateutil is timed too when it is installed.
+
+Usage: python benchmarks/bench_datetimes.py [LINES]   (default 1,000,000)
+"""
+
+import datetime as dt
+import sys
+import timeit
+
+import re101
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    text = '\n'.join(
+        f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d} {i % 24:02d}:{i % 60:02d}:{i % 60:02d},{i % 1000:03d}'
+        f' INFO worker-{i % 8} handled request {i}'
+        for i in range(n)
+    )
+    finditer = re101.DATETIME.finditer
+    rows = [
+        ('extract_datetimes()', lambda: re101.extract_datetimes(text)),
+        (
+            'datetime(*groups)',
+            lambda: [(re101._datetime_from_groups(m), *m.span()) for m in finditer(text)],
+        ),
+        (
+            'fromisoformat()',
+            lambda: [
+                (dt.datetime.fromisoformat(m.group().replace(',', '.')), *m.span())
+                for m in finditer(text)
+            ],
+        ),
+    ]
+    try:
+        from dateutil import parser
+    except ImportError:
+        pass
+    else:
+        rows.append(
+            (
+                'dateutil parse()',
+                lambda: [(parser.parse(m.group()), *m.span()) for m in finditer(text)],
+            )
+        )
+    print(f'{sys.version.split()[0]}, {n:,} lines')
+    for label, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{label:<20} {t:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
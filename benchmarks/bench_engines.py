@@ -0,0 +1,42 @@
+"""Time each installed regex engine on the package's patterns.
+
+For every engine in `re101.engines.available()`, each constant is
+compiled through it (falling back to `re` where it cannot be) and
+searched over the same text.
+
+Usage: python benchmarks/bench_engines.py [LINES]   (default 20,000)
+"""
+
+import sys
+import timeit
+
+from re101 import engines
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    text = ''.join(
+        f'{i} 2024-01-05T10:04:{i % 60:02d}Z GET https://example.com/a?{i} from 10.0.{i % 256}.1 '
+        f'user u{i}@example.com paid $1,{i % 1000:03d}.00 zip 94107 ssn 123-45-6789\n'
+        for i in range(n)
+    )
+    print(f'{sys.version.split()[0]}, {len(text):,} characters, engines: {engines.available()}')
+    results = {}
+    for engine in engines.available():
+        fallbacks = [k for k, v in engines.check(engine).items() if v is not None]
+        compiled = engines.compile_all(engine)
+        times = {}
+        for name, regex in compiled.items():
+            times[name] = min(
+                timeit.repeat(lambda r=regex: sum(1 for _ in r.finditer(text)), number=1, repeat=3)
+            )
+        results[engine] = times
+        print(f'{engine:<6} total {sum(times.values()):.3f}s, fell back to re: {len(fallbacks)}')
+    names = sorted(results['re'], key=results['re'].get, reverse=True)
+    print(f'\n{"pattern":<22}' + ''.join(f'{e:>9}' for e in results))
+    for name in names:
+        print(f'{name:<22}' + ''.join(f'{results[e][name]:>8.3f}s' for e in results))
+
+
+if __name__ == '__main__':
+    main()
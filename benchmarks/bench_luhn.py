@@ -0,0 +1,38 @@
+"""Compare a digit-by-digit Luhn check with `re101.validate.luhn_many()`.
+
+Usage: python benchmarks/bench_luhn.py [N]   (default 1,000,000 candidates)
+"""
+
+import random
+import sys
+import timeit
+
+from re101 import validate
+
+
+def digit_loop(number):
+    total = 0
+    for i, c in enumerate(reversed(number.replace(' ', '').replace('-', ''))):
+        d = int(c)
+        if i % 2:
+            d = d * 2 - 9 if d > 4 else d * 2
+        total += d
+    return total % 10 == 0
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(0)
+    values = ['-'.join(''.join(rng.choices('0123456789', k=4)) for _ in range(4)) for _ in range(n)]
+    print(f'{sys.version.split()[0]}, {n:,} candidates')
+    rows = [
+        ('digit loop', lambda: [digit_loop(v) for v in values]),
+        ('luhn_many()', lambda: validate.luhn_many(values)),
+    ]
+    for label, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{label:<12} {t:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Compare `scan()` with and without a `LineMemo` on repetitive and unique logs.
+
+Usage: python benchmarks/bench_memo.py [LINES]   (default 500,000)
+"""
+
+import sys
+import timeit
+
+import re101
+
+PATTERNS = ['EMAIL', 'IPV4', 'US_ZIPCODE', 'STRICT_SSN', 'DATETIME']
+
+
+def bench(label: str, text: str) -> None:
+    memo = re101.LineMemo()
+    rows = [
+        ('scan()', lambda: re101.scan(text, PATTERNS)),
+        ('scan(memo=...)', lambda: re101.scan(text, PATTERNS, memo=memo)),
+    ]
+    for name, fn in rows:
+        memo.clear()
+        t = timeit.timeit(fn, number=1)
+        print(f'{label:<11} {name:<15} {t:.3f}s')
+    print(f'{"":<11} {memo!r}')
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    templates = [
+        'GET /healthz from 10.0.0.1 200 ok - kube-probe/1.29\n',
+        '  at com.example.Service.handle(Service.java:42) for ops@example.com\n',
+        'INFO worker heartbeat, queue depth 0, zip 94107\n',
+    ]
+    repetitive = ''.join(
+        templates[i % 3] if i % 100 else f'user{i}@example.com\n' for i in range(n)
+    )
+    unique = ''.join(f'request {i} from 10.{i % 256}.0.1 by u{i}@example.com\n' for i in range(n))
+    print(f'{sys.version.split()[0]}, {n:,} lines')
+    bench('repetitive', repetitive)
+    bench('unique', unique)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Compare converting `MONEY` matches one at a time with `re101.extract_money()`.
+
+Usage: python benchmarks/bench_money.py [LINES]   (default 200,000)
+"""
+
+import decimal
+import sys
+import timeit
+
+import re101
+
+
+def loop(text):
+    return [
+        (
+            m['prefix'] or m['suffix'],
+            decimal.Decimal((m['minus'] or '') + m['amount'].replace(',', '')),
+            *m.span(),
+        )
+        for m in re101.MONEY.finditer(text)
+    ]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    text = '\n'.join(
+        f'invoice {i}: ${i * 37 % 100000:,}.{i % 100:02d} due, {i % 500} € paid' for i in range(n)
+    )
+    print(f'{sys.version.split()[0]}, {len(text):,} characters')
+    rows = [
+        ('Decimal() per match', lambda: loop(text)),
+        ('extract_money()', lambda: re101.extract_money(text)),
+        ('columns=True', lambda: re101.extract_money(text, columns=True)),
+    ]
+    for label, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{label:<20} {t:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
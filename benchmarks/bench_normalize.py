@@ -0,0 +1,62 @@
+"""Compare `normalize()` with the step-by-step cleanup it replaces.
+
+Usage: python benchmarks/bench_normalize.py [LINES]   (default 50,000)
+"""
+
+import sys
+import timeit
+import tracemalloc
+import unicodedata
+
+import re101
+
+
+def legacy(text: str) -> str:
+    text = re101.MULT_WHITESPACE.sub(' ', text)
+    text = re101.MULT_SPACES.sub(' ', text)
+    text = text.casefold()
+    return unicodedata.normalize('NFKC', text)
+
+
+def peak(fn) -> int:
+    tracemalloc.start()
+    fn()
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return top
+
+
+def bench(label: str, text: str) -> None:
+    normalized = re101.normalize(text, casefold=True, unicode='NFKC')
+    matches = re101.scan(normalized.text, 'IPV4')
+
+    def map_back():
+        # A fresh result each time, so that its offset map is rebuilt.
+        n = re101.normalize(text, casefold=True, unicode='NFKC')
+        return n.map_matches(matches)
+
+    rows = [
+        ('step by step', lambda: legacy(text)),
+        ('normalize()', lambda: re101.normalize(text, casefold=True, unicode='NFKC')),
+        ("normalize('all')", lambda: re101.normalize(text, 'all', True, 'NFKC')),
+        (f'+ map {len(matches):,} back', map_back),
+    ]
+    for name, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        # Timed apart from the run under tracemalloc, which slows it.
+        print(f'{label:<8} {name:<20} {t:.3f}s  peak {peak(fn) / 1e6:6.1f} MB')
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    ascii_text = ''.join(f'Row {i}  From  U{i}@Example.COM\t\tto  10.0.0.1\n' for i in range(n))
+    spaces = ascii_text.replace('\t', ' ').replace('\n', ' ').strip()
+    other = ''.join(f'Zeile {i}  von  Straße{i}@Example.COM\t\tﬁle ½ 10.0.0.1\n' for i in range(n))
+    print(f'{sys.version.split()[0]}, {n:,} lines')
+    bench('ASCII', ascii_text)
+    bench('spaces', spaces)
+    bench('Unicode', other)
+
+
+if __name__ == '__main__':
+    main()
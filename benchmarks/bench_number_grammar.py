@@ -0,0 +1,54 @@
+"""Time `Number()` against the grammar it replaced, on a numeric-heavy report.
+
+Also times the alternative of splitting on spaces and classifying each
+token with one anchored `fullmatch()`, which pays a Python call per
+token.
+
+Usage: python benchmarks/bench_number_grammar.py [LINES]   (default 200,000)
+"""
+
+import re
+import sys
+import timeit
+
+import re101
+
+# Number() before the rewrite: each form guarded on its own.
+LOOKBEHIND = re.compile(
+    r'(?:(?<= )|(?<=^))(?<!\.)\d+(?:,\d{3})*(?= |$)'
+    r'|(?:(?<= )|(?<=^))(?<!\.)\d+(?:,\d{3})*\.\d+(?:[eE][+-]?\d+)?(?= |$)'
+    r'|(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)'
+)
+TOKEN = re.compile(r'\d+(?:,\d{3})*(?:\.\d+(?:[eE][+-]?\d+)?)?|\.\d+(?:[eE][+-]?\d+)?')
+
+
+def classify_tokens(text):
+    fullmatch = TOKEN.fullmatch
+    spans = []
+    pos = 0
+    for token in text.split(' '):
+        if fullmatch(token):
+            spans.append((pos, pos + len(token)))
+        pos += len(token) + 1
+    return spans
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    text = ' '.join(
+        f'{i} {i * 7 % 5000:,} {i % 97}.25 .5 {i}e3 units 1.5E-3 row total' for i in range(n)
+    )
+    regex = re101.Number()
+    print(f'{sys.version.split()[0]}, {len(text):,} characters')
+    rows = [
+        ('lookbehind grammar', lambda: [m.span() for m in LOOKBEHIND.finditer(text)]),
+        ('split + fullmatch', lambda: classify_tokens(text)),
+        ('Number()', lambda: [m.span() for m in regex.finditer(text)]),
+    ]
+    for label, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{label:<19} {t:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
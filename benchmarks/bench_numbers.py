@@ -0,0 +1,31 @@
+"""Compare parsing `Number` matches one at a time with `re101.extract_numbers()`.
+
+Usage: python benchmarks/bench_numbers.py [LINES]   (default 200,000 lines)
+"""
+
+import sys
+import timeit
+
+import re101
+
+
+def loop(regex, text):
+    return [(float(m.group().replace(',', '')), *m.span()) for m in regex.finditer(text)]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    text = ' '.join(f'row {i} sold {i * 7 % 5000:,} units at {i % 97}.25 each' for i in range(n))
+    regex = re101.Number()
+    print(f'{sys.version.split()[0]}, {len(text):,} characters')
+    rows = [
+        ('float() per match', lambda: loop(regex, text)),
+        ('extract_numbers()', lambda: re101.extract_numbers(text)),
+    ]
+    for label, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{label:<18} {t:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
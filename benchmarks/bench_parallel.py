@@ -0,0 +1,37 @@
+"""Compare `scan()` with `scan_parallel()` at several thread counts.
+
+Run on a free-threaded build (e.g. ``uv run --python 3.14t``) to see
+scaling; on a GIL build every thread count should take about as long
+as a plain `scan()`.
+"""
+
+import sys
+import timeit
+
+import re101
+
+PATTERNS = ['EMAIL', 'IPV4', 'STRICT_CREDIT_CARD']
+DOC = '\n'.join(
+    f'{i} GET /index.html from 10.1.{i % 256}.7 user u{i}@example.com card 4400 6940 3849 3940'
+    for i in range(50_000)
+)
+
+
+def main() -> None:
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'{sys.version.split()[0]}, GIL {"enabled" if gil else "disabled"}, {len(DOC):,} chars')
+    base = min(timeit.repeat(lambda: re101.scan(DOC, PATTERNS), number=1, repeat=3))
+    print(f'scan():                 {base:.3f}s')
+    for threads in (1, 2, 4, 8):
+        t = min(
+            timeit.repeat(
+                lambda threads=threads: re101.scan_parallel(DOC, PATTERNS, threads=threads),
+                number=1,
+                repeat=3,
+            )
+        )
+        print(f'scan_parallel(threads={threads}): {t:.3f}s  ({base / t:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
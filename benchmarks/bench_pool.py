@@ -0,0 +1,106 @@
+"""Compare `WorkerPool` with process pools that are sent compiled patterns.
+
+Usage: python benchmarks/bench_pool.py [TASKS]   (default 2,000)
+
+"startup" is the time to create a pool of WORKERS processes and get
+one result from each; "per task" the mean round trip of TASKS small
+scans submitted one at a time, once the workers are up.  Each row runs
+in a fresh interpreter, since the forkserver outlives the pools that
+start it.
+"""
+
+import concurrent.futures
+import multiprocessing
+import pickle
+import re
+import subprocess
+import sys
+import time
+import timeit
+
+import re101
+
+WORKERS = 2
+NAMES = ['EMAIL', 'IPV4', 'STRICT_SSN', 'LOOSE_URL_DOMAIN']
+TEXT = 'GET /x from 10.0.0.7 by ops@example.com, see https://example.com/a ssn 123-45-6789'
+
+
+def executor(method: str):
+    def run(tasks: int) -> tuple[float, float]:
+        patterns = {n: getattr(re101, n) for n in NAMES}
+        start = time.perf_counter()
+        pool = concurrent.futures.ProcessPoolExecutor(
+            WORKERS, mp_context=multiprocessing.get_context(method)
+        )
+        with pool:
+            # Compiled patterns are pickled with every task.
+            for f in [pool.submit(re101.scan, TEXT, patterns) for _ in range(WORKERS)]:
+                f.result()
+            startup = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(tasks):
+                pool.submit(re101.scan, TEXT, patterns).result()
+            return startup, (time.perf_counter() - start) / tasks
+
+    return run
+
+
+def worker_pool(tasks: int) -> tuple[float, float]:
+    # The first pool also starts the forkserver, which imports re101
+    # once; later pools in the program only fork from it.
+    re101.WorkerPool(workers=WORKERS).close()
+    start = time.perf_counter()
+    with re101.WorkerPool({'web': NAMES}, workers=WORKERS) as pool:
+        startup = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(tasks):
+            pool.scan(TEXT, 'web')
+        return startup, (time.perf_counter() - start) / tasks
+
+
+def payloads() -> None:
+    """Time what each task's arguments cost to pickle and unpickle."""
+    patterns = {n: getattr(re101, n) for n in NAMES}
+    for name, args in [('Pattern objects', (TEXT, patterns)), ('set name', (TEXT, 'web'))]:
+        t = timeit.timeit(
+            'loads(dumps(args))', globals={**vars(pickle), 'args': args}, number=2_000
+        )
+        t /= 2_000
+        print(f'{name:<22} {len(pickle.dumps(args)):6,} bytes  {t * 1e6:7.1f} us per task')
+
+    # Unpickling a Pattern compiles it again unless re's cache has it.
+    def cold() -> None:
+        re.purge()
+        pickle.loads(pickle.dumps(patterns))
+
+    print(
+        f'{"Pattern, cold re cache":<22} {"":>12}  {timeit.timeit(cold, number=20) / 20 * 1e6:7.1f} us'
+    )
+
+
+ROWS = {
+    'spawn + Pattern': executor('spawn'),
+    'fork + Pattern': executor('fork'),
+    'forkserver + Pattern': executor('forkserver'),
+    'WorkerPool': worker_pool,
+}
+
+
+def main() -> None:
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    if len(sys.argv) > 2:
+        startup, per_task = ROWS[sys.argv[2]](tasks)
+        print(
+            f'{sys.argv[2]:<22} startup {startup * 1e3:7.1f} ms   per task {per_task * 1e6:7.1f} us'
+        )
+        return
+    print(f'{sys.version.split()[0]}, {WORKERS} workers, {tasks:,} tasks')
+    payloads()
+    methods = multiprocessing.get_all_start_methods()
+    for name in ROWS:
+        if name.split()[0] in methods or name == 'WorkerPool':
+            subprocess.run([sys.executable, __file__, str(tasks), name], check=True)
+
+
+if __name__ == '__main__':
+    main()
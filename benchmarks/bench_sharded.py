@@ -0,0 +1,43 @@
+"""Time `scan_file_sharded()` on a generated log file at several worker counts."""
+
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import re101
+
+PATTERNS = ['EMAIL', 'IPV4', 'STRICT_CREDIT_CARD']
+LINES = 200_000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'access.log'
+        with path.open('w') as f:
+            for i in range(LINES):
+                f.write(
+                    f'{i} GET /a from 10.1.{i % 256}.7 by u{i}@example.com 4400 6940 3849 3940\n'
+                )
+        size = path.stat().st_size
+        print(f'{sys.version.split()[0]}, {os.cpu_count()} CPUs, {size / 1e6:.1f} MB')
+        base = min(
+            timeit.repeat(lambda: re101.scan(path.read_text(), PATTERNS), number=1, repeat=3)
+        )
+        print(f'read + scan():            {base:.3f}s')
+        for workers in (1, 2, 4, 8):
+            t = min(
+                timeit.repeat(
+                    lambda workers=workers: re101.scan_file_sharded(
+                        path, PATTERNS, workers=workers
+                    ),
+                    number=1,
+                    repeat=3,
+                )
+            )
+            print(f'scan_file_sharded(workers={workers}): {t:.3f}s  ({base / t:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Compare a set of matches with `re101.sketch.MatchSketch` for distinct counts.
+
+Reports time, peak traced memory and the sketch's error.
+
+Usage: python benchmarks/bench_sketch.py [N]   (default 1,000,000 matches)
+"""
+
+import sys
+import time
+import tracemalloc
+
+from re101 import ScanMatch
+from re101.sketch import MatchSketch
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    matches = [ScanMatch('EMAIL', 0, 0, f'user{i * 7919 % n}@example.com') for i in range(n)]
+    print(f'{sys.version.split()[0]}, {n:,} matches')
+
+    def exact():
+        return {'EMAIL': len({m.match for m in matches})}
+
+    def sketched():
+        sk = MatchSketch(top=10)
+        sk.update(matches)
+        return sk.distinct()
+
+    truth = exact()['EMAIL']
+    for label, fn in [('set()', exact), ('MatchSketch', sketched)]:
+        t = time.perf_counter()
+        got = fn()['EMAIL']
+        t = time.perf_counter() - t
+        # Traced separately: tracing slows every allocation down.
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        error = abs(got - truth) / truth
+        print(f'{label:<12} {t:.3f}s  peak {peak / 2**20:7.1f} MiB  error {error:.2%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Compare `tokenize()` with `WORD.findall()` plus an `ADVERB` pass.
+
+Usage: python benchmarks/bench_tokens.py [COPIES]   (default 200)
+
+Each copy is about 20 KB of prose; time and peak memory are measured
+in separate runs, since tracing slows the code down.
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+import re101
+
+PARAGRAPH = (
+    'It was only slowly, and quite reluctantly, that the family finally agreed to '
+    'move; the house was old and badly heated, but they had lived there happily '
+    'for years, and leaving it seemed unlikely to make anyone feel better.\n'
+)
+
+
+def peak(fn) -> int:
+    tracemalloc.start()
+    fn()
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return top
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    text = PARAGRAPH * (20_000 // len(PARAGRAPH)) * copies
+    print(f'{sys.version.split()[0]}, {len(text) / 1e6:.1f} M characters')
+
+    def consume(it):
+        for _ in it:
+            pass
+
+    rows = [
+        ('findall + ADVERB', lambda: (re101.WORD.findall(text), re101.ADVERB.findall(text))),
+        ('finditer spans', lambda: [m.span() for m in re101.WORD.finditer(text)]),
+        ('tokenize()', lambda: consume(re101.tokenize(text))),
+        ('tokenize(adverbs)', lambda: consume(re101.tokenize(text, adverbs=True))),
+        ('tokenize_arrays()', lambda: consume(re101.tokenize_arrays(text, True))),
+    ]
+    for name, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{name:<18} {t:.3f}s  peak {peak(fn) / 1e6:7.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""Compare `Pattern.fullmatch()` with `re101.validate` on a column of values.
+
+Usage: python benchmarks/bench_validate.py [N]   (default 10,000,000 values)
+"""
+
+import sys
+import timeit
+
+import re101
+from re101 import validate
+
+
+def bench(name: str, values: list[str]) -> None:
+    regex = getattr(re101, name)
+    check = getattr(validate, name)
+    rows = [
+        ('fullmatch loop', lambda: [regex.fullmatch(v) is not None for v in values]),
+        ('validator', lambda: list(map(check, values))),
+        ('validate_many()', lambda: validate.validate_many(name, values)),
+    ]
+    for label, fn in rows:
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f'{name:<11} {label:<16} {t:.3f}s')
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    print(f'{sys.version.split()[0]}, {n:,} values')
+    bench('IPV4', [f'10.{i % 256}.{i // 256 % 256}.{i % 300}' for i in range(n)])
+    bench('US_ZIPCODE', [f'{i % 100000:05d}' if i % 4 else f'{i:05d}-12' for i in range(n)])
+
+
+if __name__ == '__main__':
+    main()
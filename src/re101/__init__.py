@@ -45,10 +45,14 @@ __author__ = 'Brad Solomon'
 __license__ = 'MIT'
 __version__ = '1.0.0'
 
+import array
+import datetime as dt
+import decimal
 import functools
 import re
+import sys
 from re import Pattern
-from typing import Literal, TypeAlias
+from typing import Any, Literal, TypeAlias
 
 RegexFlag: TypeAlias = int | re.RegexFlag
 
@@ -515,32 +519,32 @@ MONEYSIGN = (
 # Thanks @WiktorStribiżew for the lookahead:
 # https://stackoverflow.com/a/50223631/7954504
 
-_number_combinations = {
-    (True, True): (
-        # Leading zeros permitted; commas permitted.
-        r'(?:(?<= )|(?<=^))(?<!\.)\d+(?:,\d{3})*(?= |$)',
-        r'(?:(?<= )|(?<=^))(?<!\.)\d+(?:,\d{3})*\.\d+(?:[eE][+-]?\d+)?(?= |$)',
-        r'(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)',
-    ),
-    (True, False): (
-        # Leading zeros permitted; commas not permitted.
-        r'(?:(?<= )|(?<=^))(?<!\.)\d+(?= |$)',
-        r'(?:(?<= )|(?<=^))(?<!\.)\d+\.\d+(?:[eE][+-]?\d+)?(?= |$)',
-        r'(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)',
-    ),
-    (False, True): (
-        # Leading zeros not permitted; commas permitted.
-        r'(?:(?<= )|(?<=^))(?<!\.)[1-9]+\d*(?:,\d{3})*(?= |$)',
-        r'(?:(?<= )|(?<=^))(?<!\.)[1-9]+\d*(?:,\d{3})*\.\d+(?:[eE][+-]?\d+)?(?= |$)',
-        r'(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)',
-    ),
-    (False, False): (
-        # Neither permitted.
-        r'(?:(?<= )|(?<=^))(?<!\.)[1-9]+\d*(?= |$)',
-        r'(?:(?<= )|(?<=^))(?<!\.)[1-9]+\d*\.\d+(?:[eE][+-]?\d+)?(?= |$)',
-        r'(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)',
-    ),
-}
+# A match is always a whole space-delimited token, so the guards are
+# written once around one alternation rather than once per form.  A
+# lookahead for a digit or point rules out most positions before any
+# lookbehind runs, and the integer and decimal forms share their
+# leading digits instead of matching them again.
+_number_start = r'(?=[\d.])(?:(?<= )|(?<=^))'
+_number_end = r'(?= |$)'
+_fraction = r'\.\d+(?:[eE][+-]?\d+)?'
+
+
+def _number_pattern(
+    allow_leading_zeros: bool,
+    allow_commas: bool,
+    integer: bool = True,
+    decimal: bool = True,
+) -> str:
+    whole = r'\d+' if allow_leading_zeros else r'[1-9]+\d*'
+    if allow_commas:
+        whole += r'(?:,\d{3})*'
+    if integer and decimal:
+        core = rf'{whole}(?:{_fraction})?|{_fraction}'
+    elif integer:
+        core = whole
+    else:
+        core = rf'{whole}{_fraction}|{_fraction}'
+    return rf'{_number_start}(?:{core}){_number_end}'
 
 
 class Number:
@@ -573,8 +577,7 @@ class Number:
         allow_commas: bool = True,
         flags: RegexFlag = 0,
     ) -> Pattern[str]:
-        key = allow_leading_zeros, allow_commas
-        pattern = '|'.join(_number_combinations[key])
+        pattern = _number_pattern(allow_leading_zeros, allow_commas)
         return re.compile(pattern, flags=flags)
 
 
@@ -585,9 +588,7 @@ class Integer:
         allow_commas: bool = True,
         flags: RegexFlag = 0,
     ) -> Pattern[str]:
-        key = allow_leading_zeros, allow_commas
-        # The only difference here is we use 0th element only.
-        pattern = _number_combinations[key][0]
+        pattern = _number_pattern(allow_leading_zeros, allow_commas, decimal=False)
         return re.compile(pattern, flags=flags)
 
 
@@ -598,12 +599,113 @@ class Decimal:
         allow_commas: bool = True,
         flags: RegexFlag = 0,
     ) -> Pattern[str]:
-        key = allow_leading_zeros, allow_commas
-        # 0th element is for Integer; other are for Decimal.
-        pattern = '|'.join(_number_combinations[key][1:])
+        pattern = _number_pattern(allow_leading_zeros, allow_commas, integer=False)
         return re.compile(pattern, flags=flags)
 
 
+def extract_numbers(
+    s: str,
+    allow_leading_zeros: bool = True,
+    allow_commas: bool = True,
+    integers: bool = False,
+) -> tuple[Any, Any, Any]:
+    """Find the numbers in `s` and parse them, all in bulk.
+
+    Matches the same grammar as `Number` (or `Integer`), strips the
+    thousands separators from every match at once, and converts the
+    lot in one call rather than one `float()` at a time.
+
+    Parameters
+    ----------
+    s: str
+    allow_leading_zeros, allow_commas: bool, default True
+        As for `Number`.
+    integers: bool, default False
+        Match `Integer` only and parse to int64 instead of float64.
+
+    Returns
+    -------
+    tuple (values, start, end) of arrays as long as the number of
+    matches: the parsed values (float64, or int64 with `integers`) and
+    the span of each in `s`.  These are NumPy arrays when NumPy is
+    installed, and `array.array` buffers otherwise.  An integer that
+    does not fit in 64 bits raises OverflowError.
+    """
+    regex = (Integer if integers else Number)(allow_leading_zeros, allow_commas)
+    matches = list(regex.finditer(s))
+    # Matches never contain a space, so joining on one and splitting
+    # again recovers them after a single replace().
+    joined = ' '.join([m.group() for m in matches]).replace(',', '')
+    spans = list(map(re.Match.span, matches))
+    starts, ends = zip(*spans, strict=True) if spans else ((), ())
+    np = _numpy()
+    # `\d` also matches non-ASCII digits, which only int() and float()
+    # know how to read.
+    if np is not None and joined.isascii():
+        values = np.array(joined.split(), dtype=np.int64 if integers else np.float64)
+    else:
+        values = array.array(
+            'q' if integers else 'd', map(int if integers else float, joined.split())
+        )
+        if np is not None:
+            values = np.asarray(values)
+    return values, _int_array(starts), _int_array(ends)
+
+
+# An amount with a currency symbol before it ($1,250.00, € 5) or, if
+# there is none, after it (5 €), with an optional leading minus.  A
+# symbol after the amount that is followed by another amount belongs to
+# that one instead (the 3 in "item 3 $4.00" is not money).
+# Amounts follow the `Number` grammar with commas allowed, less the
+# exponent; a comma as decimal separator (1.250,00) is not supported.
+_moneysign = '[' + re.escape(MONEYSIGN) + ']'
+MONEY = re.compile(
+    r'(?<![\d.,-])(?P<minus>-)?'
+    rf'(?:(?P<prefix>{_moneysign}) ?)?'
+    r'(?<![\w.,])(?P<amount>\d+(?:,\d{3})*(?:\.\d+)?|\.\d+)(?!,?\d)'
+    rf'(?(prefix)|(?: ?(?P<suffix>{_moneysign})(?! ?\.?\d)))'
+)
+
+
+def extract_money(
+    s: str,
+    columns: bool = False,
+) -> list[tuple[str, decimal.Decimal, int, int]] | tuple[Any, ...]:
+    """Extract currency amounts as `decimal.Decimal`, with their symbols.
+
+    Thousands separators are stripped from all amounts at once and the
+    amounts are converted exactly, without passing through float.
+
+    Parameters
+    ----------
+    s: str
+    columns: bool, default False
+        Return parallel columns instead of one tuple per amount.
+
+    Returns
+    -------
+    list of (symbol, amount, start, end) tuples, where start/end is the
+    span of the match in `s`; or with `columns`, a tuple (symbols,
+    amounts, start, end) of two lists and two int64 arrays (see
+    `extract_numbers()`).
+    """
+    matches = list(MONEY.finditer(s))
+    symbols = [m['prefix'] or m['suffix'] for m in matches]
+    joined = ' '.join([(m['minus'] or '') + m['amount'] for m in matches])
+    amounts = list(map(decimal.Decimal, joined.replace(',', '').split()))
+    if not columns:
+        return [
+            (symbol, amount, *m.span())
+            for symbol, amount, m in zip(symbols, amounts, matches, strict=True)
+        ]
+    return (
+        symbols,
+        amounts,
+        _int_array([m.start() for m in matches]),
+        _int_array([m.end() for m in matches]),
+    )
+
+
 # ---------------------------------------------------------------------
 # *Geographic info*
 
@@ -671,9 +773,13 @@ _pw = r'(?:p(?:ass)?w(?:ord)?|pword|passphrase|secret key|pass(?:wd)?)'
 _un = r'(?:user(?:name)?|uname)'
 
 
+# "<label>: value", "<label>=value" or "<label> is value"
+_userinfo_sep = r'(?:\s*[:=]\s*|\s+is\s+)'
+
+
 def make_userinfo_re(start: str, flags: RegexFlag = re.I) -> Pattern[str]:
     return re.compile(
-        start + r'(?:\s*[:=]\s*|\s+is\s+)(?P<token>\S+)',
+        start + _userinfo_sep + r'(?P<token>\S+)',
         flags=flags,
     )
 
@@ -714,6 +820,47 @@ _cards = {
 STRICT_CREDIT_CARD = re.compile(r'|'.join(_cards.values()))
 LOOSE_CREDIT_CARD = re.compile(r'[0-9-]{13,20}')
 
+_card_brands = {
+    '_new_visa': 'visa',
+    '_old_visa': 'visa',
+    '_mastercard': 'mastercard',
+    '_amex': 'amex',
+    '_discover': 'discover',
+}
+# STRICT_CREDIT_CARD with each alternative named, so that `lastgroup`
+# tells which issuer matched.
+_labelled_cards = re.compile('|'.join(f'(?P<{k}>{v})' for k, v in _cards.items()))
+
+
+def extract_credit_cards(s: str, validate: bool = True) -> list[tuple[str, str, int, int]]:
+    """Extract card numbers from `s`, labelled with their brand.
+
+    Candidates are found with `STRICT_CREDIT_CARD`, which requires a
+    known issuer prefix and grouping, and by default must then pass a
+    Luhn check (see `re101.validate.luhn()`), which weeds out most
+    numbers that only look like cards.
+
+    Parameters
+    ----------
+    s: str
+    validate: bool, default True
+        Drop candidates whose Luhn check digit is wrong.
+
+    Returns
+    -------
+    list of (brand, number, start, end) tuples, where brand is one of
+    'visa', 'mastercard', 'amex' or 'discover', number is the text
+    matched (separators included), and start/end its span in `s`
+    """
+    found = []
+    for m in _labelled_cards.finditer(s):
+        number = m.group()
+        if validate and not _luhn(number):
+            continue
+        found.append((_card_brands[m.lastgroup], number, *m.span()))
+    return found
+
+
 US_PASSPORT = re.compile(r'\b[C\d]\d{5,8}\b', re.I)
 
 # Forked directly from:
@@ -868,22 +1015,209 @@ _dob = r'd(?:ate )?o(?:f )?b(?:irth)??'
 DOB = make_userinfo_re(start=_dob)
 extract_dob = _make_extract_info_func(start=_dob)
 
+# ISO-8601 calendar dates and times, as written by most loggers:
+# 2024-01-05, 2024-01-05T10:04:31Z, 2024-01-05 10:04:31,120 +05:30.
+# Month and day are range-checked, but not against each other, so
+# 2023-02-30 matches; `extract_datetimes()` drops it.
+_date = r'(?<![0-9])(?P<year>[0-9]{4})-(?P<month>0[1-9]|1[0-2])-(?P<day>0[1-9]|[12][0-9]|3[01])'
+_time = (
+    r'(?P<hour>[01][0-9]|2[0-3]):(?P<minute>[0-5][0-9])'
+    r'(?::(?P<second>[0-5][0-9])(?:[.,](?P<fraction>[0-9]+))?)?'
+    # Without an offset, the time must not stop short of one the
+    # pattern does not take (-05); any other signed number may follow.
+    r'(?: ?(?P<tz>Z|[+-](?:[01][0-9]|2[0-3]):?[0-5][0-9])|(?! ?[+-][0-9]{2}))'
+)
+# Nor of a second that is out of range (23:59:60).
+_time_end = r'(?![0-9]|:[0-9])'
+DATE = re.compile(_date + r'(?![0-9])')
+DATETIME = re.compile(_date + r'[T ]' + _time + _time_end)
+# A date on its own is not the start of a time that failed to match.
+_date_maybe_time = re.compile(_date + r'(?:[T ]' + _time + r'|(?![T ][0-9]{2}:))' + _time_end)
+
+
+@functools.lru_cache(maxsize=64)
+def _tzinfo(tz: str) -> dt.tzinfo:
+    if tz == 'Z':
+        return dt.timezone.utc
+    offset = dt.timedelta(hours=int(tz[1:3]), minutes=int(tz[-2:]))
+    return dt.timezone(-offset if tz[0] == '-' else offset)
+
+
+def _datetime_from_groups(m: re.Match[str]) -> dt.datetime:
+    year, month, day, hour, minute, second, fraction, tz = m.groups()
+    return dt.datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+        int(fraction[:6].ljust(6, '0')) if fraction else 0,
+        _tzinfo(tz) if tz else None,
+    )
+
+
+# From 3.11, fromisoformat() reads everything these patterns match
+# (in C) except an offset set off by a space, which raises ValueError
+# and takes the slower path.
+_fromisoformat = dt.datetime.fromisoformat if sys.version_info >= (3, 11) else None
+
+
+def extract_datetimes(s: str) -> list[tuple[dt.datetime, int, int]]:
+    """Extract ISO-8601 dates and date-times as `datetime` objects.
+
+    Each object is built from the match itself, without going through a
+    general-purpose date parser.  A date with no time is taken to be
+    midnight; a time with no offset gives a naive datetime.  Fractions
+    of a second beyond microseconds are truncated.  Dates that do not
+    exist (2023-02-30) are skipped.
+
+    Parameters
+    ----------
+    s: str
+
+    Returns
+    -------
+    list of (datetime, start, end) tuples, where start/end is the span
+    of the match in `s`
+    """
+    found = []
+    for m in _date_maybe_time.finditer(s):
+        try:
+            if _fromisoformat is not None:
+                try:
+                    value = _fromisoformat(m.group())
+                except ValueError:
+                    value = _datetime_from_groups(m)
+            else:
+                value = _datetime_from_groups(m)
+        except ValueError:
+            continue
+        found.append((value, *m.span()))
+    return found
+
+
 # ---------------------------------------------------------------------
+# *All user info at once*
+
+# Each key becomes a named group, so a single pass can tell which kind
+# of field every token belongs to.  The value group is underscored so it
+# cannot collide with a key such as 'token'.
+_userinfo_keys = {'password': _pw, 'username': _un, 'dob': _dob}
+
+
+@functools.lru_cache(maxsize=32)
+def _make_userinfo_union_re(keys: tuple[tuple[str, str], ...]) -> Pattern[str]:
+    start = '(?:' + '|'.join(rf'(?P<{key}>{start})' for key, start in keys) + ')'
+    return re.compile(start + _userinfo_sep + r'(?P<_value>\S+)', flags=re.I)
+
+
+def extract_userinfo(
+    s: str,
+    extra_keys: dict[str, str] | None = None,
+) -> dict[str, list[tuple[str, int, int]]]:
+    """Extract passwords, usernames and dates of birth in one pass.
+
+    Finds the tokens `extract_pw()`, `extract_un()` and `extract_dob()`
+    find, but scans the text once, case-insensitively.  The scan goes on
+    from the start of each token rather than its end, so a label inside
+    another label's value ('pw: user: bob') is picked up too.  Where
+    labels of two keys start at the same place, the key listed first
+    wins.
 
+    Parameters
+    ----------
+    s: str
+    extra_keys: dict, optional
+        More fields to pick up in the same pass, as a mapping of
+        result key to a regex for the field's label.  For example,
+        ``{'api_key': r'api[ _-]?key', 'token': r'(?:auth )?token'}``.
+        Keys must be identifiers not starting with an underscore.
+
+    Returns
+    -------
+    dict mapping 'password', 'username', 'dob' and any `extra_keys` to
+    a list of (token, start, end) tuples, where start/end is the span
+    of the token in `s`.
+    """
+    keys = {**_userinfo_keys, **(extra_keys or {})}
+    for key in keys:
+        if not key.isidentifier() or key.startswith('_'):
+            raise ValueError(f'invalid key: {key!r}')
+    regex = _make_userinfo_union_re(tuple(keys.items()))
+    found: dict[str, list[tuple[str, int, int]]] = {key: [] for key in keys}
+    ends = dict.fromkeys(keys, 0)
+    pos = 0
+    while m := regex.search(s, pos):
+        key = next(k for k in keys if m.start(k) != -1)
+        start, end = m.span('_value')
+        # A label inside its own key's last value is part of that value,
+        # as it is to the key's own extractor.
+        if m.start() >= ends[key]:
+            found[key].append((m.group('_value'), start, end))
+            ends[key] = end
+        pos = start
+    return found
+
+
+# ---------------------------------------------------------------------
+# Submodules, imported after the constants above so that they can use
+# them (`re101.WORD`, `re101.MULT_WHITESPACE`) rather than copies.
+
+from re101 import batch, engines, sketch, validate
+from re101._aio import ascan
+from re101._files import scan_file, scan_tail, scan_tree
+from re101._normalize import Normalized, normalize
+from re101._overlap import ResolvedSpans, redact, resolve_overlaps, resolve_spans
+from re101._parallel import WorkerPool, scan_file_sharded, scan_parallel
+from re101._scan import LineMemo, ScanMatch, contains_any, count, scan
+from re101._tokens import WordSpans, tokenize, tokenize_arrays
+from re101.batch import _int_array, _numpy
+from re101.validate import luhn as _luhn
 
 # Functions, classes that make Patterns with __new__(), and constants
 # ---------------------------------------------------------------------
 __all__ = (
     'Decimal',
     'Integer',
+    'LineMemo',
+    'Normalized',
     'Number',
+    'ResolvedSpans',
+    'ScanMatch',
+    'WordSpans',
+    'WorkerPool',
+    'ascan',
+    'batch',
+    'contains_any',
+    'count',
+    'engines',
+    'extract_credit_cards',
+    'extract_datetimes',
     'extract_dob',
+    'extract_money',
+    'extract_numbers',
     'extract_pw',
     'extract_un',
     'extract_us_drivers_license',
+    'extract_userinfo',
     'followed_by',
     'make_userinfo_re',
+    'normalize',
     'not_followed_by',
+    'redact',
+    'resolve_overlaps',
+    'resolve_spans',
+    'scan',
+    'scan_file',
+    'scan_file_sharded',
+    'scan_parallel',
+    'scan_tail',
+    'scan_tree',
+    'sketch',
+    'tokenize',
+    'tokenize_arrays',
+    'validate',
 )
 # Bring uppercase constants into the namespace.
 __all__ = __all__ + tuple(i for i in dict(locals()) if i.isupper() and not i.startswith('_'))
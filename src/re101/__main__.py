@@ -0,0 +1,271 @@
+"""Command-line interface: ``python -m re101 scan``.
+
+Scans files, or standard input, with the package's patterns and writes
+one JSON object per match::
+
+    $ python -m re101 scan --patterns EMAIL,IPV4 access.log.gz
+    {"file": "access.log.gz", "offset": 1042, "pattern": "IPV4", "match": "10.0.0.7"}
+
+Offsets are byte offsets into the (decompressed) input.  The exit
+status is 0 if anything matched, 1 if nothing did and 2 on an error,
+as with grep.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+from collections.abc import Callable, Iterator
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+from re import Pattern
+
+from re101._files import _opener, _read_lines_chunked
+from re101._overlap import resolve_overlaps
+from re101._scan import ScanMatch, _BlockScan, _resolve_patterns
+
+_CHUNK_SIZE = 1 << 20
+
+# json.dumps() of a str, without its per-call overhead.
+_json_str = encode_basestring_ascii
+
+
+def _read_blocks(path: str) -> Iterator[bytes]:
+    if path == '-':
+        yield from _read_lines_chunked(sys.stdin.buffer, _CHUNK_SIZE)
+        return
+    with _opener(Path(path))() as f:
+        yield from _read_lines_chunked(f, _CHUNK_SIZE)
+
+
+def _match_batches(path: str, regexes: dict[str, Pattern[str]]) -> Iterator[list[ScanMatch]]:
+    """Yield the matches in `path` as they become certain, a block at a time."""
+    stream = _BlockScan(regexes)
+    for block in _read_blocks(path):
+        yield stream.feed(block)
+    yield stream.close()
+
+
+def _settled(held: list[ScanMatch], until: float) -> int:
+    """Return how many of `held` no match starting at `until` or later can overlap.
+
+    Matches are resolved in groups that overlap one another; only the
+    last group can still grow.
+    """
+    group = 0
+    end = -1
+    for i, m in enumerate(held):
+        if m.start >= end:
+            group = i
+        end = max(end, m.end)
+    return group if end > until else len(held)
+
+
+def _redact_path(
+    path: str, regexes: dict[str, Pattern[str]], write: Callable[[bytes], object]
+) -> bool:
+    """Write `path` with each match replaced by its pattern's name in brackets."""
+    priority = list(regexes)
+    stream = _BlockScan(regexes)
+    pending = b''  # Input not written yet, from byte offset `done`.
+    done = 0
+    held: list[ScanMatch] = []
+    found = False
+    blocks = _read_blocks(path)
+    while True:
+        block = next(blocks, None)
+        if block is None:
+            held += stream.close()
+            until = math.inf
+        else:
+            pending += block
+            held += stream.feed(block)
+            # No match found later can start before this.
+            until = min(stream.resume.values())
+        cut = _settled(held, until)
+        for m in resolve_overlaps(held[:cut], priority):
+            write(pending[: m.start - done] + f'[{m.pattern}]'.encode())
+            pending = pending[m.end - done :]
+            done = m.end
+            found = True
+        held = held[cut:]
+        if block is None:
+            write(pending)
+            return found
+        keep = min(held[0].start if held else until, until) - done
+        write(pending[:keep])
+        pending = pending[keep:]
+        done += keep
+
+
+def _scan_path(
+    path: str, regexes: dict[str, Pattern[str]], mode: str, write: Callable[[bytes], object]
+) -> bool:
+    """Write the output for one input; return whether anything matched."""
+    name = '<stdin>' if path == '-' else path
+    if mode == 'any':
+        # Stops reading once a match is certain.
+        if any(_match_batches(path, regexes)):
+            write(f'{name}\n'.encode('utf-8', 'surrogateescape'))
+            return True
+        return False
+    if mode == 'count':
+        counts = dict.fromkeys(regexes, 0)
+        for batch in _match_batches(path, regexes):
+            for m in batch:
+                counts[m.pattern] += 1
+        write(json.dumps({'file': name, 'counts': counts}).encode('ascii') + b'\n')
+        return any(counts.values())
+    if mode == 'redact':
+        return _redact_path(path, regexes, write)
+    # The records are formatted by hand: json.dumps() of a dict per match
+    # costs more than the scan itself.  The constant parts are encoded
+    # once, and the output written a block at a time.
+    head = f'{{"file": {_json_str(name)}, "offset": '
+    tails = {p: f', "pattern": {_json_str(p)}, "match": ' for p in regexes}
+    found = False
+    for batch in _match_batches(path, regexes):
+        if batch:
+            lines = [f'{head}{m.start}{tails[m.pattern]}{_json_str(m.match)}}}\n' for m in batch]
+            write(''.join(lines).encode('ascii'))
+            found = True
+    return found
+
+
+def _scan_to_file(
+    path: str, regexes: dict[str, Pattern[str]], mode: str
+) -> tuple[str, bool, str | None]:
+    """Run `_scan_path()` in a worker, writing its output to a temporary file.
+
+    Returns the file's name, whether anything matched and any error.
+    The caller copies the output, in the order of the inputs, and
+    deletes the file; memory stays bounded however much is written.
+    """
+    fd, name = tempfile.mkstemp(prefix='re101-', suffix='.out')
+    with os.fdopen(fd, 'wb') as f:
+        try:
+            found = _scan_path(path, regexes, mode, f.write)
+        except (OSError, ValueError) as exc:
+            return name, False, f'{path}: {exc}'
+    return name, found, None
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m re101', description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    scan = commands.add_parser(
+        'scan',
+        help='scan files for matches of the package patterns',
+        description='Scan files (or standard input) and write one JSON line per match.',
+    )
+    scan.add_argument(
+        '-p',
+        '--patterns',
+        required=True,
+        help='comma-separated constant names, such as EMAIL,IPV4,STRICT_SSN',
+    )
+    scan.add_argument(
+        'files',
+        nargs='*',
+        default=['-'],
+        help="files to scan, compressed or not; '-' or none for standard input",
+    )
+    scan.add_argument(
+        '-j', '--jobs', type=int, default=1, help='scan this many files at once, in processes'
+    )
+    mode = scan.add_mutually_exclusive_group()
+    mode.add_argument(
+        '--count',
+        dest='mode',
+        action='store_const',
+        const='count',
+        help='write match counts per pattern for each file instead of the matches',
+    )
+    mode.add_argument(
+        '--any',
+        dest='mode',
+        action='store_const',
+        const='any',
+        help='write only the names of files with a match, stopping at the first one',
+    )
+    mode.add_argument(
+        '--redact',
+        dest='mode',
+        action='store_const',
+        const='redact',
+        help='write the input with every match replaced by [PATTERN]; where matches '
+        'overlap, the pattern listed first in --patterns wins',
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    names = [n.strip() for n in args.patterns.split(',') if n.strip()]
+    try:
+        # Resolves only the requested constants.
+        regexes = _resolve_patterns(names)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if not regexes:
+        parser.error('no patterns given')
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    mode = args.mode or 'matches'
+    out = sys.stdout.buffer
+    found = False
+    failed = False
+
+    def report(error: str) -> None:
+        nonlocal failed
+        failed = True
+        print(f'{parser.prog}: {error}', file=sys.stderr)
+
+    try:
+        if args.jobs > 1 and len(args.files) > 1 and '-' not in args.files:
+            import concurrent.futures
+
+            with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                jobs = [pool.submit(_scan_to_file, path, regexes, mode) for path in args.files]
+                try:
+                    for job in jobs:
+                        name, hit, error = job.result()
+                        with Path(name).open('rb') as f:
+                            shutil.copyfileobj(f, out)
+                        Path(name).unlink()
+                        found = found or hit
+                        if error:
+                            report(error)
+                finally:
+                    # After an early exit (a broken pipe), delete the
+                    # output of the files not copied yet as well.
+                    pool.shutdown(cancel_futures=True)
+                    for job in jobs:
+                        if not job.cancelled() and job.exception() is None:
+                            Path(job.result()[0]).unlink(missing_ok=True)
+        else:
+            for path in args.files:
+                try:
+                    hit = _scan_path(path, regexes, mode, out.write)
+                except (OSError, ValueError) as exc:
+                    report(f'{path}: {exc}')
+                else:
+                    found = found or hit
+        out.flush()
+    except BrokenPipeError:
+        # The reader went away (`| head`); exit quietly, as grep does.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0 if found else 1
+    if failed:
+        return 2
+    return 0 if found else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
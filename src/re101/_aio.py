@@ -0,0 +1,65 @@
+"""Scan an asyncio stream without blocking the event loop."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+from re101._scan import PatternSpec, ScanMatch, _BlockScan, _resolve_patterns
+
+if TYPE_CHECKING:
+    # asyncio takes longer to import than the rest of the package
+    # together, so it is only imported once a scan starts.
+    import asyncio
+    from concurrent.futures import Executor
+
+
+async def ascan(
+    reader: asyncio.StreamReader,
+    patterns: PatternSpec,
+    chunk_size: int = 1 << 16,
+    offload_size: int = 1 << 16,
+    executor: Executor | None = None,
+) -> AsyncIterator[ScanMatch]:
+    """Asynchronously scan UTF-8 bytes read from `reader`.
+
+    Use as ``async for match in ascan(reader, ['PASSWORD', 'USERNAME'])``.
+
+    Data is read only when the consumer asks for more matches, so a
+    slow consumer pauses reading and the stream's own flow control
+    pushes back on the sender.  Each read is matched after the line
+    before it, and matches in the last line read wait for the next
+    read, so the matches are those `scan()` would find in the whole
+    stream, however it is split into reads.
+
+    Parameters
+    ----------
+    reader: asyncio.StreamReader
+        Or anything with an awaitable ``read(n) -> bytes``.
+    patterns: see `scan()`
+    chunk_size: int, default 64 KiB
+        Bytes requested from `reader` per read.
+    offload_size: int, default 64 KiB
+        Blocks at least this large are scanned in `executor` instead of
+        on the event loop.
+    executor: concurrent.futures.Executor, optional
+        Defaults to the loop's default executor.
+
+    Yields
+    ------
+    ScanMatch, ordered by start offset, where `start` and `end` are
+    byte offsets into the stream.
+    """
+    import asyncio
+
+    stream = _BlockScan(_resolve_patterns(patterns))
+    loop = asyncio.get_running_loop()
+    while block := await reader.read(chunk_size):
+        if len(block) >= offload_size:
+            found = await loop.run_in_executor(executor, stream.feed, block)
+        else:
+            found = stream.feed(block)
+        for m in found:
+            yield m
+    for m in stream.close():
+        yield m
@@ -0,0 +1,412 @@
+"""Stream files, compressed or not, through a scan."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import os
+from collections.abc import Callable, Generator, Iterator, Mapping
+from re import Pattern
+from typing import TYPE_CHECKING, BinaryIO
+
+from re101._scan import (
+    LineMemo,
+    PatternSpec,
+    ScanMatch,
+    _BlockScan,
+    _resolve_patterns,
+    _scan_decoded,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# The module that opens each compressed format, imported the first time
+# a file needs it rather than with the package.  compression.zstd is
+# new in Python 3.14.
+_CODECS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'lzma',
+    '.lzma': 'lzma',
+    '.zst': 'compression.zstd',
+}
+
+# A line longer than this many chunks is handed over in pieces rather
+# than buffered whole here; the scan still matches it as one text, up
+# to a size limit.
+_MAX_LINE_CHUNKS = 16
+
+
+def _opener(path: Path) -> Callable[[], BinaryIO]:
+    """Return a function opening `path` for reading, decompressed per its suffix."""
+    suffix = path.suffix.lower()
+    codec = _CODECS.get(suffix)
+    if codec is None:
+        return lambda: path.open('rb')
+    try:
+        opener = importlib.import_module(codec).open
+    except ImportError:
+        raise ValueError(f'{suffix} files need the {codec} module') from None
+    return lambda: opener(path, 'rb')
+
+
+def _cut_at_newline(buf: bytes, chunk_size: int) -> int:
+    """Return how many leading bytes of `buf` are ready to scan.
+
+    That is everything up to the last newline; the remainder waits for
+    more input unless it has grown too long to keep buffering.
+    """
+    cut = buf.rfind(b'\n') + 1
+    if not cut and len(buf) >= chunk_size * _MAX_LINE_CHUNKS:
+        return len(buf)
+    return cut
+
+
+def _read_lines_chunked(
+    f: BinaryIO, chunk_size: int, partial_last_line: bool = True
+) -> Iterator[bytes]:
+    """Yield blocks of about `chunk_size` bytes, each ending on a newline.
+
+    Whatever follows the last newline is yielded at the end, unless
+    `partial_last_line` is false.
+    """
+    carry = b''
+    while block := f.read(chunk_size):
+        buf = carry + block
+        cut = _cut_at_newline(buf, chunk_size)
+        carry = buf[cut:]
+        if cut:
+            yield buf[:cut]
+    if carry and partial_last_line:
+        yield carry
+
+
+def _prefetch(produce: Callable[[], Generator[bytes]], depth: int) -> Iterator[bytes]:
+    """Run `produce()` in a background thread, `depth` items ahead of the caller.
+
+    zlib, bz2, lzma and zstd release the GIL while they decompress, so
+    the producer keeps inflating the next blocks while the caller scans
+    the current one.  The bounded queue caps memory at `depth` blocks.
+    """
+    import queue
+    import threading
+
+    q: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.05)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def run() -> None:
+        blocks = produce()
+        try:
+            for block in blocks:
+                if not put(block):
+                    return
+        except BaseException as exc:  # handed to the consumer and re-raised there
+            put(exc)
+        else:
+            put(done)
+        finally:
+            # Closes the file now if the consumer stopped early.
+            blocks.close()
+
+    worker = threading.Thread(target=run, name='re101-prefetch', daemon=True)
+    worker.start()
+    try:
+        while (item := q.get()) is not done:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
+
+def scan_file(
+    path: str | os.PathLike[str],
+    patterns: PatternSpec,
+    chunk_size: int = 1 << 20,
+    prefetch: int = 4,
+    memo: LineMemo | None = None,
+) -> Iterator[ScanMatch]:
+    """Lazily scan a UTF-8 file, decompressing it on the fly if needed.
+
+    Files ending in `.gz`, `.bz2`, `.xz`/`.lzma` or (on Python 3.14+)
+    `.zst` are decompressed in a background thread, which runs ahead of
+    the scan by at most `prefetch` blocks.  The file is read in blocks
+    that end on a newline, but matched as one text: the matches are
+    those `scan()` would find in the whole contents, whatever
+    `chunk_size` is.  (Patterns that look more than a line past the one
+    a match starts on, and lines over 16 MiB, are the exceptions.)
+
+    Parameters
+    ----------
+    path: str or path-like
+    patterns: see `scan()`
+    chunk_size: int, default 1 MiB
+        Bytes read (after decompression) per block.
+    prefetch: int, default 4
+        Number of decompressed blocks the reader may hold ahead of the
+        scan.
+    memo: LineMemo, optional
+        Match line by line, reusing the results for lines seen before;
+        each line is then matched on its own (see `LineMemo`).
+
+    Yields
+    ------
+    ScanMatch, ordered by start offset, where `start` and `end` are
+    byte offsets into the uncompressed contents.
+    """
+    from pathlib import Path
+
+    regexes = _resolve_patterns(patterns)
+    open_ = _opener(Path(path))
+
+    def produce() -> Generator[bytes]:
+        with open_() as f:
+            yield from _read_lines_chunked(f, chunk_size)
+
+    return _scan_blocks(_prefetch(produce, prefetch), regexes, memo=memo)
+
+
+def _scan_blocks(
+    blocks: Iterator[bytes],
+    regexes: dict[str, Pattern[str]],
+    memo: LineMemo | None = None,
+) -> Iterator[ScanMatch]:
+    """Scan line-aligned blocks as one document, with byte offsets."""
+    if memo is not None:
+        # A memo matches each line on its own anyway.
+        offset = 0
+        for block in blocks:
+            yield from _scan_decoded(
+                block.decode('utf-8', 'surrogateescape'), regexes, offset, memo
+            )
+            offset += len(block)
+        return
+    stream = _BlockScan(regexes)
+    for block in blocks:
+        yield from stream.feed(block)
+    yield from stream.close()
+
+
+# The leading bytes of a file are fingerprinted so that a file rewritten
+# in place, and grown past the old offset, is not mistaken for one that
+# was appended to.
+_HEAD_BYTES = 256
+
+
+def _head_digest(f: BinaryIO, offset: int) -> str:
+    f.seek(0)
+    return hashlib.blake2b(f.read(min(offset, _HEAD_BYTES)), digest_size=8).hexdigest()
+
+
+def scan_tail(
+    path: str | os.PathLike[str],
+    patterns: PatternSpec,
+    state: str | os.PathLike[str],
+    chunk_size: int = 1 << 20,
+) -> list[ScanMatch]:
+    """Scan only what has been appended to `path` since the last call.
+
+    The position reached in each file is checkpointed in `state`, a
+    small JSON file that any number of scanned files can share.  On the
+    next call scanning resumes from there, so the cost is proportional
+    to the new data rather than to the size of the file.
+
+    A trailing line with no newline yet is left for a later call, when
+    it is complete; its bytes stay in the file, so nothing needs to be
+    carried in `state`.  The file is scanned from the start again when
+    it has been rotated (its inode changed), truncated (it is shorter
+    than the checkpoint), or rewritten (its first bytes changed).
+
+    New lines are matched after the line before them, and each pattern
+    carries on from where its search had got to, so the matches do not
+    depend on `chunk_size` or on how often the file is polled: over any
+    sequence of calls they are those a `scan()` of the file finds.  For
+    that, a match whose outcome depends on the file ending where it
+    does for now (`$` at the last line, or a run of whitespace reaching
+    the final newline) is held back until more lines are appended.
+
+    Parameters
+    ----------
+    path: str or path-like
+        A plain (uncompressed) UTF-8 file that is only ever appended to.
+    patterns: see `scan()`
+    state: str or path-like
+        Checkpoint file; created if missing.
+    chunk_size: int, default 1 MiB
+
+    Returns
+    -------
+    list of ScanMatch for the new lines, with byte offsets into the file.
+    """
+    import json
+    from pathlib import Path
+
+    regexes = _resolve_patterns(patterns)
+    path = Path(path).resolve()
+    state = Path(state)
+    try:
+        checkpoints = json.loads(state.read_text())
+    except FileNotFoundError:
+        checkpoints = {}
+    key = str(path)
+    with path.open('rb') as f:
+        st = os.fstat(f.fileno())
+        old = checkpoints.get(key)
+        offset = 0
+        stream = _BlockScan(regexes)
+        if (
+            old is not None
+            and old['inode'] == st.st_ino
+            and old['offset'] <= st.st_size
+            and old['head'] == _head_digest(f, old['offset'])
+        ):
+            offset = old['offset']
+            # The lines the new ones are matched after are still in the
+            # file, so only where they start is checkpointed.
+            context = old.get('context', offset)
+            f.seek(context)
+            stream = _BlockScan(regexes, context, f.read(offset - context), old.get('resume'))
+        f.seek(offset)
+        matches = []
+        for block in _read_lines_chunked(f, chunk_size, partial_last_line=False):
+            matches += stream.feed(block)
+            offset += len(block)
+        matches += stream.settle()
+        checkpoints[key] = {
+            'inode': st.st_ino,
+            'size': st.st_size,
+            'offset': offset,
+            'context': stream.base,
+            'resume': stream.resume,
+            'head': _head_digest(f, offset),
+        }
+    # Replace rather than rewrite, so an interrupted run leaves the old
+    # checkpoint intact.
+    tmp = state.with_name(state.name + '.tmp')
+    tmp.write_text(json.dumps(checkpoints, indent=1, sort_keys=True))
+    tmp.replace(state)
+    return matches
+
+
+# A NUL byte in the first block is taken to mean a binary file, as git
+# and grep do.
+_SNIFF_BYTES = 8192
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    path TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    matches TEXT NOT NULL,
+    PRIMARY KEY (path, fingerprint)
+)
+"""
+
+
+def _fingerprint(patterns: Mapping[str, Pattern[str]]) -> str:
+    """Digest of what the patterns match, so editing any of them busts the cache."""
+    h = hashlib.blake2b(digest_size=16)
+    for name, regex in patterns.items():
+        h.update(f'{name}\0{regex.pattern}\0{regex.flags}\0'.encode('utf-8', 'surrogatepass'))
+    return h.hexdigest()
+
+
+def _walk_files(root: str) -> Iterator[os.DirEntry[str]]:
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+        # Pushed in reverse so that they pop in name order.
+        stack.extend(reversed(subdirs))
+
+
+def _scan_text_file(path: str, regexes: dict[str, Pattern[str]]) -> list[ScanMatch] | None:
+    """Scan `path`, or return None if it looks binary."""
+    with open(path, 'rb') as f:  # noqa: PTH123 - DirEntry paths are plain str
+        if b'\0' in f.read(_SNIFF_BYTES):
+            return None
+        f.seek(0)
+        return list(_scan_blocks(_read_lines_chunked(f, 1 << 20), regexes))
+
+
+def scan_tree(
+    root: str | os.PathLike[str],
+    patterns: PatternSpec,
+    cache: str | os.PathLike[str] | None = None,
+) -> Iterator[tuple[str, list[ScanMatch]]]:
+    """Scan every text file under `root`, optionally caching results.
+
+    Directories are walked with `os.scandir()` without following
+    symlinks, and a file whose first 8 KiB hold a NUL byte is skipped as
+    binary.  With `cache`, results are stored in a SQLite database keyed
+    on the file's path, size and modification time and on a fingerprint
+    of the patterns' sources and flags, so unchanged files are not read
+    again and any change to a pattern invalidates its old results.
+
+    Parameters
+    ----------
+    root: str or path-like
+    patterns: see `scan()`
+    cache: str or path-like, optional
+        SQLite database file; created if missing.
+
+    Yields
+    ------
+    (path, matches) for each text file, in a stable order.  Offsets in
+    `matches` are byte offsets into the file.
+    """
+    import json
+    import sqlite3
+
+    regexes = _resolve_patterns(patterns)
+    db = None
+    if cache is not None:
+        db = sqlite3.connect(cache)
+        db.execute(_CACHE_SCHEMA)
+    fingerprint = _fingerprint(regexes)
+    try:
+        for entry in _walk_files(os.fspath(root)):
+            st = entry.stat(follow_symlinks=False)
+            if db is not None:
+                row = db.execute(
+                    'SELECT size, mtime_ns, matches FROM scans WHERE path = ? AND fingerprint = ?',
+                    (entry.path, fingerprint),
+                ).fetchone()
+                if row is not None and row[:2] == (st.st_size, st.st_mtime_ns):
+                    cached = json.loads(row[2])
+                    if cached is not None:
+                        yield entry.path, [ScanMatch(*m) for m in cached]
+                    continue
+            found = _scan_text_file(entry.path, regexes)
+            if db is not None:
+                # Binary files are cached too (as JSON null) so they are
+                # not sniffed again.
+                db.execute(
+                    'INSERT OR REPLACE INTO scans VALUES (?, ?, ?, ?, ?)',
+                    (entry.path, fingerprint, st.st_size, st.st_mtime_ns, json.dumps(found)),
+                )
+            if found is not None:
+                yield entry.path, found
+    finally:
+        if db is not None:
+            db.commit()
+            db.close()
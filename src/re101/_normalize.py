@@ -0,0 +1,265 @@
+"""Normalize text before scanning, keeping a map back to the original."""
+
+from __future__ import annotations
+
+import array
+import bisect
+import functools
+import re
+import sys
+import unicodedata
+from collections.abc import Iterable
+from re import Pattern
+from typing import Literal, TypeAlias
+
+import re101
+from re101._scan import ScanMatch
+
+UnicodeForm: TypeAlias = Literal['NFC', 'NFD', 'NFKC', 'NFKD']
+
+_ANY_WHITESPACE = re.compile(r'\s+')
+
+# ASCII whitespace that str.split() and \s know, other than the space.
+_OTHER_ASCII_WHITESPACE = '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f'
+
+# A run of non-ASCII characters and the character before it, with which
+# the first of them may compose.  Normalization forms never change
+# ASCII, nor merge an ASCII character into what precedes it.
+_NON_ASCII_RUN = re.compile(r'.?[^\x00-\x7f]+', re.DOTALL)
+
+
+@functools.cache
+def _expanding_casefold() -> Pattern[str]:
+    """Match the characters that `str.casefold()` turns into several."""
+    chars = (c for c in map(chr, range(0x80, sys.maxunicode + 1)) if len(c.casefold()) > 1)
+    return re.compile('[' + ''.join(map(re.escape, chars)) + ']')
+
+
+def _collapse(text: str, whitespace: bool | Literal['all']) -> str:
+    if not whitespace:
+        return text
+    if whitespace == 'all':
+        return ' '.join(text.split())
+    if text.isascii() and not any(c in text for c in _OTHER_ASCII_WHITESPACE):
+        # The only whitespace is spaces: without two in a row there is
+        # nothing to do, and with none at either end str.split() cuts
+        # exactly where the regex would, and faster.
+        if '  ' not in text:
+            return text
+        if text[:1] != ' ' and text[-1:] != ' ':
+            return ' '.join(text.split())
+    return re101.MULT_WHITESPACE.sub(' ', text)
+
+
+class _OffsetMap:
+    """Positions in one stage's output mapped to positions in its input.
+
+    Both arrays list segment boundaries.  A segment as long in the
+    output as in the input maps position by position; any other
+    segment was rewritten as a whole, and a position inside it maps to
+    the segment's start or end.
+    """
+
+    __slots__ = ('norm', 'orig')
+
+    def __init__(self, norm: list[int], orig: list[int], norm_len: int, orig_len: int) -> None:
+        self.norm = array.array('q', [0, *norm, norm_len])
+        self.orig = array.array('q', [0, *orig, orig_len])
+
+    def positions(self, positions: Iterable[int], end: bool) -> list[int]:
+        norm, orig = self.norm, self.orig
+        last = len(norm) - 2
+        result = []
+        for pos in positions:
+            # A start belongs to the segment beginning at or before it, an
+            # end to the one finishing at or after it.
+            if end:
+                i = max(bisect.bisect_left(norm, pos) - 1, 0)
+            else:
+                i = min(bisect.bisect_right(norm, pos) - 1, last)
+            n, o = norm[i], orig[i]
+            if norm[i + 1] - n == orig[i + 1] - o:
+                result.append(o + pos - n)
+            else:
+                result.append(orig[i + 1] if end else o)
+        return result
+
+
+def _whitespace_map(text: str, whitespace: bool | Literal['all'], norm_len: int) -> _OffsetMap:
+    regex = _ANY_WHITESPACE if whitespace == 'all' else re101.MULT_WHITESPACE
+    spans = [m.span() for m in regex.finditer(text)]
+    widths = [1] * len(spans)
+    if whitespace == 'all' and spans:
+        # Whitespace at either end is dropped instead of kept as a space.
+        if spans[0][0] == 0:
+            widths[0] = 0
+        if spans[-1][1] == len(text):
+            widths[-1] = 0
+    norm = []
+    orig = []
+    shift = 0
+    for (start, end), width in zip(spans, widths, strict=True):
+        norm += (start - shift, start - shift + width)
+        orig += (start, end)
+        shift += end - start - width
+    return _OffsetMap(norm, orig, norm_len, len(text))
+
+
+def _casefold_map(text: str, norm_len: int) -> _OffsetMap:
+    norm = []
+    orig = []
+    shift = 0
+    for m in _expanding_casefold().finditer(text):
+        start = m.start()
+        width = len(m.group().casefold())
+        norm += (start + shift, start + shift + width)
+        orig += (start, start + 1)
+        shift += width - 1
+    return _OffsetMap(norm, orig, norm_len, len(text))
+
+
+def _unicode_map(text: str, form: UnicodeForm, normalized: str) -> _OffsetMap:
+    norm = []
+    orig = []
+    pieces = []
+    last = shift = 0
+    for m in _NON_ASCII_RUN.finditer(text):
+        start, end = m.span()
+        out = unicodedata.normalize(form, m.group())
+        pieces += (text[last:start], out)
+        if len(out) != end - start:
+            norm += (start + shift, start + shift + len(out))
+            orig += (start, end)
+            shift += len(out) - (end - start)
+        last = end
+    pieces.append(text[last:])
+    if ''.join(pieces) != normalized:
+        # Some run did not normalize on its own; map the text as a whole.
+        return _OffsetMap([], [], len(normalized), len(text))
+    return _OffsetMap(norm, orig, len(normalized), len(text))
+
+
+class Normalized:
+    """The result of `normalize()`.
+
+    `text` is the normalized text and `original` the text it came from.
+    Scan `text`, then use `span()` or `map_matches()` to report what
+    was found at its place in `original`.
+    """
+
+    __slots__ = ('_maps', 'casefold', 'original', 'text', 'unicode', 'whitespace')
+
+    def __init__(
+        self,
+        text: str,
+        original: str,
+        whitespace: bool | Literal['all'],
+        casefold: bool,
+        unicode: UnicodeForm | None,
+    ) -> None:
+        self.text = text
+        self.original = original
+        self.whitespace = whitespace
+        self.casefold = casefold
+        self.unicode = unicode
+        self._maps: list[_OffsetMap] | None = None
+
+    def __repr__(self) -> str:
+        return f'Normalized({self.text!r})'
+
+    def __str__(self) -> str:
+        return self.text
+
+    def _offset_maps(self) -> list[_OffsetMap]:
+        # Built on first use, by running the steps again one at a time:
+        # most callers never map a position back.
+        if self._maps is not None:
+            return self._maps
+        maps = []
+        text = self.original
+        collapsed = _collapse(text, self.whitespace)
+        if len(collapsed) != len(text):
+            maps.append(_whitespace_map(text, self.whitespace, len(collapsed)))
+        text = collapsed
+        if self.casefold:
+            folded = text.casefold()
+            # casefold() never shortens a character, so equal lengths
+            # mean a character-for-character mapping.
+            if len(folded) != len(text):
+                maps.append(_casefold_map(text, len(folded)))
+            text = folded
+        if self.unicode is not None and not unicodedata.is_normalized(self.unicode, text):
+            maps.append(_unicode_map(text, self.unicode, self.text))
+        maps.reverse()
+        self._maps = maps
+        return maps
+
+    def _spans(self, starts: list[int], ends: list[int]) -> tuple[list[int], list[int]]:
+        for offsets in self._offset_maps():
+            starts = offsets.positions(starts, False)
+            ends = offsets.positions(ends, True)
+        return starts, ends
+
+    def span(self, start: int, end: int) -> tuple[int, int]:
+        """Map the span `start:end` of `text` to the span of `original` it came from."""
+        (start,), (end,) = self._spans([start], [end])
+        return start, end
+
+    def map_matches(self, matches: Iterable[ScanMatch]) -> list[ScanMatch]:
+        """Rewrite matches found in `text` with the offsets and text of `original`."""
+        matches = list(matches)
+        starts, ends = self._spans([m.start for m in matches], [m.end for m in matches])
+        original = self.original
+        return [
+            ScanMatch(m.pattern, start, end, original[start:end])
+            for m, start, end in zip(matches, starts, ends, strict=True)
+        ]
+
+
+def normalize(
+    text: str,
+    whitespace: bool | Literal['all'] = True,
+    casefold: bool = False,
+    unicode: UnicodeForm | None = None,
+) -> Normalized:
+    """Clean up `text` for scanning, remembering where each part came from.
+
+    The result's `text` is what this pipeline would give::
+
+        text = MULT_WHITESPACE.sub(' ', text)
+        text = text.casefold()
+        text = unicodedata.normalize(unicode, text)
+
+    but steps that would not change the text are skipped rather than
+    copying it, and ASCII text is casefolded with `str.lower()`.
+
+    Parameters
+    ----------
+    text: str
+    whitespace: bool or 'all', default True
+        True replaces each run of two or more whitespace characters
+        with a single space, as `MULT_WHITESPACE.sub(' ', text)` (and
+        so `MULT_SPACES`) does.  'all' also turns single tabs and
+        newlines into spaces and strips both ends, as
+        `' '.join(text.split())`.  False leaves whitespace alone.
+    casefold: bool, default False
+        Apply `str.casefold()`.
+    unicode: {'NFC', 'NFD', 'NFKC', 'NFKD'}, optional
+        Apply this Unicode normalization form, after casefolding.
+
+    Returns
+    -------
+    Normalized, whose `span()` and `map_matches()` map positions in the
+    normalized text back to `text`.  A position inside a character or
+    run that was rewritten maps to the start (for a start) or the end
+    (for an end) of what it replaced.
+    """
+    if unicode is not None and unicode not in ('NFC', 'NFD', 'NFKC', 'NFKD'):
+        raise ValueError(f'unknown Unicode normalization form: {unicode!r}')
+    out = _collapse(text, whitespace)
+    if casefold:
+        out = out.lower() if out.isascii() else out.casefold()
+    if unicode is not None:
+        # Returns `out` itself when it is already normalized.
+        out = unicodedata.normalize(unicode, out)
+    return Normalized(out, text, whitespace, casefold, unicode)
@@ -0,0 +1,188 @@
+"""Resolve overlapping matches of several patterns by priority."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, NamedTuple, TypeAlias
+
+from re101._scan import PatternSpec, ScanMatch, _iter_matches, _resolve_patterns
+from re101.batch import _int_array
+
+# Parallel start, end and tag columns.
+_Columns: TypeAlias = tuple[list[int], list[int], list[Any]]
+
+
+class ResolvedSpans(NamedTuple):
+    """Winning spans as parallel columns, ordered by start.
+
+    `start` and `end` are int64 arrays; `pattern` names the pattern
+    each span belongs to.
+    """
+
+    pattern: list[str]
+    start: Any
+    end: Any
+
+
+def _as_list(values: Sequence[int]) -> list[int]:
+    # NumPy and array.array both have tolist(), which is far quicker to
+    # walk than the arrays themselves.
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
+def _merge(kept: _Columns, starts: list[int], ends: list[int], tags: Sequence[Any]) -> _Columns:
+    """Add the spans of one pattern that overlap nothing in `kept`.
+
+    `kept` holds the winners of every higher-priority pattern, sorted
+    and disjoint, as (start, end, tag) columns; the new spans must be
+    sorted by start, then end.  One pass over both gives the new
+    winners, still sorted.
+    """
+    ks, ke, kt = kept
+    n = len(ks)
+    out_s: list[int] = []
+    out_e: list[int] = []
+    out_t: list[Any] = []
+    i = 0
+    last_end = None
+    for s, e, tag in zip(starts, ends, tags, strict=True):
+        # Winners that end before this span starts cannot overlap it
+        # or anything after it.
+        while i < n and ke[i] <= s:
+            out_s.append(ks[i])
+            out_e.append(ke[i])
+            out_t.append(kt[i])
+            i += 1
+        if i < n and ks[i] < e:
+            continue
+        # Nor may it overlap the pattern's own last winner.
+        if last_end is not None and s < last_end:
+            continue
+        out_s.append(s)
+        out_e.append(e)
+        out_t.append(tag)
+        last_end = e
+    return out_s + ks[i:], out_e + ke[i:], out_t + kt[i:]
+
+
+def _resolve(streams: Iterable[tuple[list[int], list[int], Sequence[Any]]]) -> _Columns:
+    """Merge (starts, ends, tags) streams, highest priority first."""
+    kept: _Columns = ([], [], [])
+    for starts, ends, tags in streams:
+        kept = _merge(kept, starts, ends, tags)
+    return kept
+
+
+def _priority_order(names: Iterable[str], priority: Sequence[str] | None) -> list[str]:
+    names = list(names)
+    if priority is None:
+        return names
+    listed = set(priority)
+    present = set(names)
+    return [n for n in priority if n in present] + [n for n in names if n not in listed]
+
+
+def resolve_spans(
+    spans: Mapping[str, tuple[Sequence[int], Sequence[int]]],
+    priority: Sequence[str] | None = None,
+) -> ResolvedSpans:
+    """Pick non-overlapping spans from several patterns' matches, by priority.
+
+    A span is kept unless it overlaps a kept span of a higher-priority
+    pattern, or an earlier kept span of its own pattern.
+
+    Parameters
+    ----------
+    spans: mapping of str to (starts, ends)
+        Each pattern's match offsets as two sequences (lists, arrays or
+        NumPy arrays), sorted by start as `finditer()` yields them
+        (and by end where starts are equal).
+    priority: sequence of str, optional
+        Pattern names, highest priority first; defaults to the order of
+        `spans`.  Patterns left out lose to all listed ones and keep
+        their order in `spans`.
+
+    Returns
+    -------
+    ResolvedSpans of the winners, ordered by start
+
+    Notes
+    -----
+    Each pattern's sorted spans are merged into the sorted winners so
+    far in a single pass, so the cost is linear in the number of spans
+    for each pattern, with no sorting.
+    """
+    order = _priority_order(spans, priority)
+    streams = []
+    for name in order:
+        starts, ends = map(_as_list, spans[name])
+        streams.append((starts, ends, [name] * len(starts)))
+    starts, ends, names = _resolve(streams)
+    return ResolvedSpans(names, _int_array(starts), _int_array(ends))
+
+
+def resolve_overlaps(
+    matches: Iterable[ScanMatch], priority: Sequence[str] | None = None
+) -> list[ScanMatch]:
+    """Drop matches that overlap a match of a higher-priority pattern.
+
+    Parameters
+    ----------
+    matches: iterable of ScanMatch
+        As returned by `scan()`, `scan_file()` and the like: each
+        pattern's matches in order of offset.
+    priority: sequence of str, optional
+        Pattern names, highest priority first.  Defaults to the order
+        in which the patterns first appear in `matches`; patterns left
+        out rank after the listed ones in that order.
+
+    Returns
+    -------
+    list of ScanMatch, disjoint and ordered by start
+    """
+    by_pattern: dict[str, list[ScanMatch]] = {}
+    for m in matches:
+        by_pattern.setdefault(m.pattern, []).append(m)
+    streams = (
+        ([m.start for m in stream], [m.end for m in stream], stream)
+        for stream in map(by_pattern.__getitem__, _priority_order(by_pattern, priority))
+    )
+    return _resolve(streams)[2]
+
+
+def redact(
+    text: str,
+    patterns: PatternSpec,
+    replacement: str = '[{pattern}]',
+    priority: Sequence[str] | None = None,
+) -> str:
+    """Replace every match of `patterns` in `text`.
+
+    Where matches overlap, the pattern that comes first in `priority`
+    (by default, in `patterns`) wins, so `['STRICT_CREDIT_CARD',
+    'LOOSE_CREDIT_CARD']` masks a card number as a strict match even
+    where the loose one is longer.
+
+    Parameters
+    ----------
+    text: str
+    patterns: see `scan()`
+    replacement: str, default '[{pattern}]'
+        Format string for the replacement; `{pattern}` and `{match}`
+        are filled in.
+    priority: sequence of str, optional
+        See `resolve_overlaps()`.
+
+    Returns
+    -------
+    str
+    """
+    regexes = _resolve_patterns(patterns)
+    winners = resolve_overlaps(_iter_matches(text, regexes), priority or list(regexes))
+    pieces = []
+    last = 0
+    for m in winners:
+        pieces += (text[last : m.start], replacement.format(pattern=m.pattern, match=m.match))
+        last = m.end
+    pieces.append(text[last:])
+    return ''.join(pieces)
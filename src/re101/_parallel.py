@@ -0,0 +1,663 @@
+"""Spread a scan across a pool of workers."""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import heapq
+import operator
+import os
+import re
+import sys
+import warnings
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from re import Pattern
+from typing import TYPE_CHECKING, Literal, TypeAlias
+
+import re101
+from re101._scan import (
+    PatternSpec,
+    ScanMatch,
+    _iter_matches,
+    _resolve_patterns,
+    _to_byte_offsets,
+)
+
+if TYPE_CHECKING:
+    import mmap
+    from concurrent.futures import Executor, Future
+    from multiprocessing.context import BaseContext
+    from pathlib import Path
+
+# concurrent.futures (which imports logging and threading) and mmap are
+# imported where they are used, to keep them out of `import re101`.
+
+# Below this many characters per piece, handing work to another thread
+# costs more than it saves.
+_MIN_CHUNK = 1 << 16
+
+# Characters past its end sent with each piece to a worker interpreter
+# or process, for matches that run on into the next piece.
+_TAIL = 1 << 12
+
+# Upper bound on the bytes one worker decodes at a time when sharding a
+# file, which keeps memory flat however large the file is.
+_MAX_SHARD = 1 << 26
+
+Backend: TypeAlias = Literal['thread', 'interpreter', 'process']
+_BACKENDS = ('thread', 'interpreter', 'process')
+
+
+def _gil_enabled() -> bool:
+    # sys._is_gil_enabled() only exists on 3.13+; older builds always have a GIL.
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+def _default_threads() -> int:
+    # With the GIL, threads only add overhead to a CPU-bound scan.
+    if _gil_enabled():
+        return 1
+    return os.cpu_count() or 1
+
+
+def _line_chunks(text: str, size: int) -> list[tuple[int, int]]:
+    """Cut `text` into (pos, endpos) pieces of roughly `size` characters.
+
+    Each piece except the last ends just after a newline.
+    """
+    bounds = []
+    n = len(text)
+    start = 0
+    while start < n:
+        end = start + size
+        if end >= n:
+            end = n
+        else:
+            nl = text.find('\n', end - 1)
+            end = n if nl == -1 else nl + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _lead(text: str | mmap.mmap, pos: int) -> int:
+    """Return the start of the second line before the one starting at `pos`.
+
+    A piece sent to a worker starts there, so that lookbehinds at the
+    start of the piece see what they would in the whole document.
+    """
+    newline = '\n' if isinstance(text, str) else b'\n'
+    for _ in range(2):
+        if not pos:
+            break
+        pos = text.rfind(newline, 0, pos - 1) + 1
+    return pos
+
+
+def _window_matches(
+    text: str,
+    name: str,
+    regex: Pattern[str],
+    pos: int,
+    end: int,
+    final: bool,
+    shift: int = 0,
+) -> list[ScanMatch] | None:
+    """Return the matches of `regex` that start in [pos, end), searching from `pos`.
+
+    The search runs up to the end of the line after `end`, and further
+    while the last match kept reaches that line, since it might then
+    match differently in the whole document.  `final` says whether
+    `text` ends where the document does; if it is a copy of part of it
+    and runs out first, the result is None.
+    """
+    n = len(text)
+    tail = text.find('\n', end) + 1 or n
+    grow = max(tail - pos, _MIN_CHUNK)
+    # An empty match at the very end belongs to the last piece.
+    if final and end == n:
+        end += 1
+    while True:
+        found = []
+        for m in regex.finditer(text, pos, tail):
+            if m.start() >= end:
+                break
+            found.append(m)
+        if tail == n and final:
+            break
+        last = text.rfind('\n', 0, tail - 1) + 1
+        if not found or found[-1].end() < last:
+            break
+        if tail == n:
+            return None
+        tail = text.find('\n', tail + grow) + 1 or n
+        grow *= 2
+    return [ScanMatch(name, m.start() + shift, m.end() + shift, m.group()) for m in found]
+
+
+def _scan_window(
+    text: str, base: int, pos: int, end: int, final: bool, patterns: dict[str, Pattern[str]]
+) -> dict[str, list[ScanMatch] | None]:
+    """Scan the piece [pos, end) of a document, of which `text` starts at `base`.
+
+    Each pattern's matches are found from the start of the piece, as
+    if the scan of the document had got there without a match running
+    into the piece; `_stitch()` mends those it did.
+    """
+    return {
+        name: _window_matches(text, name, regex, pos - base, end - base, final, base)
+        for name, regex in patterns.items()
+    }
+
+
+def _scan_windows(
+    windows: list[tuple[str, int, int, int, bool]], patterns: dict[str, Pattern[str]]
+) -> list[dict[str, list[ScanMatch] | None]]:
+    """Scan (text, base, pos, end, final) pieces in a worker interpreter or process."""
+    return [_scan_window(*window, patterns) for window in windows]
+
+
+# Finds the matches of one pattern that start in [pos, end) of a
+# document, searching from `pos`.
+_Search: TypeAlias = Callable[[int, int], list[ScanMatch]]
+
+
+def _rejoin(
+    search: _Search, pos: int, start: int, end: int, own: list[ScanMatch]
+) -> tuple[list[ScanMatch], int]:
+    """Redo the matches of the piece [start, end) from `pos`, past its start.
+
+    A match of the piece before ran on to `pos`, so the scan of the
+    whole document searches on from there, not from `start` as the
+    piece's own matches `own` were found.  Once it reaches a stretch
+    that the piece's scan searched too, the two agree from there on.
+    Returns the matches and where the search goes on from.
+    """
+    out: list[ScanMatch] = []
+    starts = [m.start for m in own]
+    while pos < end:
+        i = bisect.bisect_left(starts, pos)
+        if pos >= (own[i - 1].end if i else start):
+            rest = own[i:]
+            if rest and out and rest[0][1:3] == out[-1][1:3]:
+                rest = rest[1:]
+            return out + rest, rest[-1].end if rest else pos
+        stop = min(own[i - 1].end, end)
+        found = search(pos, stop)
+        out += found
+        pos = max(stop, found[-1].end) if found else stop
+    return out, pos
+
+
+def _stitch(
+    search: _Search, pieces: list[tuple[int, int]], found: list[list[ScanMatch] | None]
+) -> list[ScanMatch]:
+    """Join one pattern's matches in consecutive pieces of a document.
+
+    A piece's matches are None where its worker could not settle them.
+    """
+    out: list[ScanMatch] = []
+    pos = 0
+    for (start, end), own in zip(pieces, found, strict=True):
+        if own is None:
+            own = search(start, end)
+        if pos > start:
+            own, pos = _rejoin(search, pos, start, end, own)
+        elif own:
+            pos = own[-1].end
+        out += own
+    return out
+
+
+def _scan_batch(texts: list[str], patterns: dict[str, Pattern[str]]) -> list[list[ScanMatch]]:
+    """Scan whole documents in a worker interpreter or process."""
+    return [list(_iter_matches(t, patterns)) for t in texts]
+
+
+def _isolated_pool(backend: Backend, workers: int) -> Executor:
+    import concurrent.futures
+
+    if backend == 'interpreter':
+        # New in 3.14.  Each interpreter imports re101 once, on its first
+        # task, and keeps it (and the `re` cache) for the life of the pool.
+        pool_cls = getattr(concurrent.futures, 'InterpreterPoolExecutor', None)
+        if pool_cls is not None:
+            return pool_cls(max_workers=workers)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+
+
+def scan_parallel(
+    texts: str | Iterable[str],
+    patterns: PatternSpec,
+    threads: int | None = None,
+    chunk_size: int | None = None,
+    backend: Backend = 'thread',
+) -> list[ScanMatch] | list[list[ScanMatch]]:
+    """Scan one large document, or a batch of documents, on a worker pool.
+
+    On free-threaded builds of CPython (3.13t and later), `re` matching
+    runs in parallel across threads, without the pickling and start-up
+    cost of a process pool.  On builds with a GIL the result is the
+    same, but there is nothing to gain from more than one thread; use
+    `backend='interpreter'` or `backend='process'` there instead.
+
+    Parameters
+    ----------
+    texts: str or iterable of str
+        A single document is cut into pieces on line boundaries and
+        the pieces are scanned concurrently, each from the line before
+        it on; a match that runs on into the next piece is followed
+        into it, as a scan of the whole document would.  Each document
+        of a batch is scanned whole.
+    patterns: see `scan()`
+    threads: int, optional
+        Size of the pool, whatever the backend.  For threads, defaults
+        to the CPU count on a free-threaded build and to 1 (scan in the
+        calling thread) otherwise; for the other backends, to the CPU
+        count.
+    chunk_size: int, optional
+        Target piece size, in characters, when cutting a single
+        document.  Defaults to a few pieces per worker.
+    backend: {'thread', 'interpreter', 'process'}, default 'thread'
+        'interpreter' runs pieces in subinterpreters through
+        `concurrent.futures.InterpreterPoolExecutor` (Python 3.14+) and
+        falls back to 'process' on older versions.  Both copy each
+        piece to the worker, so pieces are sent in batches.
+
+    Returns
+    -------
+    For a single document, a list of ScanMatch ordered by start offset,
+    as `scan()` returns, except for patterns that look more than a line
+    past the one a match starts on.  For a batch, one such list per
+    document, in input order.
+    """
+    import concurrent.futures
+
+    if backend not in _BACKENDS:
+        raise ValueError(f'backend must be one of {_BACKENDS}, not {backend!r}')
+    regexes = _resolve_patterns(patterns)
+    if threads is None:
+        threads = _default_threads() if backend == 'thread' else os.cpu_count() or 1
+    if threads < 1:
+        raise ValueError('threads must be at least 1')
+    if not isinstance(texts, str):
+        docs = list(texts)
+        if threads == 1 or len(docs) < 2:
+            return [list(_iter_matches(t, regexes)) for t in docs]
+        if backend == 'thread':
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+                return list(pool.map(lambda t: list(_iter_matches(t, regexes)), docs))
+        size = -(-len(docs) // (threads * 4))
+        batches = [docs[i : i + size] for i in range(0, len(docs), size)]
+        with _isolated_pool(backend, threads) as pool:
+            return [
+                r
+                for batch in pool.map(_scan_batch, batches, [regexes] * len(batches))
+                for r in batch
+            ]
+
+    text = texts
+    if chunk_size is None:
+        chunk_size = max(len(text) // (threads * 4), _MIN_CHUNK)
+    pieces = _line_chunks(text, chunk_size)
+    if threads == 1 or len(pieces) < 2:
+        return list(_iter_matches(text, regexes))
+    n = len(text)
+    if backend == 'thread':
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+            found = list(
+                pool.map(lambda piece: _scan_window(text, 0, *piece, True, regexes), pieces)
+            )
+    else:
+        # Each piece is sent with the lines around it, and a little
+        # more, for the matches that run past its end.
+        windows = []
+        for pos, end in pieces:
+            lead = _lead(text, pos)
+            tail = text.find('\n', end + _TAIL) + 1 or n
+            windows.append((text[lead:tail], lead, pos, end, tail == n))
+        size = -(-len(windows) // (threads * 4))
+        batches = [windows[i : i + size] for i in range(0, len(windows), size)]
+        with _isolated_pool(backend, threads) as pool:
+            found = [
+                r
+                for batch in pool.map(_scan_windows, batches, [regexes] * len(batches))
+                for r in batch
+            ]
+    streams = [
+        _stitch(
+            functools.partial(_window_matches, text, name, regex, final=True),
+            pieces,
+            [piece[name] for piece in found],
+        )
+        for name, regex in regexes.items()
+    ]
+    return list(heapq.merge(*streams, key=operator.attrgetter('start')))
+
+
+def _byte_shards(mm: mmap.mmap | bytes, size: int) -> list[tuple[int, int]]:
+    """Cut `mm` into [start, end) byte ranges that each end after a newline."""
+    bounds = []
+    n = len(mm)
+    start = 0
+    while start < n:
+        end = start + size
+        if end >= n:
+            end = n
+        else:
+            nl = mm.find(b'\n', end - 1)
+            end = n if nl == -1 else nl + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _scan_file_window(
+    mm: mmap.mmap, start: int, end: int, patterns: dict[str, Pattern[str]]
+) -> dict[str, list[ScanMatch]]:
+    """Scan the byte range [start, end) of a mapped UTF-8 file.
+
+    As `_scan_window()`, on the range decoded with the lines around
+    it; the patterns whose matches run on past those are scanned again
+    with more of the file.  Offsets are byte offsets into the file.
+    """
+    n = len(mm)
+    lead = _lead(mm, start)
+    tail = mm.find(b'\n', end + _TAIL) + 1 or n
+    left = dict(patterns)
+    found = {}
+    while True:
+        # surrogateescape keeps one character per undecodable byte, so
+        # offsets can be mapped back exactly.
+        text = mm[lead:tail].decode('utf-8', 'surrogateescape')
+        pos = len(mm[lead:start].decode('utf-8', 'surrogateescape'))
+        stop = len(text) - len(mm[end:tail].decode('utf-8', 'surrogateescape'))
+        for name, regex in list(left.items()):
+            matches = _window_matches(text, name, regex, pos, stop, tail == n)
+            if matches is not None:
+                found[name] = _to_byte_offsets(text, matches, lead)
+                del left[name]
+        if not left:
+            return {name: found[name] for name in patterns}
+        tail = mm.find(b'\n', 2 * tail - start) + 1 or n
+
+
+def _file_matches(
+    mm: mmap.mmap, name: str, regex: Pattern[str], pos: int, end: int
+) -> list[ScanMatch]:
+    return _scan_file_window(mm, pos, end, {name: regex})[name]
+
+
+def _scan_shard(
+    path: Path, start: int, end: int, patterns: dict[str, Pattern[str]]
+) -> dict[str, list[ScanMatch]]:
+    import mmap
+
+    with path.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _scan_file_window(mm, start, end, patterns)
+
+
+def scan_file_sharded(
+    path: str | os.PathLike[str],
+    patterns: PatternSpec,
+    workers: int | None = None,
+) -> list[ScanMatch]:
+    """Scan one large UTF-8 (or ASCII) file across a pool of processes.
+
+    The file is memory-mapped and cut into byte ranges that end on a
+    newline.  Each worker maps the file itself and matches its range
+    with the lines around it, as part of the whole file; a match that
+    runs on into the next range is followed into it, so the result is
+    that of `scan()` on the decoded file, whatever the number of
+    workers, except for patterns that look more than a line past the
+    one a match starts on.  Only the range bounds and the matches
+    cross process boundaries.
+
+    Parameters
+    ----------
+    path: str or path-like
+    patterns: see `scan()`
+    workers: int, optional
+        Number of processes.  Defaults to the CPU count; 1 scans in the
+        calling process.
+
+    Returns
+    -------
+    list of ScanMatch ordered by start offset, where `start` and `end`
+    are *byte* offsets into the file.
+    """
+    import concurrent.futures
+    import mmap
+    from pathlib import Path
+
+    regexes = _resolve_patterns(patterns)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be at least 1')
+    path = Path(path)
+    size = path.stat().st_size
+    if not size:
+        return []
+    with path.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        shards = _byte_shards(mm, min(-(-size // workers), _MAX_SHARD))
+        if workers == 1 or len(shards) < 2:
+            found = [_scan_file_window(mm, a, b, regexes) for a, b in shards]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                found = list(
+                    pool.map(
+                        _scan_shard,
+                        [path] * len(shards),
+                        [a for a, _ in shards],
+                        [b for _, b in shards],
+                        [regexes] * len(shards),
+                    )
+                )
+        streams = [
+            _stitch(
+                functools.partial(_file_matches, mm, name, regex),
+                shards,
+                [shard[name] for shard in found],
+            )
+            for name, regex in regexes.items()
+        ]
+    return list(heapq.merge(*streams, key=operator.attrgetter('start')))
+
+
+# A pattern as sent to a worker: a package constant's name, or else its
+# source and flags.  Either is a few bytes of plain data to pickle.
+_PatternRef: TypeAlias = str | tuple[str, int]
+
+# The pattern sets of a `WorkerPool`, compiled once per worker process.
+_worker_sets: dict[str, dict[str, Pattern[str]]] = {}
+
+
+def _pattern_refs(patterns: PatternSpec) -> dict[str, _PatternRef]:
+    return {
+        name: name if getattr(re101, name, None) is regex else (regex.pattern, regex.flags)
+        for name, regex in _resolve_patterns(patterns).items()
+    }
+
+
+def _init_worker(sets: dict[str, dict[str, _PatternRef]]) -> None:
+    _worker_sets.clear()
+    for set_name, refs in sets.items():
+        _worker_sets[set_name] = {
+            name: getattr(re101, ref) if isinstance(ref, str) else re.compile(*ref)
+            for name, ref in refs.items()
+        }
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _worker_scan(text: str, patterns: str | tuple[str, ...]) -> list[ScanMatch]:
+    # A str names one of the pool's pattern sets, a tuple constants.
+    regexes = _worker_sets[patterns] if isinstance(patterns, str) else _resolve_patterns(patterns)
+    return list(_iter_matches(text, regexes))
+
+
+def _worker_scan_batch(texts: list[str], patterns: str | tuple[str, ...]) -> list[list[ScanMatch]]:
+    return [_worker_scan(t, patterns) for t in texts]
+
+
+def _preload_re101(context: BaseContext) -> None:
+    """Add re101 to the forkserver's preload, if the server has not started.
+
+    multiprocessing has no public way to read the preload list or to ask
+    whether the server is running, so this looks at the server's own
+    attributes and leaves it alone where they are missing.
+    """
+    from multiprocessing import forkserver
+
+    server = getattr(forkserver, '_forkserver', None)
+    preload = getattr(server, '_preload_modules', None)
+    if preload is None or 're101' in preload:
+        return
+    if getattr(server, '_forkserver_pid', None) is not None:
+        # A preload set now would only be read by a server started later.
+        warnings.warn(
+            'the forkserver is already running without re101 preloaded; '
+            'WorkerPool workers will each import re101 themselves',
+            RuntimeWarning,
+            stacklevel=3,
+        )
+        return
+    # Keep whatever the program preloads already.
+    context.set_forkserver_preload([*preload, 're101'])
+
+
+class WorkerPool:
+    """A persistent pool of processes with re101 imported and patterns compiled.
+
+    Workers are forked from a forkserver that has already imported
+    re101, so none of them imports or compiles the package's constants
+    again, and each compiles the pool's pattern sets once, when it
+    starts.  Tasks then name the patterns they use instead of sending
+    `Pattern` objects, which would be pickled and compiled again in the
+    worker for every task.
+
+    Parameters
+    ----------
+    pattern_sets: mapping of str to patterns, optional
+        Named sets of patterns, each in any form `scan()` accepts, to
+        compile in every worker.  Tasks refer to them by name.
+    workers: int, optional
+        Number of processes; defaults to the CPU count.
+    warm: bool, default True
+        Start every worker now rather than on the first tasks.
+
+    Notes
+    -----
+    The forkserver is shared by the whole program: creating a pool adds
+    re101 to its preload list (keeping the modules already there), which
+    every later user of the forkserver start method will see.  If the
+    server is already running without re101, the pool warns with a
+    `RuntimeWarning` and leaves it alone, and each worker imports re101
+    itself.  Where forkserver is not available (Windows), workers are
+    spawned and each imports re101 itself, once.
+
+    Examples
+    --------
+    >>> with WorkerPool({'pii': ['EMAIL', 'STRICT_SSN']}) as pool:  # doctest: +SKIP
+    ...     results = pool.map(documents, 'pii')
+    """
+
+    def __init__(
+        self,
+        pattern_sets: Mapping[str, PatternSpec] | None = None,
+        workers: int | None = None,
+        warm: bool = True,
+    ) -> None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        self.pattern_sets = {
+            name: _pattern_refs(patterns) for name, patterns in (pattern_sets or {}).items()
+        }
+        self.workers = workers
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            _preload_re101(context)
+        else:
+            context = multiprocessing.get_context('spawn')
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.pattern_sets,),
+        )
+        if warm:
+            self.warm()
+
+    def __enter__(self) -> WorkerPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'WorkerPool(workers={self.workers}, pattern_sets={sorted(self.pattern_sets)})'
+
+    def warm(self) -> None:
+        """Start every worker and wait until each is ready."""
+        # Processes are started on demand, one per task submitted while
+        # none is idle, so as many tasks as workers start them all.
+        for f in [self._pool.submit(_ping) for _ in range(self.workers)]:
+            f.result()
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def _task_patterns(self, patterns: str | Iterable[str]) -> str | tuple[str, ...]:
+        if isinstance(patterns, str) and patterns in self.pattern_sets:
+            return patterns
+        if isinstance(patterns, str):
+            patterns = (patterns,)
+        names = tuple(patterns)
+        if not all(isinstance(n, str) for n in names):
+            raise TypeError(
+                'tasks take pattern set or constant names; '
+                'put other patterns in a pattern set of the pool'
+            )
+        _resolve_patterns(names)  # Fail here rather than in the worker.
+        return names
+
+    def submit(self, text: str, patterns: str | Iterable[str]) -> Future[list[ScanMatch]]:
+        """Scan `text` in a worker and return a future of its `scan()` result.
+
+        `patterns` names one of the pool's pattern sets, or is one or
+        more names of the package's constants.
+        """
+        return self._pool.submit(_worker_scan, text, self._task_patterns(patterns))
+
+    def scan(self, text: str, patterns: str | Iterable[str]) -> list[ScanMatch]:
+        """Scan `text` in a worker; see `submit()`."""
+        return self.submit(text, patterns).result()
+
+    def map(
+        self, texts: Iterable[str], patterns: str | Iterable[str], chunksize: int = 64
+    ) -> Iterator[list[ScanMatch]]:
+        """Scan each of `texts` in the workers, yielding results in input order.
+
+        Texts are sent `chunksize` at a time, to spread the cost of each
+        round trip over many small texts.  As with `submit()`, the
+        patterns are checked and the work is handed out right away,
+        before the first result is asked for.
+        """
+        task = self._task_patterns(patterns)
+        texts = list(texts)
+        batches = [texts[i : i + chunksize] for i in range(0, len(texts), chunksize)]
+        results = self._pool.map(_worker_scan_batch, batches, [task] * len(batches))
+
+        def results_in_order() -> Iterator[list[ScanMatch]]:
+            for batch in results:
+                yield from batch
+
+        return results_in_order()
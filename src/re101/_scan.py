@@ -0,0 +1,537 @@
+"""Scan text with several of the package's patterns at once."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import heapq
+import operator
+import re
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from re import Pattern
+from typing import NamedTuple, TypeAlias
+
+import re101
+
+PatternSpec: TypeAlias = (
+    str | Pattern[str] | Iterable[str | Pattern[str]] | Mapping[str, Pattern[str]]
+)
+
+# Buffers scanned in place, with the bytes-mode equivalents of patterns.
+Buffer: TypeAlias = bytes | bytearray | memoryview
+_BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+
+class ScanMatch(NamedTuple):
+    """One match found by a scan.
+
+    `pattern` is the name of the pattern that matched: its exported
+    name (`'EMAIL'`) when it is one of the package's constants, else
+    its source string.  `start` and `end` are offsets into the scanned
+    text, as with `re.Match.span()`.
+    """
+
+    pattern: str
+    start: int
+    end: int
+    match: str
+
+
+def _pattern_name(regex: Pattern[str]) -> str:
+    for name in re101.__all__:
+        if getattr(re101, name) is regex:
+            return name
+    return regex.pattern
+
+
+def _resolve_patterns(patterns: PatternSpec) -> dict[str, Pattern[str]]:
+    """Normalize any accepted `patterns` argument to {name: Pattern}."""
+    if isinstance(patterns, Mapping):
+        return dict(patterns)
+    if isinstance(patterns, (str, Pattern)):
+        patterns = [patterns]
+    resolved = {}
+    for p in patterns:
+        if isinstance(p, Pattern):
+            resolved[_pattern_name(p)] = p
+            continue
+        regex = getattr(re101, p, None) if p in re101.__all__ else None
+        if not isinstance(regex, Pattern):
+            raise ValueError(f'not a re101 pattern: {p!r}')
+        resolved[p] = regex
+    return resolved
+
+
+@functools.lru_cache(maxsize=256)
+def _bytes_pattern(regex: Pattern[str]) -> Pattern[bytes]:
+    r"""Compile `regex`'s source as a bytes pattern.
+
+    In bytes mode, classes such as \d and \w only know ASCII, so the
+    result agrees with `regex` on ASCII text, and non-ASCII bytes never
+    match them.
+    """
+    if not regex.pattern.isascii():
+        raise ValueError(f'{regex.pattern!r} has non-ASCII characters; it cannot match bytes')
+    try:
+        return re.compile(regex.pattern.encode('ascii'), regex.flags & ~re.UNICODE)
+    except re.error as exc:
+        raise ValueError(f'{regex.pattern!r} has no bytes-mode equivalent: {exc}') from None
+
+
+def _window(buffer: Buffer, start: int, end: int | None) -> memoryview:
+    """View `buffer[start:end]` as unsigned bytes, without copying."""
+    view = memoryview(buffer)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view[start:end]
+
+
+def _tag(name: str, matches: Iterator[re.Match[str]], shift: int) -> Iterator[ScanMatch]:
+    for m in matches:
+        start, end = m.span()
+        yield ScanMatch(name, start + shift, end + shift, m.group())
+
+
+def _iter_matches(
+    text: str,
+    patterns: Mapping[str, Pattern[str]],
+    pos: int = 0,
+    endpos: int | None = None,
+    shift: int = 0,
+) -> Iterator[ScanMatch]:
+    """Merge the matches of all `patterns`; `shift` is added to every offset."""
+    if endpos is None:
+        endpos = len(text)
+    # Each finditer() already yields in order of position, so a k-way
+    # merge gives the combined ordering without a sort.  Ties keep the
+    # order in which the patterns were given.
+    streams = [
+        _tag(name, regex.finditer(text, pos, endpos), shift) for name, regex in patterns.items()
+    ]
+    return heapq.merge(*streams, key=operator.attrgetter('start'))
+
+
+def _tag_bytes(name: str, matches: Iterator[re.Match[bytes]], shift: int) -> Iterator[ScanMatch]:
+    for m in matches:
+        start, end = m.span()
+        yield ScanMatch(
+            name, start + shift, end + shift, m.group().decode('utf-8', 'surrogateescape')
+        )
+
+
+def _scan_buffer(
+    buffer: Buffer, patterns: Mapping[str, Pattern[str]], start: int, end: int | None
+) -> list[ScanMatch]:
+    view = _window(buffer, start, end)
+    streams = [
+        _tag_bytes(name, _bytes_pattern(regex).finditer(view), start)
+        for name, regex in patterns.items()
+    ]
+    return list(heapq.merge(*streams, key=operator.attrgetter('start')))
+
+
+class LineMemo:
+    """A bounded cache of the matches found in each distinct line.
+
+    Pass one as `memo=` to `scan()` or `scan_file()` to scan input made
+    of many repeated lines (health checks, stack frames, templated log
+    messages) once per distinct line instead of once per copy.  With a
+    memo, text is matched one line at a time: no match spans a line
+    break, and each line is matched as a string of its own, so `^`,
+    `$` and lookbehinds see only that line.
+
+    Lines up to `max_key_chars` long are keyed on their text, longer
+    ones on a 16-byte BLAKE2b digest of it.  Least recently used lines
+    are evicted once the entries' approximate size passes `max_bytes`.
+    A memo remembers the patterns it was first used with and refuses
+    others.  It is not thread-safe.
+
+    Parameters
+    ----------
+    max_bytes: int, default 16 MiB
+    max_key_chars: int, default 256
+
+    Attributes
+    ----------
+    hits, misses, evictions: int
+        Lines answered from the cache, lines scanned, entries evicted.
+    size: int
+        Approximate bytes held.
+    """
+
+    # Rough cost of a cache entry beyond its key, and of each match.
+    _ENTRY_BYTES = 100
+    _MATCH_BYTES = 80
+
+    def __init__(self, max_bytes: int = 16 << 20, max_key_chars: int = 256) -> None:
+        if max_bytes < 0 or max_key_chars < 0:
+            raise ValueError('max_bytes and max_key_chars must not be negative')
+        self.max_bytes = max_bytes
+        self.max_key_chars = max_key_chars
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._cache: OrderedDict[str | bytes, tuple[int, tuple[tuple[str, int, int], ...]]]
+        self._cache = OrderedDict()
+        self._patterns: dict[str, Pattern[str]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __repr__(self) -> str:
+        return (
+            f'<LineMemo {len(self)} lines, {self.size:,} of {self.max_bytes:,} bytes, '
+            f'hit rate {self.hit_rate:.1%}>'
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lines answered from the cache, 0.0 before any lookup."""
+        looked_up = self.hits + self.misses
+        return self.hits / looked_up if looked_up else 0.0
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        self._cache.clear()
+        self._patterns = None
+        self.hits = self.misses = self.evictions = self.size = 0
+
+    def _bind(self, patterns: Mapping[str, Pattern[str]]) -> None:
+        if self._patterns is None:
+            self._patterns = dict(patterns)
+        elif self._patterns != patterns:
+            raise ValueError('this LineMemo was built for other patterns')
+
+    def _line_matches(
+        self, line: str, patterns: Mapping[str, Pattern[str]]
+    ) -> tuple[tuple[str, int, int], ...]:
+        if len(line) <= self.max_key_chars:
+            key: str | bytes = line
+            key_bytes = len(line)
+        else:
+            key = hashlib.blake2b(line.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            key_bytes = len(key)
+        cache = self._cache
+        entry = cache.get(key)
+        if entry is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        found = tuple((m.pattern, m.start, m.end) for m in _iter_matches(line, patterns))
+        cost = self._ENTRY_BYTES + key_bytes + self._MATCH_BYTES * len(found)
+        if cost <= self.max_bytes:
+            cache[key] = (cost, found)
+            self.size += cost
+            while self.size > self.max_bytes:
+                _, (evicted, _) = cache.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+        return found
+
+    def _scan(
+        self, text: str, patterns: Mapping[str, Pattern[str]], shift: int = 0
+    ) -> list[ScanMatch]:
+        """Scan `text` line by line through the cache; `shift` is added to every offset."""
+        self._bind(patterns)
+        out = []
+        base = 0
+        lines = text.split('\n')
+        if not lines[-1]:
+            # Nothing follows the final newline.
+            lines.pop()
+        for line in lines:
+            # Keep the newline, which the patterns would have seen.
+            if base + len(line) < len(text):
+                line += '\n'
+            for name, start, stop in self._line_matches(line, patterns):
+                out.append(
+                    ScanMatch(name, base + start + shift, base + stop + shift, line[start:stop])
+                )
+            base += len(line)
+        return out
+
+
+def scan(
+    text: str | Buffer,
+    patterns: PatternSpec,
+    pos: int = 0,
+    endpos: int | None = None,
+    memo: LineMemo | None = None,
+) -> list[ScanMatch]:
+    r"""Find every match of each of `patterns` in `text`.
+
+    Parameters
+    ----------
+    text: str, or bytes, bytearray or memoryview
+        The string to search, or a buffer of UTF-8 or ASCII bytes,
+        which is searched in place with the bytes-mode equivalents of
+        `patterns` (see below).
+    patterns: str, Pattern, iterable of either, or mapping
+        Names of the package's constants (`'EMAIL'`), compiled
+        patterns, or a mapping of names to compiled patterns.
+    pos, endpos: int
+        Restrict the search to `text[pos:endpos]` without slicing,
+        as with `Pattern.finditer()`.  In a buffer, the window is
+        searched on its own: patterns do not see the bytes around it,
+        which in a reused buffer may be left over from earlier reads.
+    memo: LineMemo, optional
+        Match line by line, reusing the results for lines seen before.
+        Not for buffers.
+
+    Returns
+    -------
+    list of ScanMatch, ordered by start offset.  For a buffer, offsets
+    are byte offsets into the whole buffer and each match is decoded
+    from UTF-8; nothing else is copied.
+
+    Notes
+    -----
+    A buffer is matched with each pattern's source compiled as a bytes
+    pattern, in which \d, \w and \s only know ASCII.  Patterns with
+    non-ASCII characters in their source, such as `MONEY`, raise
+    ValueError.
+    """
+    regexes = _resolve_patterns(patterns)
+    if isinstance(text, _BUFFER_TYPES):
+        if memo is not None:
+            raise TypeError('memo= cannot be used with a buffer')
+        return _scan_buffer(text, regexes, pos, endpos)
+    if memo is not None:
+        return memo._scan(text[pos:endpos], regexes, shift=pos)
+    return list(_iter_matches(text, regexes, pos, endpos))
+
+
+def _scan_decoded(
+    text: str,
+    patterns: Mapping[str, Pattern[str]],
+    base: int,
+    memo: LineMemo | None = None,
+) -> list[ScanMatch]:
+    """Scan `text`, decoded from UTF-8 bytes found at byte offset `base`.
+
+    Offsets in the result are byte offsets, so they stay valid against
+    the undecoded source.
+    """
+    if text.isascii():
+        if memo is not None:
+            return memo._scan(text, patterns, shift=base)
+        return list(_iter_matches(text, patterns, shift=base))
+    if memo is not None:
+        return _to_byte_offsets(text, memo._scan(text, patterns), base)
+    return _to_byte_offsets(text, list(_iter_matches(text, patterns)), base)
+
+
+def _to_byte_offsets(text: str, matches: Sequence[ScanMatch], base: int) -> list[ScanMatch]:
+    """Re-express character offsets into `text` as UTF-8 byte offsets plus `base`."""
+    out = []
+    char = 0
+    byte = base
+    for m in matches:
+        byte += len(text[char : m.start].encode('utf-8', 'surrogateescape'))
+        char = m.start
+        width = len(m.match.encode('utf-8', 'surrogateescape'))
+        out.append(m._replace(start=byte, end=byte + width))
+    return out
+
+
+# How `_BlockScan` treats the end of the text it has: more may follow
+# (hold back the last line), more may follow later but report what
+# cannot change (settle), or the document ends there (final).
+_HOLD, _SETTLE, _FINAL = 'hold', 'settle', 'final'
+
+# A text with no line break yet is held back only up to this size.
+_MAX_HOLD = 1 << 24
+
+
+class _BlockScan:
+    """Scan UTF-8 bytes arriving in line-aligned blocks as if they were one text.
+
+    Each block is matched after the line before it, and each pattern
+    carries on from where its search had got to, so `^`, lookbehinds
+    and matches running over a block edge come out as in a `scan()`
+    of the whole document.  A match that reaches the last line of the
+    text so far could come out differently once more text follows
+    (`$`, a run of whitespace, a lookahead), so it is only reported
+    with the next block.  Patterns that look more than a line past the
+    one a match starts on are not accounted for.
+
+    Offsets in the results are byte offsets into the stream.
+    """
+
+    __slots__ = ('base', 'ctx', 'patterns', 'resume')
+
+    def __init__(
+        self,
+        patterns: Mapping[str, Pattern[str]],
+        base: int = 0,
+        ctx: bytes = b'',
+        resume: Mapping[str, int] | None = None,
+    ) -> None:
+        self.patterns = patterns
+        # The bytes at offset `base` that the next block is matched after.
+        self.base = base
+        self.ctx = ctx
+        # Where each pattern's search goes on, as a byte offset.
+        end = base + len(ctx)
+        self.resume = {name: (resume or {}).get(name, end) for name in patterns}
+
+    def feed(self, block: bytes) -> list[ScanMatch]:
+        """Scan the next block; return the matches that are certain by now."""
+        return self._scan(self.ctx + block, _HOLD)
+
+    def settle(self) -> list[ScanMatch]:
+        """Report what no further text can change, keeping the rest for later."""
+        return self._scan(self.ctx, _SETTLE)
+
+    def close(self) -> list[ScanMatch]:
+        """End the document; return the matches still held back."""
+        return self._scan(self.ctx, _FINAL)
+
+    def _scan(self, buf: bytes, mode: str) -> list[ScanMatch]:
+        if not buf:
+            return []
+        base = self.base
+        text = buf.decode('utf-8', 'surrogateescape')
+        n = len(text)
+        # surrogateescape keeps one character per undecodable byte, so
+        # only multibyte characters make the lengths differ.
+        same = n == len(buf)
+
+        def to_char(byte: int) -> int:
+            return byte if same else len(buf[:byte].decode('utf-8', 'surrogateescape'))
+
+        def to_byte(char: int) -> int:
+            return char if same else len(text[:char].encode('utf-8', 'surrogateescape'))
+
+        last = n if mode is _FINAL else text.rfind('\n', 0, n - 1) + 1
+        if not last and mode is _HOLD and n < _MAX_HOLD:
+            # Not a whole line yet: wait for more.
+            self.ctx = buf
+            return []
+        if not last:
+            last = n
+        ext = text + '\0' if mode is _SETTLE else ''
+        # Where searches go on from at the latest.  Settling on a line
+        # that has no newline yet goes back to its start: what is
+        # written next may complete a match anywhere in it.
+        floor = last
+        if mode is _SETTLE:
+            floor = n - 1 if text.endswith('\n') else text.rfind('\n') + 1
+        kept = {}
+        resume = {}
+        for name, regex in self.patterns.items():
+            pos = to_char(self.resume[name] - base)
+            found = list(regex.finditer(text, pos))
+            k = 0
+            if mode is _FINAL:
+                k = len(found)
+            elif mode is _HOLD:
+                while k < len(found) and found[k].end() < last:
+                    k += 1
+            else:
+                # Report a match unless one more character after the
+                # text changes it, or it takes in the final newline.
+                for m, other in zip(found, regex.finditer(ext, pos), strict=False):
+                    if m.span() != other.span() or m.end() >= n:
+                        break
+                    k += 1
+            kept[name] = found[:k]
+            if k < len(found):
+                resume[name] = found[k].start()
+            else:
+                end = found[-1].end() if found else pos
+                resume[name] = max(end, floor)
+        if mode is not _FINAL:
+            # Later matches of one pattern could start before those
+            # kept of another, so report only up to the earliest place
+            # any search goes on from.
+            until = min(resume.values(), default=n)
+            for name, found in kept.items():
+                k = len(found)
+                while k and found[k - 1].start() >= until:
+                    k -= 1
+                if k < len(found):
+                    resume[name] = found[k].start()
+                    kept[name] = found[:k]
+        shift = base if same else 0
+        streams = [_tag(name, iter(found), shift) for name, found in kept.items()]
+        out = list(heapq.merge(*streams, key=operator.attrgetter('start')))
+        if not same:
+            out = _to_byte_offsets(text, out, base)
+        if mode is _FINAL:
+            self.base = base + len(buf)
+            self.ctx = b''
+            self.resume = dict.fromkeys(self.patterns, self.base)
+            return out
+        # Keep a line before the last, and a character before the
+        # earliest resumption, for `^` and lookbehinds.
+        cut = min(text.rfind('\n', 0, max(last - 1, 0)) + 1, min(resume.values(), default=n) - 1)
+        cut = to_byte(max(cut, 0))
+        self.ctx = buf[cut:]
+        self.base = base + cut
+        self.resume = {name: base + to_byte(c) for name, c in resume.items()}
+        return out
+
+
+def _by_cost(patterns: Mapping[str, Pattern[str]]) -> list[Pattern[str]]:
+    # A shorter source compiles to a smaller program, which is a fair
+    # proxy for how quickly a search fails on text that has no match.
+    return sorted(patterns.values(), key=lambda r: len(r.pattern))
+
+
+def contains_any(text: str | Buffer | Iterable[str], patterns: PatternSpec) -> bool | list[bool]:
+    """Tell whether `text` contains a match for any of `patterns`.
+
+    Patterns are tried cheapest first and the search stops at the
+    first hit, without building any match lists.
+
+    Parameters
+    ----------
+    text: str, buffer or iterable of str
+        A bytes, bytearray or memoryview buffer is searched in place,
+        as by `scan()`; pass `memoryview(buf)[start:end]` for a window.
+    patterns: see `scan()`
+
+    Returns
+    -------
+    bool, or for an iterable of records, one bool per record
+    """
+    regexes = _by_cost(_resolve_patterns(patterns))
+    if isinstance(text, _BUFFER_TYPES):
+        view = _window(text, 0, None)
+        return any(_bytes_pattern(r).search(view) for r in regexes)
+    if isinstance(text, str):
+        return any(r.search(text) for r in regexes)
+    return [any(r.search(t) for r in regexes) for t in text]
+
+
+def count(text: str | Buffer | Iterable[str], patterns: PatternSpec) -> dict[str, int]:
+    """Count the matches of each of `patterns` without keeping them.
+
+    Parameters
+    ----------
+    text: str, buffer or iterable of str
+        For an iterable of records, counts are totalled over all of them.
+        A buffer is searched in place, as by `contains_any()`.
+    patterns: see `scan()`
+
+    Returns
+    -------
+    dict mapping each pattern's name to its number of matches
+    """
+    regexes = _resolve_patterns(patterns)
+    if isinstance(text, _BUFFER_TYPES):
+        view = _window(text, 0, None)
+        return {
+            name: sum(1 for _ in _bytes_pattern(regex).finditer(view))
+            for name, regex in regexes.items()
+        }
+    counts = dict.fromkeys(regexes, 0)
+    records = [text] if isinstance(text, str) else text
+    for t in records:
+        for name, regex in regexes.items():
+            counts[name] += sum(1 for _ in regex.finditer(t))
+    return counts
@@ -0,0 +1,107 @@
+"""Stream `WORD` tokens as spans, without holding the document."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any, NamedTuple, TextIO
+
+import re101
+from re101.batch import _bool_array, _int_array
+
+
+class WordSpans(NamedTuple):
+    """The words of one chunk, as parallel arrays.
+
+    `start` and `end` are int64 offsets into the whole stream;
+    `adverb` is a bool array, or None when tagging was not asked for.
+    """
+
+    start: Any
+    end: Any
+    adverb: Any
+
+
+def _chunks(source: str | TextIO | Iterable[str], chunk_size: int) -> Iterator[str]:
+    if isinstance(source, str):
+        for i in range(0, len(source), chunk_size):
+            yield source[i : i + chunk_size]
+    elif hasattr(source, 'read'):
+        yield from iter(lambda: source.read(chunk_size), '')
+    else:
+        yield from source
+
+
+def _chunk_words(
+    source: str | TextIO | Iterable[str], chunk_size: int
+) -> Iterator[tuple[str, int, list[re.Match[str]]]]:
+    """Yield (buffer, offset of the buffer, matches) chunk by chunk.
+
+    A word running up to the end of a chunk may go on in the next one,
+    so it is held back and matched again with that chunk.
+    """
+    carry = ''
+    offset = 0
+    for chunk in _chunks(source, chunk_size):
+        buf = carry + chunk if carry else chunk
+        matches = list(re101.WORD.finditer(buf))
+        cut = matches.pop().start() if matches and matches[-1].end() == len(buf) else len(buf)
+        if matches:
+            yield buf, offset, matches
+        carry = buf[cut:]
+        offset += cut
+    if carry:
+        yield carry, offset, list(re101.WORD.finditer(carry))
+
+
+def _is_adverb(buf: str, start: int, end: int) -> bool:
+    # ADVERB's \w+ly at the end of a word, checked without a slice.
+    return end - start > 2 and buf.startswith('ly', end - 2)
+
+
+def tokenize(
+    source: str | TextIO | Iterable[str], adverbs: bool = False, chunk_size: int = 1 << 16
+) -> Iterator[tuple[int, int] | tuple[int, int, bool]]:
+    """Yield the span of each `WORD` match, reading `source` lazily.
+
+    Parameters
+    ----------
+    source: str, text file or iterable of str
+        Text, a file opened in text mode (read `chunk_size` characters
+        at a time), or any stream of chunks, which may cut words.
+    adverbs: bool, default False
+        Also tag each word with whether it ends in "ly", as `ADVERB`
+        would find, instead of running `ADVERB` as a second pass.  (On
+        its own, `ADVERB` also matches "ly" inside a word, such as
+        "Holy" in "Holyoke".)
+    chunk_size: int, default 65536
+
+    Yields
+    ------
+    (start, end), or (start, end, is_adverb) when `adverbs` is true,
+    with offsets into the whole stream.  Only one chunk is held at a
+    time, so memory does not grow with the document.
+    """
+    for buf, offset, matches in _chunk_words(source, chunk_size):
+        for m in matches:
+            start, end = m.span()
+            if adverbs:
+                yield start + offset, end + offset, _is_adverb(buf, start, end)
+            else:
+                yield start + offset, end + offset
+
+
+def tokenize_arrays(
+    source: str | TextIO | Iterable[str], adverbs: bool = False, chunk_size: int = 1 << 16
+) -> Iterator[WordSpans]:
+    """Like `tokenize()`, but yield each chunk's words as a `WordSpans` of arrays.
+
+    The arrays are NumPy arrays when NumPy is installed, else
+    `array.array`, and each holds one chunk's worth of words.
+    """
+    for buf, offset, matches in _chunk_words(source, chunk_size):
+        spans = [m.span() for m in matches]
+        starts = _int_array([s + offset for s, _ in spans])
+        ends = _int_array([e + offset for _, e in spans])
+        tags = _bool_array([_is_adverb(buf, s, e) for s, e in spans]) if adverbs else None
+        yield WordSpans(starts, ends, tags)
@@ -0,0 +1,130 @@
+"""Apply one pattern to many short strings at once.
+
+These functions take a column of values (ZIP codes, emails, cells of a
+CSV file) and return the results as columns: NumPy arrays when NumPy
+is installed, and `array.array` buffers otherwise.  Both support the
+buffer protocol, so either can be handed to NumPy, pandas or Arrow
+without a copy.
+
+The pattern's bound methods are mapped over the values, so the loop
+over values runs in C and each value is matched exactly as it would be
+on its own.
+"""
+
+from __future__ import annotations
+
+import array
+import functools
+from collections.abc import Iterable, Sequence
+from re import Pattern
+from typing import Any, NamedTuple
+
+from re101._scan import _resolve_patterns
+
+
+class SearchResult(NamedTuple):
+    """First match in each value; `start` and `end` are -1 where none."""
+
+    found: Any
+    start: Any
+    end: Any
+
+
+class FindallResult(NamedTuple):
+    """Every match, as parallel columns ordered by value then offset.
+
+    `index` is the position of the value in the input, `start` and
+    `end` are offsets within that value.
+    """
+
+    index: Any
+    start: Any
+    end: Any
+    match: list[str]
+
+
+@functools.cache
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _int_array(values: Sequence[int]) -> Any:
+    np = _numpy()
+    if np is not None:
+        return np.asarray(values, dtype=np.int64)
+    return array.array('q', values)
+
+
+def _bool_array(values: Sequence[bool]) -> Any:
+    np = _numpy()
+    if np is not None:
+        return np.asarray(values, dtype=np.bool_)
+    return array.array('b', values)
+
+
+def _as_pattern(pattern: str | Pattern[str]) -> Pattern[str]:
+    (regex,) = _resolve_patterns(pattern).values()
+    return regex
+
+
+def search(pattern: str | Pattern[str], values: Iterable[str]) -> SearchResult:
+    """Find the first match of `pattern` in each of `values`.
+
+    Parameters
+    ----------
+    pattern: str or Pattern
+        A package constant's name (`'EMAIL'`) or a compiled pattern.
+    values: iterable of str
+
+    Returns
+    -------
+    SearchResult of three arrays, each as long as `values`: `found`
+    (bool), and `start` and `end` (int64, -1 where nothing was found).
+    """
+    missing = (-1, -1)
+    spans = [missing if m is None else m.span() for m in map(_as_pattern(pattern).search, values)]
+    starts, ends = zip(*spans, strict=True) if spans else ((), ())
+    return SearchResult(_bool_array([s >= 0 for s in starts]), _int_array(starts), _int_array(ends))
+
+
+def findall(pattern: str | Pattern[str], values: Iterable[str]) -> FindallResult:
+    """Find every match of `pattern` in each of `values`.
+
+    Parameters
+    ----------
+    pattern: str or Pattern
+    values: iterable of str
+
+    Returns
+    -------
+    FindallResult with int64 arrays `index`, `start` and `end`, and the
+    matched strings in `match`.
+    """
+    regex = _as_pattern(pattern)
+    index = []
+    starts = []
+    ends = []
+    groups = []
+    for i, v in enumerate(values):
+        for m in regex.finditer(v):
+            index.append(i)
+            starts.append(m.start())
+            ends.append(m.end())
+            groups.append(m.group())
+    return FindallResult(_int_array(index), _int_array(starts), _int_array(ends), groups)
+
+
+def count(pattern: str | Pattern[str], values: Iterable[str]) -> Any:
+    """Count the matches of `pattern` in each of `values`.
+
+    Returns
+    -------
+    int64 array as long as `values`
+    """
+    # findall() on a short value makes a short list, which is cheaper
+    # than stepping a finditer() from Python.
+    return _int_array(list(map(len, map(_as_pattern(pattern).findall, values))))
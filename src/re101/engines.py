@@ -0,0 +1,170 @@
+r"""Compile the package's patterns with another regex engine.
+
+Every constant is written for the standard library's `re`.  The same
+sources can be compiled with the third-party `regex` module or with a
+binding to Google's RE2 (the `re2` module of `google-re2` or
+`pyre2`), when installed::
+
+    >>> from re101 import engines, scan
+    >>> compiled = engines.compile_all('re')
+    >>> scan('mail bob@example.com', {'EMAIL': compiled['EMAIL']})[0].match
+    'bob@example.com'
+
+RE2 matches in linear time but has no lookarounds, backreferences or
+conditional groups, so some patterns (`Number`, `MONEY`, ...) cannot
+be compiled by it.  Such patterns fall back to `re`, one by one;
+`check()` tells which.  Note also that in RE2 `\d`, `\w` and `\b` only
+know ASCII, where `re` follows Unicode, so results on non-ASCII text
+can differ.
+
+The mapping returned by `compile_all()` can be passed as `patterns` to
+`scan()` and the other scanning functions.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import re
+from collections.abc import Iterable
+from re import Pattern
+from types import ModuleType
+from typing import Any, Literal, TypeAlias
+
+import re101
+
+Engine: TypeAlias = Literal['re', 'regex', 're2']
+_ENGINES = ('re', 'regex', 're2')
+
+# re flags that RE2 understands, as inline flags.
+_RE2_FLAGS = {re.IGNORECASE: 'i', re.MULTILINE: 'm', re.DOTALL: 's'}
+
+
+@functools.cache
+def _module(engine: str) -> ModuleType | None:
+    if engine not in _ENGINES:
+        raise ValueError(f'engine must be one of {_ENGINES}, not {engine!r}')
+    try:
+        return importlib.import_module(engine)
+    except ImportError:
+        return None
+
+
+def available() -> tuple[str, ...]:
+    """Return the engines that can be imported here, `'re'` first."""
+    return tuple(e for e in _ENGINES if _module(e) is not None)
+
+
+def _compile(engine: str, source: str, flags: int) -> Any:
+    module = _module(engine)
+    if module is None:
+        raise ImportError(f'the {engine!r} engine is not installed')
+    if engine != 're2':
+        return module.compile(source, flags)
+    # Bindings disagree on how flags are passed, so use inline flags.
+    inline = ''
+    for flag, letter in _RE2_FLAGS.items():
+        if flags & flag:
+            inline += letter
+            flags &= ~flag
+    if flags & ~re.UNICODE:
+        raise ValueError(f'flags {re.RegexFlag(flags)!r} have no RE2 equivalent')
+    return module.compile(f'(?{inline}){source}' if inline else source)
+
+
+def _as_pattern(pattern: str | Pattern[str]) -> Pattern[str]:
+    if isinstance(pattern, Pattern):
+        return pattern
+    regex = getattr(re101, pattern, None) if pattern in re101.__all__ else None
+    if not isinstance(regex, Pattern):
+        raise ValueError(f'not a re101 pattern: {pattern!r}')
+    return regex
+
+
+def compile(  # noqa: A001 - named after re.compile()
+    pattern: str | Pattern[str], engine: Engine = 're', fallback: bool = True
+) -> Any:
+    """Compile one pattern's source and flags with `engine`.
+
+    Parameters
+    ----------
+    pattern: str or Pattern
+        A package constant's name (`'EMAIL'`) or a compiled pattern,
+        such as one made by `Number()`.
+    engine: {'re', 'regex', 're2'}, default 're'
+    fallback: bool, default True
+        If `engine` cannot compile the pattern, return the `re`
+        pattern instead of raising.
+
+    Returns
+    -------
+    The engine's compiled pattern object.
+
+    Raises
+    ------
+    ImportError
+        If `engine` is not installed.
+    """
+    regex = _as_pattern(pattern)
+    if _module(engine) is None:
+        raise ImportError(f'the {engine!r} engine is not installed')
+    if engine == 're':
+        return regex
+    try:
+        return _compile(engine, regex.pattern, regex.flags)
+    except ImportError:
+        raise
+    except Exception:
+        if not fallback:
+            raise
+        return regex
+
+
+def _names(names: Iterable[str] | None) -> list[str]:
+    if names is None:
+        return [n for n in re101.__all__ if isinstance(getattr(re101, n), Pattern)]
+    return list(names)
+
+
+def check(engine: Engine, names: Iterable[str] | None = None) -> dict[str, str | None]:
+    """Try to compile each pattern with `engine`.
+
+    Parameters
+    ----------
+    engine: {'re', 'regex', 're2'}
+    names: iterable of str, optional
+        Constants to check; defaults to all of them.
+
+    Returns
+    -------
+    dict mapping each name to None if `engine` compiles it, else the
+    error it raised
+    """
+    report = {}
+    for name in _names(names):
+        try:
+            compile(name, engine, fallback=False)
+        except ImportError:
+            raise
+        except Exception as exc:
+            report[name] = f'{type(exc).__name__}: {exc}'
+        else:
+            report[name] = None
+    return report
+
+
+def compile_all(engine: Engine = 're', names: Iterable[str] | None = None) -> dict[str, Any]:
+    """Compile several constants with `engine`, falling back to `re` per pattern.
+
+    Parameters
+    ----------
+    engine: {'re', 'regex', 're2'}, default 're'
+    names: iterable of str, optional
+        Constants to compile; defaults to all of them.
+
+    Returns
+    -------
+    dict mapping each name to its compiled pattern, ready to pass to
+    `scan()`
+    """
+    return {name: compile(name, engine) for name in _names(names)}
@@ -0,0 +1,346 @@
+"""Count distinct and frequent matches in fixed memory.
+
+Feed the matches of any scan into a `MatchSketch` to estimate, per
+pattern, how many distinct strings were matched and which were matched
+most often, without keeping the matches themselves::
+
+    >>> from re101 import scan
+    >>> from re101.sketch import MatchSketch
+    >>> sk = MatchSketch(top=2)
+    >>> sk.update(scan('a@b.com c@d.org a@b.com 10.0.0.1', ['EMAIL', 'IPV4']))
+    >>> sk.distinct()
+    {'EMAIL': 2, 'IPV4': 1}
+    >>> sk.top()['EMAIL']
+    [('a@b.com', 2), ('c@d.org', 1)]
+
+Distinct counts come from a HyperLogLog sketch and frequencies from a
+count-min sketch, both of a size fixed when they are created.  Sketches
+with the same parameters can be merged, so each worker of a parallel
+scan can build its own and the caller combines them; `to_bytes()` and
+`from_bytes()` move them between processes or onto disk.
+
+Items are hashed with BLAKE2b rather than `hash()`, whose output
+differs between processes, so that sketches built anywhere agree.
+"""
+
+from __future__ import annotations
+
+import array
+import hashlib
+import math
+import struct
+import sys
+from collections.abc import Iterable
+
+from re101._scan import ScanMatch
+
+# 2 ** -rank for every rank a 64-bit hash can give.
+_INVERSE_POWERS = [2.0**-r for r in range(66)]
+
+
+def _digest(item: str) -> bytes:
+    return hashlib.blake2b(item.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def _counts_to_bytes(counts: array.array) -> bytes:
+    if sys.byteorder == 'big':
+        counts = array.array(counts.typecode, counts)
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def _counts_from_bytes(data: bytes) -> array.array:
+    counts = array.array('Q')
+    counts.frombytes(data)
+    if sys.byteorder == 'big':
+        counts.byteswap()
+    return counts
+
+
+class HyperLogLog:
+    """Estimate the number of distinct items added.
+
+    Parameters
+    ----------
+    precision: int, default 14
+        Uses 2 ** precision one-byte registers (16 KiB by default), for
+        a standard error of about 1.04 / sqrt(2 ** precision), 0.8% by
+        default.  Between 4 and 18.
+    """
+
+    _MAGIC = b'HLL1'
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18')
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, item: str) -> None:
+        self._add_digest(_digest(item))
+
+    def _add_digest(self, digest: bytes) -> None:
+        x = int.from_bytes(digest[:8], 'big')
+        bits = 64 - self.precision
+        index = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(map(_INVERSE_POWERS.__getitem__, self.registers))
+        empty = self.registers.count(0)
+        if estimate <= 2.5 * m and empty:
+            # Few items: count empty registers instead, which is exact
+            # enough and far less biased there.
+            estimate = m * math.log(m / empty)
+        return round(estimate)
+
+    def merge(self, other: HyperLogLog) -> HyperLogLog:
+        """Add everything counted by `other` to this sketch, and return it."""
+        if other.precision != self.precision:
+            raise ValueError('cannot merge sketches of different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def to_bytes(self) -> bytes:
+        return self._MAGIC + bytes([self.precision]) + self.registers
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> HyperLogLog:
+        if data[:4] != cls._MAGIC:
+            raise ValueError('not a serialized HyperLogLog')
+        sketch = cls(data[4])
+        if len(data) - 5 != len(sketch.registers):
+            raise ValueError('truncated HyperLogLog')
+        sketch.registers[:] = data[5:]
+        return sketch
+
+
+class CountMinSketch:
+    """Estimate how often each item was added, never undercounting.
+
+    Parameters
+    ----------
+    width: int, default 2048
+        Counters per row.  An estimate exceeds the true count by at
+        most e / width of the total added, with probability set by
+        `depth`.
+    depth: int, default 4
+        Rows, each hashed independently; the estimate is wrong by more
+        than the bound above with probability about e ** -depth.
+    """
+
+    _MAGIC = b'CMS1'
+    _HEADER = struct.Struct('<4sIIQ')
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        if width < 1 or depth < 1:
+            raise ValueError('width and depth must be at least 1')
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.counts = array.array('Q', bytes(8 * width * depth))
+
+    def _cells(self, digest: bytes) -> list[int]:
+        # Double hashing: row i uses h1 + i * h2, which is as good as
+        # `depth` independent hashes for this purpose.
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        w = self.width
+        return [row * w + (h1 + row * h2) % w for row in range(self.depth)]
+
+    def add(self, item: str, n: int = 1) -> int:
+        """Count `item` `n` more times and return its new estimate."""
+        return self._add_digest(_digest(item), n)
+
+    def _add_digest(self, digest: bytes, n: int = 1) -> int:
+        counts = self.counts
+        cells = self._cells(digest)
+        for cell in cells:
+            counts[cell] += n
+        self.total += n
+        return min(map(counts.__getitem__, cells))
+
+    def estimate(self, item: str) -> int:
+        return self._estimate_digest(_digest(item))
+
+    def _estimate_digest(self, digest: bytes) -> int:
+        return min(map(self.counts.__getitem__, self._cells(digest)))
+
+    def merge(self, other: CountMinSketch) -> CountMinSketch:
+        """Add everything counted by `other` to this sketch, and return it."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError('cannot merge sketches of different shape')
+        self.counts = array.array('Q', map(sum, zip(self.counts, other.counts, strict=True)))
+        self.total += other.total
+        return self
+
+    def to_bytes(self) -> bytes:
+        header = self._HEADER.pack(self._MAGIC, self.width, self.depth, self.total)
+        return header + _counts_to_bytes(self.counts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> CountMinSketch:
+        size = cls._HEADER.size
+        magic, width, depth, total = cls._HEADER.unpack(data[:size])
+        if magic != cls._MAGIC:
+            raise ValueError('not a serialized CountMinSketch')
+        sketch = cls(width, depth)
+        sketch.total = total
+        counts = _counts_from_bytes(data[size:])
+        if len(counts) != len(sketch.counts):
+            raise ValueError('truncated CountMinSketch')
+        sketch.counts = counts
+        return sketch
+
+
+class _PatternSketch:
+    """Sketches for the matches of one pattern."""
+
+    def __init__(self, precision: int, top: int, width: int, depth: int) -> None:
+        self.hll = HyperLogLog(precision)
+        self.cms = CountMinSketch(width, depth) if top else None
+        self.top = top
+        # The `top` most frequent items seen so far, with estimates.
+        self.candidates: dict[str, int] = {}
+        self.floor = 0
+
+    def add(self, item: str) -> None:
+        digest = _digest(item)
+        self.hll._add_digest(digest)
+        if self.cms is None:
+            return
+        estimate = self.cms._add_digest(digest)
+        candidates = self.candidates
+        if item in candidates:
+            candidates[item] = estimate
+        elif len(candidates) < self.top:
+            candidates[item] = estimate
+            self.floor = min(candidates.values())
+        elif estimate > self.floor:
+            del candidates[min(candidates, key=candidates.__getitem__)]
+            candidates[item] = estimate
+            self.floor = min(candidates.values())
+
+    def merge(self, other: _PatternSketch) -> None:
+        self.hll.merge(other.hll)
+        if self.cms is None or other.cms is None:
+            return
+        self.cms.merge(other.cms)
+        # Re-estimate both sides' candidates against the merged counts.
+        pool = {item: self.cms.estimate(item) for item in {*self.candidates, *other.candidates}}
+        ranked = sorted(pool.items(), key=lambda kv: (-kv[1], kv[0]))[: self.top]
+        self.candidates = dict(ranked)
+        self.floor = min(self.candidates.values(), default=0)
+
+
+class MatchSketch:
+    """Distinct counts, and optionally heavy hitters, per pattern.
+
+    Parameters
+    ----------
+    precision: int, default 14
+        HyperLogLog precision (see `HyperLogLog`).
+    top: int, default 0
+        How many of the most frequent matches to track per pattern.  0
+        skips the count-min sketch altogether.
+    width, depth: int
+        Count-min sketch shape (see `CountMinSketch`).
+
+    Memory is fixed per pattern: 2 ** precision bytes, plus
+    8 * width * depth bytes and `top` strings when `top` is set.
+    """
+
+    def __init__(
+        self, precision: int = 14, top: int = 0, width: int = 2048, depth: int = 4
+    ) -> None:
+        if top < 0:
+            raise ValueError('top must not be negative')
+        self.precision = precision
+        self.top_k = top
+        self.width = width
+        self.depth = depth
+        self.patterns: dict[str, _PatternSketch] = {}
+
+    def _sketch(self, pattern: str) -> _PatternSketch:
+        sketch = self.patterns.get(pattern)
+        if sketch is None:
+            sketch = self.patterns[pattern] = _PatternSketch(
+                self.precision, self.top_k, self.width, self.depth
+            )
+        return sketch
+
+    def update(self, matches: Iterable[ScanMatch]) -> None:
+        """Add `matches`, as yielded by `scan()`, `scan_file()` and the like."""
+        for m in matches:
+            self._sketch(m.pattern).add(m.match)
+
+    def distinct(self) -> dict[str, int]:
+        """Estimate the number of distinct matches, per pattern."""
+        return {name: s.hll.count() for name, s in self.patterns.items()}
+
+    def top(self) -> dict[str, list[tuple[str, int]]]:
+        """Return the most frequent matches per pattern, with estimated counts.
+
+        Estimates never undercount, so they are upper bounds.
+        """
+        return {
+            name: sorted(s.candidates.items(), key=lambda kv: (-kv[1], kv[0]))
+            for name, s in self.patterns.items()
+        }
+
+    def merge(self, other: MatchSketch) -> MatchSketch:
+        """Add everything counted by `other` to this sketch, and return it."""
+        if (other.precision, other.top_k, other.width, other.depth) != (
+            self.precision,
+            self.top_k,
+            self.width,
+            self.depth,
+        ):
+            raise ValueError('cannot merge sketches with different parameters')
+        for name, s in other.patterns.items():
+            self._sketch(name).merge(s)
+        return self
+
+    def to_bytes(self) -> bytes:
+        """Serialize to JSON, with each sketch's bytes in base64."""
+        import base64
+        import json
+
+        def b64(data: bytes) -> str:
+            return base64.b64encode(data).decode('ascii')
+
+        doc = {
+            'precision': self.precision,
+            'top': self.top_k,
+            'width': self.width,
+            'depth': self.depth,
+            'patterns': {
+                name: {
+                    'hll': b64(s.hll.to_bytes()),
+                    'cms': None if s.cms is None else b64(s.cms.to_bytes()),
+                    'candidates': s.candidates,
+                }
+                for name, s in self.patterns.items()
+            },
+        }
+        return json.dumps(doc, sort_keys=True).encode('utf-8')
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> MatchSketch:
+        import base64
+        import json
+
+        doc = json.loads(data)
+        sketch = cls(doc['precision'], doc['top'], doc['width'], doc['depth'])
+        for name, part in doc['patterns'].items():
+            s = sketch._sketch(name)
+            s.hll = HyperLogLog.from_bytes(base64.b64decode(part['hll']))
+            if part['cms'] is not None:
+                s.cms = CountMinSketch.from_bytes(base64.b64decode(part['cms']))
+            s.candidates = part['candidates']
+            s.floor = min(s.candidates.values(), default=0)
+        return sketch
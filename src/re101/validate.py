@@ -0,0 +1,116 @@
+"""Whole-value validators for the package's patterns.
+
+Every compiled constant in `re101` has a counterpart here of the same
+name that takes a string and returns True if the *entire* string is a
+match, rather than containing one::
+
+    >>> from re101 import validate
+    >>> validate.IPV4('192.168.0.1'), validate.IPV4('ip: 192.168.0.1')
+    (True, False)
+
+Validators are built from the same compiled patterns, on first use.
+Where a plain string check is faster and gives the same answers
+(`US_ZIPCODE`), it is used instead of the regex.
+
+`luhn()` and `luhn_many()` check card numbers against their Luhn
+check digit, which no pattern can do.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from re import Pattern
+from typing import Any
+
+import re101
+from re101._scan import _resolve_patterns
+from re101.batch import _bool_array
+
+
+def _is_zipcode(value: str) -> bool:
+    if not value.isascii():
+        return False
+    if len(value) == 10 and value[5] == '-':
+        return value[:5].isdigit() and value[6:].isdigit()
+    return len(value) == 5 and value.isdigit()
+
+
+_FAST_PATHS: dict[str, Callable[[str], bool]] = {
+    'US_ZIPCODE': _is_zipcode,
+}
+
+
+def _make_validator(regex: Pattern[str]) -> Callable[[str], bool]:
+    fullmatch = regex.fullmatch
+
+    def validator(value: str) -> bool:
+        return fullmatch(value) is not None
+
+    return validator
+
+
+def _validator(pattern: str | Pattern[str]) -> Callable[[str], bool]:
+    ((name, regex),) = _resolve_patterns(pattern).items()
+    if name in _FAST_PATHS and regex is getattr(re101, name):
+        return _FAST_PATHS[name]
+    return _make_validator(regex)
+
+
+def __getattr__(name: str) -> Callable[[str], bool]:
+    if not (name in re101.__all__ and isinstance(getattr(re101, name), Pattern)):
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    validator = globals()[name] = _validator(name)
+    return validator
+
+
+def validate_many(pattern: str | Pattern[str], values: Iterable[str]) -> Any:
+    """Validate each of `values` against `pattern` as a whole.
+
+    Parameters
+    ----------
+    pattern: str or Pattern
+        A package constant's name (`'EMAIL'`) or a compiled pattern.
+    values: iterable of str
+
+    Returns
+    -------
+    bool array as long as `values` (see `re101.batch`)
+    """
+    return _bool_array(list(map(_validator(pattern), values)))
+
+
+# The Luhn sum doubles every second digit from the right, subtracting 9
+# when that gives two digits.  Looking the result up in a translation
+# table lets bytes.translate() do it for all digits at once, in C.
+_LUHN_DOUBLED = bytes.maketrans(b'0123456789', b'0246813579')
+
+
+def luhn(value: str) -> bool:
+    """Tell whether `value` is a number with a valid Luhn check digit.
+
+    Spaces and hyphens are ignored, so '4400 6940 3849 3940' and
+    '4400-6940-3849-3940' are both checked as 4400694038493940.  Any
+    other non-digit makes the value invalid.
+    """
+    if not value.isascii():
+        # int() reads any Unicode decimal digit; anything else fails.
+        try:
+            value = ''.join([c if c in ' -' else str(int(c)) for c in value])
+        except ValueError:
+            return False
+    digits = value.encode('ascii').translate(None, b' -')
+    if not digits.isdigit():
+        return False
+    # Each byte is a digit's ASCII code, 48 more than the digit itself.
+    total = sum(digits[-1::-2]) + sum(digits[-2::-2].translate(_LUHN_DOUBLED))
+    return (total - 48 * len(digits)) % 10 == 0
+
+
+def luhn_many(values: Iterable[str]) -> Any:
+    """Apply `luhn()` to each of `values`.
+
+    Returns
+    -------
+    bool array as long as `values` (see `re101.batch`)
+    """
+    return _bool_array(list(map(luhn, values)))
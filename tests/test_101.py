@@ -1,3 +1,6 @@
+import datetime as dt
+import decimal
+import random
 import re
 from re import Pattern
 
@@ -262,6 +265,40 @@ EXTRA_SEARCH_CASES = {
         'valid': ['file:///tmp/foo', 'ftp://example.com/file'],
         'invalid': ['bare text'],
     },
+    'DATE': {
+        'valid': ['2024-01-05', 'on 1999-12-31.', '2024-01-05T10:04:31Z'],
+        'invalid': ['2024-13-01', '2024-01-32', '12024-01-05', '2024-01-050', '24-01-05'],
+    },
+    'MONEY': {
+        'valid': [
+            '$5',
+            '$1,250.00',
+            '€ 5',
+            '12 €',
+            '-$3.50',
+            'costs ¥.75',
+            'US$7',
+            'item 3 $4.00',
+            'costs 5 $10',
+        ],
+        'invalid': ['5', '1,0000 €', 'x5 €', '$', '4.5%'],
+    },
+    'DATETIME': {
+        'valid': [
+            '2024-01-05T10:04:31Z',
+            '2024-01-05 10:04',
+            '2024-01-05 10:04:31,120 +05:30',
+            '2024-01-05T10:04:31.5-0800',
+        ],
+        'invalid': [
+            '2024-01-05',
+            '2024-01-05T24:00',
+            '2024-01-05 10:60',
+            '2024-01-05T23:59:60',
+            '2024-01-05T10:04-05',
+            '2024-01-05 10:04:31 -05',
+        ],
+    },
 }
 
 
@@ -376,6 +413,98 @@ def test_number_class_accepts_re_flags():
     assert regex.flags & re.MULTILINE
 
 
+# The grammar as it was first written, one fully guarded alternative
+# per form.  The compiled classes must find exactly what these do.
+_LOOKBEHIND_NUMBERS = {
+    (True, True): (
+        # Leading zeros permitted; commas permitted.
+        r'(?:(?<= )|(?<=^))(?<!\.)\d+(?:,\d{3})*(?= |$)',
+        r'(?:(?<= )|(?<=^))(?<!\.)\d+(?:,\d{3})*\.\d+(?:[eE][+-]?\d+)?(?= |$)',
+        r'(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)',
+    ),
+    (True, False): (
+        # Leading zeros permitted; commas not permitted.
+        r'(?:(?<= )|(?<=^))(?<!\.)\d+(?= |$)',
+        r'(?:(?<= )|(?<=^))(?<!\.)\d+\.\d+(?:[eE][+-]?\d+)?(?= |$)',
+        r'(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)',
+    ),
+    (False, True): (
+        # Leading zeros not permitted; commas permitted.
+        r'(?:(?<= )|(?<=^))(?<!\.)[1-9]+\d*(?:,\d{3})*(?= |$)',
+        r'(?:(?<= )|(?<=^))(?<!\.)[1-9]+\d*(?:,\d{3})*\.\d+(?:[eE][+-]?\d+)?(?= |$)',
+        r'(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)',
+    ),
+    (False, False): (
+        # Neither permitted.
+        r'(?:(?<= )|(?<=^))(?<!\.)[1-9]+\d*(?= |$)',
+        r'(?:(?<= )|(?<=^))(?<!\.)[1-9]+\d*\.\d+(?:[eE][+-]?\d+)?(?= |$)',
+        r'(?:(?<= )|(?<=^))(?<!\d)\.\d+(?:[eE][+-]?\d+)?(?= |$)',
+    ),
+}
+
+
+def _fuzz_strings(n=3000, seed=101):
+    rng = random.Random(seed)
+    alphabet = '0001123456789..,,,eE+- \n\tx١'
+    return [''.join(rng.choices(alphabet, k=rng.randint(0, 24))) for _ in range(n)]
+
+
+@pytest.mark.parametrize('leading_zeros', [True, False])
+@pytest.mark.parametrize('commas', [True, False])
+@pytest.mark.parametrize('flags', [0, re.MULTILINE])
+def test_number_classes_match_original_grammar(leading_zeros, commas, flags):
+    branches = _LOOKBEHIND_NUMBERS[leading_zeros, commas]
+    reference = {
+        re101.Number: re.compile('|'.join(branches), flags),
+        re101.Integer: re.compile(branches[0], flags),
+        re101.Decimal: re.compile('|'.join(branches[1:]), flags),
+    }
+    texts = [*_fuzz_strings(), *(v for c in class_cases.values() for v in c['valid'])]
+    for cls, ref in reference.items():
+        regex = cls(leading_zeros, commas, flags)
+        for text in texts:
+            assert [m.span() for m in regex.finditer(text)] == [
+                m.span() for m in ref.finditer(text)
+            ], (cls, text)
+
+
+REPORT = 'total 1,234.50 over 7 items at .5 each 076 and 6,999,999 9.5e-3 x12 ١٢'
+
+
+@pytest.mark.parametrize('leading_zeros', [True, False])
+@pytest.mark.parametrize('commas', [True, False])
+@pytest.mark.parametrize('integers', [True, False])
+def test_extract_numbers_matches_one_at_a_time(leading_zeros, commas, integers):
+    cls = re101.Integer if integers else re101.Number
+    parse = int if integers else float
+    expected = [
+        (parse(m.group().replace(',', '')), *m.span())
+        for m in cls(leading_zeros, commas).finditer(REPORT)
+    ]
+    values, starts, ends = re101.extract_numbers(REPORT, leading_zeros, commas, integers)
+    assert list(zip(values, starts, ends, strict=True)) == expected
+    assert expected
+
+
+def test_extract_numbers_types():
+    values, starts, ends = re101.extract_numbers('a 12 b 1,234', integers=True)
+    assert list(values) == [12, 1234]
+    assert [type(v) for v in values.tolist()] == [int, int]
+    assert list(starts) == [2, 7]
+    assert list(ends) == [4, 12]
+    values, _, _ = re101.extract_numbers('a 12 b 1,234')
+    assert [type(v) for v in values.tolist()] == [float, float]
+
+
+def test_extract_numbers_empty():
+    assert [list(a) for a in re101.extract_numbers('no numbers here')] == [[], [], []]
+
+
+def test_extract_numbers_overflow():
+    with pytest.raises(OverflowError):
+        re101.extract_numbers('9' * 30, integers=True)
+
+
 # ---------------------------------------------------------------------
 # Helper factories & extract_* functions.
 
@@ -438,3 +567,165 @@ def test_no_deprecated_wrapper_remains():
     assert not hasattr(re101, '_DeprecatedRegex')
     for legacy in ('email', 'ipv4', 'zipcode', 'nanp_phonenum'):
         assert not hasattr(re101, legacy), f'legacy alias {legacy!r} should be gone'
+
+
+def test_extract_userinfo_matches_separate_extractors():
+    text = 'username: alice, password = hunter2\nDOB: 1990-01-01 pw is s3cret'
+    found = re101.extract_userinfo(text)
+    assert [t for t, _, _ in found['password']] == re101.extract_pw(text)
+    assert [t for t, _, _ in found['username']] == re101.extract_un(text)
+    assert [t for t, _, _ in found['dob']] == re101.extract_dob(text)
+    for matches in found.values():
+        for token, start, end in matches:
+            assert text[start:end] == token
+
+
+@pytest.mark.parametrize(
+    'text', ['pw: user: bob', 'user=pw=x dob: 1 pw: pw:y', 'password is username is DOB: 1990']
+)
+def test_extract_userinfo_finds_labels_inside_values(text):
+    found = re101.extract_userinfo(text)
+    assert [t for t, _, _ in found['password']] == re101.extract_pw(text)
+    assert [t for t, _, _ in found['username']] == re101.extract_un(text)
+    assert [t for t, _, _ in found['dob']] == re101.extract_dob(text)
+
+
+def test_extract_userinfo_extra_keys():
+    text = 'API key: abc123 and token=xyz, password: pw1'
+    found = re101.extract_userinfo(text, extra_keys={'api_key': r'api[ _-]?key', 'token': r'token'})
+    assert found['api_key'] == [('abc123', 9, 15)]
+    assert found['token'] == [('xyz,', 26, 30)]
+    assert [t for t, _, _ in found['password']] == ['pw1']
+
+
+@pytest.mark.parametrize('key', ['not valid', '_value'])
+def test_extract_userinfo_rejects_bad_keys(key):
+    with pytest.raises(ValueError, match='invalid key'):
+        re101.extract_userinfo('x', extra_keys={key: 'x'})
+
+
+def test_extract_datetimes():
+    utc = dt.timezone.utc
+    text = (
+        'start 2024-01-05T10:04:31Z, retry 2024-01-05 10:04:31,1234567 +05:30; '
+        'bad 2023-02-30 due 2024-02-29 then 2024-02-29T07:00-0800'
+    )
+    found = re101.extract_datetimes(text)
+    assert [v for v, _, _ in found] == [
+        dt.datetime(2024, 1, 5, 10, 4, 31, tzinfo=utc),
+        dt.datetime(
+            2024, 1, 5, 10, 4, 31, 123456, tzinfo=dt.timezone(dt.timedelta(hours=5, minutes=30))
+        ),
+        dt.datetime(2024, 2, 29),
+        dt.datetime(2024, 2, 29, 7, 0, tzinfo=dt.timezone(dt.timedelta(hours=-8))),
+    ]
+    for value, start, _ in found:
+        assert value.year == int(text[start : start + 4])
+    assert text[found[1][1] : found[1][2]] == '2024-01-05 10:04:31,1234567 +05:30'
+    # Not cut short to the date, or to the time before a bad second or offset.
+    assert re101.extract_datetimes('2024-01-05T23:59:60, 2024-01-05 10:04 -05') == []
+
+
+@pytest.mark.parametrize(
+    ('text', 'stamp'),
+    [
+        ('temp 2024-01-05 -3.2 C', '2024-01-05'),
+        ('2024-01-05 +12 units', '2024-01-05'),
+        ('from 2024-01-05T10:00 -2 hours', '2024-01-05T10:00'),
+        ('2024-01-05 10:00:00 +3.5', '2024-01-05 10:00:00'),
+        ('2024-01-05T10:00Z -30', '2024-01-05T10:00Z'),
+    ],
+)
+def test_datetimes_followed_by_signed_numbers(text, stamp):
+    ((_, start, end),) = re101.extract_datetimes(text)
+    assert text[start:end] == stamp
+    if len(stamp) > len('2024-01-05'):
+        assert re101.DATETIME.search(text).group() == stamp
+
+
+@pytest.mark.parametrize(
+    'stamp',
+    [
+        '2024-01-05T10:04:31',
+        '2024-01-05T10:04:31.250000',
+        '2024-01-05 00:00',
+        '1999-12-31T23:59:59+01:00',
+    ],
+)
+def test_extract_datetimes_agrees_with_fromisoformat(stamp):
+    ((value, start, end),) = re101.extract_datetimes(f'x {stamp} y')
+    assert value == dt.datetime.fromisoformat(stamp)
+    assert (start, end) == (2, 2 + len(stamp))
+
+
+def test_datetime_from_groups_agrees_with_fast_path():
+    stamps = [
+        '2024-01-05',
+        '2024-01-05T10:04',
+        '2024-01-05 10:04:31,1234567',
+        '2024-01-05T10:04:31.5Z',
+        '2024-01-05T10:04:31-0800',
+        '2024-01-05 10:04:31 +05:30',
+    ]
+    for m in re101._date_maybe_time.finditer(' '.join(stamps)):
+        ((value, _, _),) = re101.extract_datetimes(m.group())
+        assert value == re101._datetime_from_groups(m)
+        assert value.utcoffset() == re101._datetime_from_groups(m).utcoffset()
+
+
+def test_extract_money():
+    text = 'paid $1,250.00 and € 5, then 12 € plus -$3.50; ids 5 and 1,0000 € ¥.75'
+    found = re101.extract_money(text)
+    assert [(sym, amount) for sym, amount, _, _ in found] == [
+        ('$', decimal.Decimal('1250.00')),
+        ('€', decimal.Decimal('5')),
+        ('€', decimal.Decimal('12')),
+        ('$', decimal.Decimal('-3.50')),
+        ('¥', decimal.Decimal('0.75')),
+    ]
+    assert [text[a:b] for _, _, a, b in found] == ['$1,250.00', '€ 5', '12 €', '-$3.50', '¥.75']
+    assert all(type(amount) is decimal.Decimal for _, amount, _, _ in found)
+
+
+@pytest.mark.parametrize(
+    ('text', 'expected'),
+    [
+        ('item 3 $4.00', [('$', decimal.Decimal('4.00'), 7, 12)]),
+        ('costs 5 $10', [('$', decimal.Decimal(10), 8, 11)]),
+        ('costs 5 € .5', [('€', decimal.Decimal('0.5'), 8, 12)]),
+        ('total 12 €.', [('€', decimal.Decimal(12), 6, 10)]),
+    ],
+)
+def test_extract_money_quantity_before_price(text, expected):
+    assert re101.extract_money(text) == expected
+
+
+def test_extract_money_columns():
+    text = 'paid $1,250.00 and € 5, then 12 € plus -$3.50'
+    symbols, amounts, starts, ends = re101.extract_money(text, columns=True)
+    assert list(zip(symbols, amounts, starts, ends, strict=True)) == re101.extract_money(text)
+    assert [list(c) for c in re101.extract_money('none', columns=True)] == [[], [], [], []]
+
+
+@pytest.mark.parametrize('sign', list(re101.MONEYSIGN))
+def test_money_accepts_every_currency_sign(sign):
+    assert re101.extract_money(f'{sign}10 and 20{sign}') == [
+        (sign, decimal.Decimal(10), 0, 3),
+        (sign, decimal.Decimal(20), 8, 11),
+    ]
+
+
+def test_extract_credit_cards():
+    text = (
+        'visa 4111 1111 1111 1111, typo 4111111111111112, amex 378282246310005, '
+        'mc 5555-5555-5555-4444, discover 6011111111111117, order 1234567890123456'
+    )
+    assert [(brand, number) for brand, number, _, _ in re101.extract_credit_cards(text)] == [
+        ('visa', '4111 1111 1111 1111'),
+        ('amex', '378282246310005'),
+        ('mastercard', '5555-5555-5555-4444'),
+        ('discover', '6011111111111117'),
+    ]
+    unvalidated = re101.extract_credit_cards(text, validate=False)
+    assert ('visa', '4111111111111112') in [(b, n) for b, n, _, _ in unvalidated]
+    assert [text[a:b] for _, _, a, b in unvalidated] == re101.STRICT_CREDIT_CARD.findall(text)
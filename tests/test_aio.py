@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import re101
+
+PATTERNS = ['PASSWORD', 'USERNAME', 'STRICT_SSN']
+DATA = ''.join(
+    f'{i} username: user{i} password=hunter{i} ssn 123-45-{i:04d} naïve\n' for i in range(300)
+).encode()
+
+
+async def _collect(pieces, **kwargs):
+    reader = asyncio.StreamReader()
+    for piece in pieces:
+        reader.feed_data(piece)
+    reader.feed_eof()
+    return [m async for m in re101.ascan(reader, PATTERNS, **kwargs)]
+
+
+def _split(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('chunk_size', [7, 100, 1 << 16])
+@pytest.mark.parametrize('offload_size', [1, 1 << 30])
+def test_ascan_matches_whole_stream_scan(chunk_size, offload_size):
+    got = asyncio.run(_collect(_split(DATA, 13), chunk_size=chunk_size, offload_size=offload_size))
+    assert [m.match for m in got] == [m.match for m in re101.scan(DATA.decode(), PATTERNS)]
+    for m in got:
+        assert DATA[m.start : m.end].decode() == m.match
+
+
+def test_ascan_scans_unterminated_last_line():
+    got = asyncio.run(_collect([b'pw is ', b'secret']))
+    assert [(m.pattern, m.start, m.match) for m in got] == [('PASSWORD', 0, 'pw is secret')]
+
+
+def test_ascan_uses_given_executor():
+    with ThreadPoolExecutor(1) as pool:
+        got = asyncio.run(_collect([DATA], offload_size=1, executor=pool))
+    assert len(got) == 900
+
+
+def test_ascan_reads_only_on_demand():
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'ssn 123-45-6789\n' * 10)
+        it = re101.ascan(reader, 'STRICT_SSN', chunk_size=16)
+        first = await it.__anext__()
+        await it.aclose()
+        return first, len(reader._buffer)
+
+    first, unread = asyncio.run(main())
+    assert first.match == '123-45-6789'
+    # The line after a match is read to make sure of it.
+    assert unread == 16 * 8
+
+
+def test_ascan_reads_are_not_matched_on_their_own():
+    data = b'1 a 2\n' * 5000
+
+    async def main(size):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [m async for m in re101.ascan(reader, {'N': re101.Number()}, chunk_size=size)]
+
+    whole = re101.scan(data.decode(), {'N': re101.Number()})
+    assert len(whole) == 2
+    for size in (1000, 7, 1 << 16):
+        assert asyncio.run(main(size)) == whole
@@ -0,0 +1,77 @@
+import re
+from re import Pattern
+
+import pytest
+
+import re101
+from re101 import batch
+
+from .test_101 import EXTRA_SEARCH_CASES, SEARCH_CASES, class_cases
+
+VALUES = [
+    *sorted(
+        {
+            s
+            for cases in (SEARCH_CASES, EXTRA_SEARCH_CASES, class_cases)
+            for v in cases.values()
+            for kind in ('valid', 'invalid')
+            for s in v[kind]
+        }
+    ),
+    '',
+    'two\nlines 1.2.3.4',
+    ' 42 ',
+    '1 2 3',
+]
+
+CONSTANTS = [k for k in re101.__all__ if isinstance(getattr(re101, k), Pattern)]
+
+
+def _expected(regex, values):
+    return [(i, *m.span(), m.group()) for i, v in enumerate(values) for m in regex.finditer(v)]
+
+
+@pytest.mark.parametrize('name', CONSTANTS)
+def test_findall_matches_per_value_finditer(name):
+    regex = getattr(re101, name)
+    result = batch.findall(name, VALUES)
+    got = list(zip(result.index, result.start, result.end, result.match, strict=True))
+    assert got == _expected(regex, VALUES)
+
+
+@pytest.mark.parametrize('cls', [re101.Number, re101.Integer, re101.Decimal])
+def test_findall_number_classes(cls):
+    regex = cls()
+    result = batch.findall(regex, VALUES)
+    assert list(result.match) == [m for *_, m in _expected(regex, VALUES)]
+
+
+def test_search_and_count():
+    values = ['90210', 'none', 'a 19104-1234 b 10001', 'x\n02139']
+    result = batch.search('US_ZIPCODE', values)
+    assert list(result.found) == [True, False, True, True]
+    assert list(result.start) == [0, -1, 2, 2]
+    assert list(result.end) == [5, -1, 12, 7]
+    assert list(batch.count(re101.US_ZIPCODE, values)) == [1, 0, 2, 1]
+
+
+def test_matches_do_not_run_from_one_value_into_the_next():
+    regex = re.compile(r'a\sb')
+    assert list(batch.count(regex, ['xa', 'b', 'a b'])) == [0, 0, 1]
+
+
+def test_absolute_anchors_match_at_each_value():
+    regex = re.compile(r'\Aab')
+    assert list(batch.count(regex, ['ab', 'ab', 'xab'])) == [1, 1, 0]
+
+
+def test_empty_input():
+    assert list(batch.count('EMAIL', [])) == []
+    assert batch.findall(re.compile('x*'), []).match == []
+
+
+def test_numpy_results():
+    np = pytest.importorskip('numpy')
+    result = batch.search('EMAIL', ['a@b.com', 'no'])
+    assert result.found.dtype == np.bool_
+    assert result.start.dtype == np.int64
@@ -0,0 +1,99 @@
+import re
+import types
+
+import pytest
+
+import re101
+from re101 import engines
+
+from .test_batch import CONSTANTS
+
+
+class FakeRE2:
+    """Stands in for an RE2 binding: rejects lookarounds and conditionals."""
+
+    def __init__(self):
+        self.sources = []
+
+    def compile(self, source):
+        self.sources.append(source)
+        if re.search(r'\(\?(?:<?[=!]|\()', source):
+            raise re.error('invalid perl operator')
+        return re.compile(source)
+
+
+@pytest.fixture
+def fake_re2(monkeypatch):
+    fake = FakeRE2()
+    real = engines._module
+
+    def module(engine):
+        return types.SimpleNamespace(compile=fake.compile) if engine == 're2' else real(engine)
+
+    monkeypatch.setattr(engines, '_module', module)
+    return fake
+
+
+def test_re_is_always_available_and_returns_constants():
+    assert engines.available()[0] == 're'
+    compiled = engines.compile_all('re')
+    assert set(compiled) == set(CONSTANTS)
+    assert all(compiled[name] is getattr(re101, name) for name in compiled)
+    assert all(error is None for error in engines.check('re').values())
+
+
+def test_unknown_and_missing_engines(monkeypatch):
+    with pytest.raises(ValueError, match='engine must be one of'):
+        engines.compile('EMAIL', 'pcre')
+    monkeypatch.setattr(engines, '_module', lambda engine: None if engine == 're2' else re)
+    assert 're2' not in engines.available()
+    with pytest.raises(ImportError, match='not installed'):
+        engines.compile('EMAIL', 're2')
+    with pytest.raises(ImportError):
+        engines.check('re2')
+
+
+def test_not_a_pattern():
+    with pytest.raises(ValueError, match='not a re101 pattern'):
+        engines.compile('MONEYSIGN')
+
+
+def test_fallback_per_pattern(fake_re2):
+    compiled = engines.compile_all('re2', ['EMAIL', 'MONEY', 'DATE'])
+    assert compiled['MONEY'] is re101.MONEY  # conditional group: fell back
+    assert compiled['DATE'] is re101.DATE  # lookbehind: fell back
+    assert compiled['EMAIL'] is not re101.EMAIL
+    report = engines.check('re2', ['EMAIL', 'MONEY'])
+    assert report['EMAIL'] is None
+    assert 'invalid perl operator' in report['MONEY']
+    with pytest.raises(re.error):
+        engines.compile(re101.Number(), 're2', fallback=False)
+
+
+def test_re2_flags_become_inline(fake_re2):
+    engines.compile('EMAIL', 're2')
+    assert fake_re2.sources[-1] == '(?i)' + re101.EMAIL.pattern
+    engines.compile(re.compile('a.b', re.M | re.S), 're2')
+    assert fake_re2.sources[-1] == '(?ms)a.b'
+    # re.VERBOSE has no RE2 equivalent.
+    verbose = re.compile('a b', re.X)
+    assert engines.compile(verbose, 're2') is verbose
+
+
+def test_compiled_patterns_scan_like_re(fake_re2):
+    text = 'mail bob@example.com from 192.168.0.1 on 2024-01-05'
+    names = ['EMAIL', 'IPV4', 'DATE']
+    assert re101.scan(text, engines.compile_all('re2', names)) == re101.scan(text, names)
+
+
+@pytest.mark.parametrize('engine', ['regex', 're2'])
+def test_installed_engines_agree_on_ascii(engine):
+    pytest.importorskip(engine)
+    from .test_batch import VALUES
+
+    compiled = engines.compile_all(engine)
+    for name, regex in compiled.items():
+        for value in VALUES:
+            if value.isascii():
+                expected = [m.span() for m in getattr(re101, name).finditer(value)]
+                assert [m.span() for m in regex.finditer(value)] == expected, (name, value)
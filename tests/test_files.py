@@ -0,0 +1,243 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import re101
+from re101 import _files
+
+PATTERNS = ['EMAIL', 'IPV4', 'STRICT_SSN']
+DATA = ''.join(
+    f'row {i} u{i}@example.com 10.0.{i % 256}.1 ssn 123-45-{i:04d} café\n' for i in range(500)
+).encode()
+
+
+@pytest.mark.parametrize(
+    ('suffix', 'compress'),
+    [
+        ('.log', lambda b: b),
+        ('.gz', gzip.compress),
+        ('.bz2', bz2.compress),
+        ('.xz', lzma.compress),
+    ],
+)
+def test_scan_file_matches_whole_file_scan(tmp_path, suffix, compress):
+    path = tmp_path / f'data{suffix}'
+    path.write_bytes(compress(DATA))
+    got = list(re101.scan_file(path, PATTERNS, chunk_size=1000, prefetch=2))
+    assert [m.match for m in got] == [m.match for m in re101.scan(DATA.decode(), PATTERNS)]
+    for m in got:
+        assert DATA[m.start : m.end].decode() == m.match
+
+
+# Anchored, lookbehind and multi-line patterns see block edges if
+# blocks are matched one by one.
+EDGE_PATTERNS = {
+    'number': re101.Number(),
+    'runs': re101.MULT_WHITESPACE,
+    'line_end': re.compile(r'\w+$'),
+    'after_blank': re.compile(r'(?<=\n\n)\w+'),
+}
+EDGE_DATA = ('1 a 2\n' * 300 + 'x\n\n\ny é 3\n\n' * 40 + 'end 4').encode()
+
+
+def byte_spans(data, patterns):
+    text = data.decode()
+    return [
+        (m.pattern, len(text[: m.start].encode()), len(text[: m.end].encode()))
+        for m in re101.scan(text, patterns)
+    ]
+
+
+@pytest.mark.parametrize('chunk_size', [7, 100, 1000, 1 << 20])
+def test_scan_file_is_independent_of_chunk_size(tmp_path, chunk_size):
+    path = tmp_path / 'data.log'
+    path.write_bytes(EDGE_DATA)
+    got = list(re101.scan_file(path, EDGE_PATTERNS, chunk_size=chunk_size))
+    assert [(m.pattern, m.start, m.end) for m in got] == byte_spans(EDGE_DATA, EDGE_PATTERNS)
+    assert sum(m.pattern == 'number' for m in got) == 2
+
+
+@pytest.mark.parametrize('suffix', ['.log', '.gz'])
+def test_scan_file_with_line_memo(tmp_path, suffix):
+    path = tmp_path / f'data{suffix}'
+    path.write_bytes(gzip.compress(DATA * 2) if suffix == '.gz' else DATA * 2)
+    memo = re101.LineMemo()
+    assert list(re101.scan_file(path, PATTERNS, chunk_size=4096, memo=memo)) == list(
+        re101.scan_file(path, PATTERNS)
+    )
+    assert memo.hits == memo.misses == 500
+
+
+def test_import_defers_file_and_pool_modules():
+    deferred = ['bz2', 'concurrent.futures', 'gzip', 'json', 'lzma', 'mmap', 'sqlite3', 'threading']
+    code = f'import sys, re101; print([m for m in {deferred!r} if m in sys.modules])'
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
+
+
+def test_scan_file_zst_without_module(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'compression.zstd', None)
+    with pytest.raises(ValueError, match='zstd'):
+        re101.scan_file(tmp_path / 'x.zst', PATTERNS)
+
+
+def test_scan_file_stops_early_without_hanging(tmp_path):
+    path = tmp_path / 'data.gz'
+    path.write_bytes(gzip.compress(DATA * 20))
+    it = re101.scan_file(path, 'EMAIL', chunk_size=100, prefetch=1)
+    assert next(it).match == 'u0@example.com'
+    it.close()
+
+
+def test_scan_file_propagates_reader_errors(tmp_path):
+    path = tmp_path / 'broken.gz'
+    path.write_bytes(b'not gzip at all')
+    with pytest.raises(gzip.BadGzipFile):
+        list(re101.scan_file(path, 'EMAIL'))
+
+
+def test_read_lines_chunked_caps_long_lines(monkeypatch):
+    monkeypatch.setattr(_files, '_MAX_LINE_CHUNKS', 2)
+    blocks = list(_files._read_lines_chunked(io.BytesIO(b'x' * 10 + b'\nab'), 3))
+    assert b''.join(blocks) == b'x' * 10 + b'\nab'
+    assert blocks[0] == b'xxxxxx'
+    assert blocks[-1] == b'ab'
+
+
+def test_scan_tail_scans_only_appended_lines(tmp_path):
+    log = tmp_path / 'app.log'
+    state = tmp_path / 'state.json'
+    log.write_bytes(b'a@b.com\nc@d.com\npartial e@f')
+    first = re101.scan_tail(log, 'EMAIL', state)
+    assert [(m.start, m.match) for m in first] == [(0, 'a@b.com'), (8, 'c@d.com')]
+    assert re101.scan_tail(log, 'EMAIL', state) == []
+    with log.open('ab') as f:
+        f.write(b'.com\ng@h.com\n')
+    second = re101.scan_tail(log, 'EMAIL', state)
+    assert [(m.start, m.match) for m in second] == [(24, 'e@f.com'), (32, 'g@h.com')]
+    data = log.read_bytes()
+    assert all(data[m.start : m.end].decode() == m.match for m in second)
+
+
+def test_scan_tail_restarts_after_truncation_and_rewrite(tmp_path):
+    log = tmp_path / 'app.log'
+    state = tmp_path / 'state.json'
+    log.write_bytes(b'a@b.com\n' * 10)
+    assert len(re101.scan_tail(log, 'EMAIL', state)) == 10
+    log.write_bytes(b'x@y.com\n')  # truncated
+    assert [m.match for m in re101.scan_tail(log, 'EMAIL', state)] == ['x@y.com']
+    log.write_bytes(b'z@y.com\n' * 3)  # rewritten and longer than the checkpoint
+    assert len(re101.scan_tail(log, 'EMAIL', state)) == 3
+
+
+def test_scan_tail_restarts_after_rotation(tmp_path):
+    log = tmp_path / 'app.log'
+    state = tmp_path / 'state.json'
+    log.write_bytes(b'a@b.com\n')
+    re101.scan_tail(log, 'EMAIL', state)
+    log.rename(tmp_path / 'app.log.1')
+    log.write_bytes(b'a@b.com\n')
+    assert len(re101.scan_tail(log, 'EMAIL', state)) == 1
+
+
+def test_scan_tail_is_independent_of_chunk_size(tmp_path):
+    log = tmp_path / 'app.log'
+    log.write_bytes(b'1 a 2\n' * 5000)
+    for chunk_size in (7, 1000, 1 << 20):
+        state = tmp_path / f'state{chunk_size}.json'
+        got = re101.scan_tail(log, {'N': re101.Number()}, state, chunk_size=chunk_size)
+        # The last 2 is held back: the next line may not be another '1 a 2'.
+        assert [(m.start, m.match) for m in got] == [(0, '1')]
+
+
+def test_scan_tail_is_independent_of_polling(tmp_path):
+    log = tmp_path / 'app.log'
+    state = tmp_path / 'state.json'
+    lines = ['1 a 2\n', 'x\n', '\n', '  \n', 'y 3\n', 'z\n\n\n'] * 40
+    chunks = [''.join(lines[i : i + 1 + i % 5]) for i in range(0, 240, 7)]
+    log.write_bytes(b'')
+    got = []
+    for chunk in [*chunks, 'END\n']:
+        with log.open('ab') as f:
+            f.write(chunk.encode())
+        got += re101.scan_tail(log, EDGE_PATTERNS, state, chunk_size=20)
+    data = log.read_bytes()
+    end = data.index(b'END')
+    assert [(m.pattern, m.start, m.end) for m in got if m.start < end] == [
+        s for s in byte_spans(data, EDGE_PATTERNS) if s[1] < end
+    ]
+
+
+def test_scan_tail_long_unfinished_line(tmp_path):
+    log = tmp_path / 'app.log'
+    state = tmp_path / 'state.json'
+    # Long enough to be handed over unfinished, cut inside the address.
+    data = ('ab ' * 21842 + ' bob@example.com ').encode()
+    cut = _files._MAX_LINE_CHUNKS * 4096
+    assert data.index(b'bob') < cut < data.index(b'.com')
+    log.write_bytes(data[:cut])
+    assert re101.scan_tail(log, 'EMAIL', state, chunk_size=4096) == []
+    with log.open('ab') as f:
+        f.write(data[cut:] + b'\n')
+    got = re101.scan_tail(log, 'EMAIL', state, chunk_size=4096)
+    assert [(m.start, m.match) for m in got] == [(data.index(b'bob'), 'bob@example.com')]
+
+
+def test_scan_tail_state_is_shared_between_files(tmp_path):
+    state = tmp_path / 'state.json'
+    for name in ('one.log', 'two.log'):
+        (tmp_path / name).write_bytes(b'a@b.com\n')
+        assert len(re101.scan_tail(tmp_path / name, 'EMAIL', state)) == 1
+    assert len(json.loads(state.read_text())) == 2
+
+
+def _tree(tmp_path):
+    root = tmp_path / 'tree'
+    (root / 'b' / 'c').mkdir(parents=True)
+    (root / 'a.txt').write_text('mail a@b.com\n')
+    (root / 'b' / 'note.md').write_text('nothing here\n')
+    (root / 'b' / 'c' / 'deep.txt').write_text('ip 10.0.0.1 and x@y.com\n')
+    (root / 'b' / 'blob.bin').write_bytes(b'\0\1\2 a@b.com')
+    return root
+
+
+def test_scan_tree_walks_text_files_in_order(tmp_path):
+    root = _tree(tmp_path)
+    result = list(re101.scan_tree(root, ['EMAIL', 'IPV4']))
+    assert [Path(p).relative_to(root).as_posix() for p, _ in result] == [
+        'a.txt',
+        'b/note.md',
+        'b/c/deep.txt',
+    ]
+    assert [m.match for m in result[2][1]] == ['10.0.0.1', 'x@y.com']
+
+
+def test_scan_tree_cache_hits_and_invalidation(tmp_path, monkeypatch):
+    root = _tree(tmp_path)
+    cache = tmp_path / 'cache.sqlite'
+    first = list(re101.scan_tree(root, ['EMAIL'], cache=cache))
+
+    calls = []
+    real = _files._scan_text_file
+    monkeypatch.setattr(_files, '_scan_text_file', lambda p, r: calls.append(p) or real(p, r))
+    assert list(re101.scan_tree(root, ['EMAIL'], cache=cache)) == first
+    assert calls == []
+
+    deep = root / 'b' / 'c' / 'deep.txt'
+    deep.write_text('now z@y.com only, and longer\n')
+    second = dict(re101.scan_tree(root, ['EMAIL'], cache=cache))
+    assert calls == [str(deep)]
+    assert [m.match for m in second[str(deep)]] == ['z@y.com']
+
+    # A different pattern (or a changed source) misses the cache.
+    calls.clear()
+    list(re101.scan_tree(root, {'EMAIL': re.compile(r'\S+@\S+')}, cache=cache))
+    assert len(calls) == 4
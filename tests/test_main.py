@@ -0,0 +1,153 @@
+import gzip
+import io
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import re101
+from re101 import __main__
+from re101.__main__ import main
+
+PATTERNS = 'EMAIL,IPV4,STRICT_SSN'
+DATA = ''.join(
+    f'row {i} u{i}@example.com 10.0.{i % 256}.1 ssn 123-45-{i:04d} café\n' for i in range(200)
+).encode()
+
+
+def run(capsysbinary, *argv):
+    status = main(['scan', *argv])
+    out, err = capsysbinary.readouterr()
+    return status, out, err
+
+
+def test_jsonl_matches(tmp_path, capsysbinary):
+    path = tmp_path / 'data.log'
+    path.write_bytes(DATA)
+    status, out, _ = run(capsysbinary, '--patterns', PATTERNS, str(path))
+    assert status == 0
+    records = [json.loads(line) for line in out.splitlines()]
+    expected = re101.scan(DATA.decode(), PATTERNS.split(','))
+    assert [(r['pattern'], r['match']) for r in records] == [(m.pattern, m.match) for m in expected]
+    for r in records:
+        assert r['file'] == str(path)
+        assert DATA[r['offset'] :].startswith(r['match'].encode())
+
+
+def test_stdin_and_compressed_files(tmp_path, capsysbinary, monkeypatch):
+    path = tmp_path / 'data.gz'
+    path.write_bytes(gzip.compress(DATA))
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(DATA)))
+    _, from_stdin, _ = run(capsysbinary, '-p', 'EMAIL')
+    _, from_file, _ = run(capsysbinary, '-p', 'EMAIL', str(path))
+    stdin_records = [json.loads(line) for line in from_stdin.splitlines()]
+    file_records = [json.loads(line) for line in from_file.splitlines()]
+    assert {r['file'] for r in stdin_records} == {'<stdin>'}
+    assert [(r['offset'], r['match']) for r in stdin_records] == [
+        (r['offset'], r['match']) for r in file_records
+    ]
+
+
+def test_count_any_and_exit_status(tmp_path, capsysbinary):
+    hit = tmp_path / 'hit.log'
+    hit.write_bytes(DATA)
+    miss = tmp_path / 'miss.log'
+    miss.write_bytes(b'nothing to see\n')
+    status, out, _ = run(capsysbinary, '-p', PATTERNS, '--count', str(hit), str(miss))
+    assert status == 0
+    first, second = (json.loads(line) for line in out.splitlines())
+    assert first['counts'] == {'EMAIL': 200, 'IPV4': 200, 'STRICT_SSN': 200}
+    assert second['counts'] == {'EMAIL': 0, 'IPV4': 0, 'STRICT_SSN': 0}
+    status, out, _ = run(capsysbinary, '-p', PATTERNS, '--any', str(hit), str(miss))
+    assert (status, out) == (0, f'{hit}\n'.encode())
+    assert run(capsysbinary, '-p', PATTERNS, '--any', str(miss))[:2] == (1, b'')
+
+
+def test_redact(tmp_path, capsysbinary):
+    path = tmp_path / 'data.log'
+    path.write_bytes(b'mail bob@example.com from 10.0.0.7\n\xff raw\n')
+    status, out, _ = run(capsysbinary, '-p', 'EMAIL,IPV4', '--redact', str(path))
+    assert status == 0
+    assert out == b'mail [EMAIL] from [IPV4]\n\xff raw\n'
+
+
+def test_jobs_keeps_file_order(tmp_path, capsysbinary):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'data{i}.log'
+        path.write_bytes(f'u{i}@example.com\n'.encode())
+        paths.append(str(path))
+    status, out, _ = run(capsysbinary, '-p', 'EMAIL', '--jobs', '2', *paths)
+    assert status == 0
+    assert [json.loads(line)['file'] for line in out.splitlines()] == paths
+
+
+def test_jobs_output_goes_through_deleted_temporary_files(tmp_path, capsysbinary, monkeypatch):
+    scratch = tmp_path / 'scratch'
+    scratch.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(scratch))
+    path = tmp_path / 'data.log'
+    path.write_bytes(DATA * 5)
+    paths = [str(path), str(tmp_path / 'missing'), str(path)]
+    status, out, err = run(capsysbinary, '-p', PATTERNS, '--jobs', '2', *paths)
+    assert status == 2
+    assert b'missing' in err
+    _, single, _ = run(capsysbinary, '-p', PATTERNS, str(path))
+    assert out == single * 2
+    assert list(scratch.iterdir()) == []
+    # A worker hands back the name of a file rather than the output.
+    regexes = {name: getattr(re101, name) for name in PATTERNS.split(',')}
+    name, found, error = __main__._scan_to_file(str(path), regexes, 'matches')
+    assert (found, error) == (True, None)
+    assert Path(name).parent == scratch
+    assert Path(name).read_bytes() == single
+
+
+def test_errors(tmp_path, capsysbinary):
+    path = tmp_path / 'data.log'
+    path.write_bytes(DATA)
+    status, out, err = run(capsysbinary, '-p', 'EMAIL', str(tmp_path / 'missing'), str(path))
+    assert status == 2
+    assert out
+    assert b'missing' in err
+    with pytest.raises(SystemExit) as exc:
+        main(['scan', '-p', 'NOT_A_PATTERN', str(path)])
+    assert exc.value.code == 2
+    with pytest.raises(SystemExit):
+        main(['scan', '-p', 'EMAIL', '--count', '--any', str(path)])
+
+
+def test_python_dash_m(tmp_path):
+    path = tmp_path / 'data.log'
+    path.write_bytes(b'mail bob@example.com\n')
+    proc = subprocess.run(
+        [sys.executable, '-m', 're101', 'scan', '-p', 'EMAIL', str(path)],
+        capture_output=True,
+        check=False,
+    )
+    assert proc.returncode == 0
+    assert json.loads(proc.stdout)['match'] == 'bob@example.com'
+
+
+def test_redact_overlaps_follow_pattern_order(tmp_path, capsysbinary):
+    path = tmp_path / 'data.log'
+    path.write_bytes(b'call 2125551234\n')
+    _, out, _ = run(capsysbinary, '-p', 'US_PHONENUM,LOOSE_SSN', '--redact', str(path))
+    assert out == b'call [US_PHONENUM]\n'
+    _, out, _ = run(capsysbinary, '-p', 'LOOSE_SSN,US_PHONENUM', '--redact', str(path))
+    assert out == b'call [LOOSE_SSN]4\n'
+
+
+def test_block_edges_do_not_change_results(tmp_path, capsysbinary, monkeypatch):
+    monkeypatch.setattr('re101.__main__._CHUNK_SIZE', 50)
+    # Runs of whitespace across line breaks are split by block edges.
+    text = 'a \n  b\n' * 100 + 'call 2125551234\n\n\n'
+    path = tmp_path / 'data.log'
+    path.write_text(text)
+    _, out, _ = run(capsysbinary, '-p', 'MULT_WHITESPACE,US_PHONENUM', '--count', str(path))
+    assert json.loads(out)['counts'] == re101.count(text, ['MULT_WHITESPACE', 'US_PHONENUM'])
+    _, out, _ = run(capsysbinary, '-p', 'US_PHONENUM,LOOSE_SSN', '--redact', str(path))
+    assert out.decode() == re101.redact(text, ['US_PHONENUM', 'LOOSE_SSN'])
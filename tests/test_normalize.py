@@ -0,0 +1,108 @@
+import random
+import unicodedata
+
+import pytest
+
+import re101
+from re101 import ScanMatch, _normalize
+
+# Spaces of several kinds, characters that casefold or normalize to
+# more or fewer characters, and a combining accent.
+ALPHABET = ['a', 'B', 'z', '1', ' ', ' ', '\t', '\n', '　', 'ß', 'ﬁ', 'É', 'é', 'İ', '½']
+
+
+def legacy(text, whitespace, casefold, unicode):
+    if whitespace == 'all':
+        text = ' '.join(text.split())
+    elif whitespace:
+        text = re101.MULT_SPACES.sub(' ', re101.MULT_WHITESPACE.sub(' ', text))
+    if casefold:
+        text = text.casefold()
+    if unicode:
+        text = unicodedata.normalize(unicode, text)
+    return text
+
+
+def random_texts(seed, n=300):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield ''.join(rng.choice(ALPHABET) for _ in range(rng.randrange(0, 30)))
+
+
+OPTIONS = [
+    (True, False, None),
+    ('all', False, None),
+    (False, True, None),
+    (True, True, 'NFKC'),
+    ('all', True, 'NFC'),
+    (False, False, 'NFKD'),
+]
+
+
+@pytest.mark.parametrize(('whitespace', 'casefold', 'unicode'), OPTIONS)
+def test_normalize_matches_step_by_step_pipeline(whitespace, casefold, unicode):
+    for text in random_texts(hash((whitespace, casefold, unicode)) & 0xFFFF):
+        n = re101.normalize(text, whitespace, casefold, unicode)
+        assert n.text == legacy(text, whitespace, casefold, unicode), text
+        assert n.original is text
+
+
+@pytest.mark.parametrize(('whitespace', 'casefold', 'unicode'), OPTIONS)
+def test_spans_map_words_back(whitespace, casefold, unicode):
+    for text in random_texts(7):
+        n = re101.normalize(text, whitespace, casefold, unicode)
+        last = 0
+        for m in re101.WORD.finditer(n.text):
+            start, end = n.span(*m.span())
+            # Words cut from one rewritten character ('½' is '1⁄2' in
+            # NFKD) share its span, so spans may overlap, not go back.
+            assert last <= start <= end <= len(text)
+            last = start
+            # The original span normalizes to the word, perhaps within
+            # a longer rewritten run.
+            assert m.group() in legacy(text[start:end], whitespace, casefold, unicode), text
+
+
+def test_map_matches():
+    text = 'Mail  BOB@Example.COM\t\tfrom  ﬁle'
+    n = re101.normalize(text, casefold=True, unicode='NFKC')
+    assert n.text == 'mail bob@example.com from file'
+    (m,) = n.map_matches(re101.scan(n.text, 'EMAIL'))
+    assert m == ScanMatch('EMAIL', 6, 21, 'BOB@Example.COM')
+    assert n.span(26, 30) == (29, 32)
+    assert text[29:32] == 'ﬁle'
+
+
+def test_positions_inside_rewritten_characters():
+    n = re101.normalize('aß b', casefold=True)
+    assert n.text == 'ass b'
+    # A start inside 'ss' maps to the start of 'ß', an end to its end.
+    assert n.span(2, 2) == (1, 2)
+    assert n.span(0, 5) == (0, 4)
+
+
+def test_whitespace_all_drops_ends():
+    text = '\n  one\ttwo  \n'
+    n = re101.normalize(text, whitespace='all')
+    assert n.text == 'one two'
+    assert n.span(0, 3) == (3, 6)
+    assert n.span(4, 7) == (7, 10)
+    assert n.span(0, 7) == (3, 10)
+
+
+def test_unchanged_text_is_not_copied():
+    text = 'plain text, nothing to do'
+    n = re101.normalize(text, unicode='NFKC')
+    assert n.text is text
+    assert n.span(6, 10) == (6, 10)
+    assert n._offset_maps() == []
+
+
+def test_split_fast_path_only_where_equivalent():
+    for text in ['a  b', 'a\tb', ' a  b', 'a  b ', 'a\n\nb\nc', 'é  b']:
+        assert _normalize._collapse(text, True) == re101.MULT_WHITESPACE.sub(' ', text)
+
+
+def test_unknown_form():
+    with pytest.raises(ValueError, match='normalization form'):
+        re101.normalize('x', unicode='NFX')
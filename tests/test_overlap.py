@@ -0,0 +1,90 @@
+import array
+import random
+
+import re101
+from re101 import ScanMatch
+
+PHONE_OR_SSN = 'call 2125551234 or 212-555-1234'
+
+
+def brute_force(spans, priority):
+    """Keep each span, by priority then start, unless it overlaps a kept one."""
+    kept = []
+    for name in priority:
+        for s, e in zip(*spans[name], strict=True):
+            if not any(s < ke and ks < e for ks, ke, _ in kept):
+                kept.append((s, e, name))
+    return sorted(kept)
+
+
+def random_spans(rng, names):
+    spans = {}
+    for name in names:
+        starts, ends = [], []
+        pos = 0
+        for _ in range(rng.randrange(0, 12)):
+            pos += rng.randrange(0, 6)
+            starts.append(pos)
+            ends.append(pos + rng.randrange(0, 8))
+        pairs = sorted(zip(starts, ends, strict=True))
+        spans[name] = ([s for s, _ in pairs], [e for _, e in pairs])
+    return spans
+
+
+def test_resolve_spans_matches_brute_force():
+    rng = random.Random(50)
+    names = ['a', 'b', 'c', 'd']
+    for _ in range(500):
+        spans = random_spans(rng, names)
+        priority = rng.sample(names, len(names))
+        got = re101.resolve_spans(spans, priority)
+        got = list(zip(got.start, got.end, got.pattern, strict=True))
+        # Identical empty spans of two patterns do not overlap, and may
+        # come in either order.
+        assert sorted(got) == brute_force(spans, priority)
+        assert [s for s, _, _ in got] == sorted(s for s, _, _ in got)
+
+
+def test_resolve_spans_accepts_arrays_and_default_priority():
+    spans = {
+        'a': (array.array('q', [0, 10]), array.array('q', [5, 20])),
+        'b': ([3, 6, 21], [8, 9, 30]),
+    }
+    got = re101.resolve_spans(spans)
+    assert got.pattern == ['a', 'b', 'a', 'b']
+    assert list(got.start) == [0, 6, 10, 21]
+    got = re101.resolve_spans(spans, ['b'])
+    assert got.pattern == ['b', 'a', 'b']
+    assert list(got.start) == [3, 10, 21]
+    # Names with no spans are ignored.
+    assert re101.resolve_spans(spans, ['z', 'b']).pattern == ['b', 'a', 'b']
+
+
+def test_resolve_overlaps_priority():
+    matches = re101.scan(PHONE_OR_SSN, ['US_PHONENUM', 'LOOSE_SSN'])
+    assert len(matches) == 3
+    assert re101.resolve_overlaps(matches, ['US_PHONENUM', 'LOOSE_SSN']) == [
+        ScanMatch('US_PHONENUM', 5, 15, '2125551234'),
+        ScanMatch('US_PHONENUM', 19, 31, '212-555-1234'),
+    ]
+    assert re101.resolve_overlaps(matches, ['LOOSE_SSN'])[0] == ScanMatch(
+        'LOOSE_SSN', 5, 14, '212555123'
+    )
+    # By default, patterns rank in the order they first appear.
+    assert [m.pattern for m in re101.resolve_overlaps(matches)] == ['US_PHONENUM'] * 2
+
+
+def test_redact_priority():
+    text = 'card 4111-1111-1111-1111, mail bob@example.com'
+    patterns = ['STRICT_CREDIT_CARD', 'LOOSE_CREDIT_CARD', 'EMAIL', 'LOOSE_URL_DOMAIN']
+    assert re101.redact(text, patterns) == 'card [STRICT_CREDIT_CARD], mail [EMAIL]'
+    # LOOSE_URL_DOMAIN runs from the card number through 'mail'.
+    assert (
+        re101.redact(text, patterns, priority=['LOOSE_URL_DOMAIN'])
+        == 'card [LOOSE_URL_DOMAIN] [LOOSE_URL_DOMAIN]'
+    )
+    assert re101.redact(PHONE_OR_SSN, ['LOOSE_SSN', 'US_PHONENUM'], '<{pattern}>') == (
+        'call <LOOSE_SSN>4 or <US_PHONENUM>'
+    )
+    assert re101.redact(PHONE_OR_SSN, 'US_PHONENUM', '{match}') == PHONE_OR_SSN
+    assert re101.redact('nothing here', 'EMAIL') == 'nothing here'
@@ -0,0 +1,226 @@
+import concurrent.futures
+import multiprocessing
+import re
+from multiprocessing import forkserver
+
+import pytest
+
+import re101
+from re101 import _parallel
+
+PATTERNS = ['EMAIL', 'IPV4', 'STRICT_SSN']
+DOC = '\n'.join(
+    f'row {i} u{i}@example.com 10.0.{i % 256}.1 ssn 123-45-{i:04d}' for i in range(2000)
+)
+
+
+@pytest.mark.parametrize('threads', [1, 2, 4])
+@pytest.mark.parametrize('chunk_size', [None, 1, 500, 10**6])
+def test_scan_parallel_single_document_matches_scan(threads, chunk_size):
+    expected = re101.scan(DOC, PATTERNS)
+    assert re101.scan_parallel(DOC, PATTERNS, threads=threads, chunk_size=chunk_size) == expected
+
+
+@pytest.mark.parametrize('threads', [1, 3])
+def test_scan_parallel_batch_keeps_input_order(threads):
+    docs = DOC.splitlines()[:50]
+    result = re101.scan_parallel(docs, PATTERNS, threads=threads)
+    assert result == [re101.scan(d, PATTERNS) for d in docs]
+
+
+def test_scan_parallel_empty_inputs():
+    assert re101.scan_parallel('', PATTERNS, threads=2) == []
+    assert re101.scan_parallel([], PATTERNS, threads=2) == []
+
+
+def test_scan_parallel_rejects_zero_threads():
+    with pytest.raises(ValueError, match='threads'):
+        re101.scan_parallel(DOC, PATTERNS, threads=0)
+
+
+def test_line_chunks_cut_after_newlines():
+    text = 'aaaa\nbb\ncccccc\nd'
+    bounds = _parallel._line_chunks(text, 3)
+    assert ''.join(text[a:b] for a, b in bounds) == text
+    assert all(text[b - 1] == '\n' for _, b in bounds[:-1])
+
+
+def test_default_threads(monkeypatch):
+    monkeypatch.setattr(_parallel, '_gil_enabled', lambda: True)
+    assert _parallel._default_threads() == 1
+    monkeypatch.setattr(_parallel, '_gil_enabled', lambda: False)
+    assert _parallel._default_threads() >= 1
+    assert re101.scan_parallel(DOC, PATTERNS) == re101.scan(DOC, PATTERNS)
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'process'])
+def test_scan_parallel_isolated_backends_match_scan(backend):
+    expected = re101.scan(DOC, PATTERNS)
+    got = re101.scan_parallel(DOC, PATTERNS, threads=2, chunk_size=2000, backend=backend)
+    assert got == expected
+    docs = DOC.splitlines()[:20]
+    assert re101.scan_parallel(docs, PATTERNS, threads=2, backend=backend) == [
+        re101.scan(d, PATTERNS) for d in docs
+    ]
+
+
+# Anchored, lookbehind and multi-line patterns see piece edges if the
+# pieces are matched one by one.
+EDGE_PATTERNS = {
+    'number': re101.Number(),
+    'runs': re101.MULT_WHITESPACE,
+    'line_end': re.compile(r'\w+$'),
+    'after_blank': re.compile(r'(?<=\n\n)\w+'),
+    'before_blank': re.compile(r'\w+(?=\n\n)'),
+}
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+@pytest.mark.parametrize('line', ['1 a 2\n', 'x\n\n', 'y é 3\n\n\n  \n'])
+def test_scan_parallel_pieces_are_not_matched_on_their_own(monkeypatch, backend, line):
+    text = line * 50000
+    monkeypatch.setattr(_parallel, '_TAIL', 3)
+    expected = re101.scan(text, EDGE_PATTERNS)
+    for chunk_size in (None, 1000):
+        got = re101.scan_parallel(
+            text, EDGE_PATTERNS, threads=4, chunk_size=chunk_size, backend=backend
+        )
+        assert got == expected
+
+
+def test_scan_parallel_matches_running_over_several_pieces():
+    text = 'a' + ' \n' * 10000 + 'b 1\n' + '\n' * 3000
+    expected = re101.scan(text, EDGE_PATTERNS)
+    assert re101.scan_parallel(text, EDGE_PATTERNS, threads=2, chunk_size=10) == expected
+
+
+def test_isolated_pool_falls_back_to_processes(monkeypatch):
+    monkeypatch.delattr(concurrent.futures, 'InterpreterPoolExecutor', raising=False)
+    with _parallel._isolated_pool('interpreter', 1) as pool:
+        assert isinstance(pool, concurrent.futures.ProcessPoolExecutor)
+
+
+def test_isolated_pool_prefers_interpreters(monkeypatch):
+    sentinel = object()
+    monkeypatch.setattr(
+        concurrent.futures,
+        'InterpreterPoolExecutor',
+        lambda max_workers: sentinel,
+        raising=False,
+    )
+    assert _parallel._isolated_pool('interpreter', 2) is sentinel
+
+
+def test_scan_parallel_rejects_unknown_backend():
+    with pytest.raises(ValueError, match='backend'):
+        re101.scan_parallel(DOC, PATTERNS, backend='gpu')
+
+
+def _byte_spans(data: bytes, pattern: str) -> list[tuple[int, int]]:
+    text = data.decode('utf-8', 'surrogateescape')
+    return [
+        (
+            len(text[: m.start].encode('utf-8', 'surrogateescape')),
+            len(text[: m.end].encode('utf-8', 'surrogateescape')),
+        )
+        for m in re101.scan(text, pattern)
+    ]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_scan_file_sharded_byte_offsets(tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(_parallel, '_MAX_SHARD', 97)
+    data = ('café ✓ ' + DOC[:3000]).encode() + b'\xff bad byte x@y.com\n'
+    path = tmp_path / 'big.log'
+    path.write_bytes(data)
+    matches = re101.scan_file_sharded(path, PATTERNS, workers=workers)
+    assert [m.match for m in matches] == [
+        m.match for m in re101.scan(data.decode('utf-8', 'replace'), PATTERNS)
+    ]
+    for m in matches:
+        assert data[m.start : m.end].decode() == m.match
+    assert [(m.start, m.end) for m in matches if m.pattern == 'EMAIL'] == _byte_spans(data, 'EMAIL')
+
+
+def test_scan_file_sharded_no_duplicates_at_edges(tmp_path):
+    path = tmp_path / 'edges.log'
+    path.write_text('a@b.com\n' * 100)
+    matches = re101.scan_file_sharded(str(path), 'EMAIL', workers=3)
+    assert [m.start for m in matches] == list(range(0, 800, 8))
+
+
+@pytest.mark.parametrize('workers', [1, 2, 3, 4])
+@pytest.mark.parametrize('max_shard', [1000, 1 << 26])
+def test_scan_file_sharded_is_independent_of_workers(tmp_path, monkeypatch, workers, max_shard):
+    monkeypatch.setattr(_parallel, '_MAX_SHARD', max_shard)
+    data = ('1 a 2\n' * 50000 + 'x\n\n' * 1000 + 'é 3\n\n  \n' * 500).encode()
+    path = tmp_path / 'big.log'
+    path.write_bytes(data)
+    patterns = {'number': re101.Number(), 'runs': re101.MULT_WHITESPACE}
+    got = re101.scan_file_sharded(path, patterns, workers=workers)
+    text = data.decode()
+    assert [m.match for m in got] == [m.match for m in re101.scan(text, patterns)]
+    for name in patterns:
+        assert [(m.start, m.end) for m in got if m.pattern == name] == _byte_spans(
+            data, patterns[name]
+        )
+
+
+def test_scan_file_sharded_empty_file_and_bad_workers(tmp_path):
+    path = tmp_path / 'empty.log'
+    path.write_bytes(b'')
+    assert re101.scan_file_sharded(path, PATTERNS) == []
+    with pytest.raises(ValueError, match='workers'):
+        re101.scan_file_sharded(path, PATTERNS, workers=0)
+
+
+def test_worker_pool_scans_by_name():
+    custom = re.compile(r'\d+x')
+    sets = {'pii': ['EMAIL', 'STRICT_SSN'], 'custom': [custom]}
+    with re101.WorkerPool(sets, workers=2) as pool:
+        assert pool.scan(DOC, 'pii') == re101.scan(DOC, ['EMAIL', 'STRICT_SSN'])
+        assert pool.submit('12x y', 'custom').result() == re101.scan('12x y', [custom])
+        docs = DOC.splitlines()[:100]
+        assert list(pool.map(docs, ['IPV4'], chunksize=7)) == [re101.scan(d, 'IPV4') for d in docs]
+        assert pool.scan('10.0.0.1', 'IPV4')[0].match == '10.0.0.1'
+        with pytest.raises(TypeError, match='pattern set'):
+            pool.submit('x', [custom])
+        with pytest.raises(ValueError, match='not a re101 pattern'):
+            pool.submit('x', 'NOPE')
+        with pytest.raises(ValueError, match='not a re101 pattern'):
+            pool.map(docs, 'NOPE')
+
+
+def test_worker_pool_sends_names_not_patterns():
+    refs = _parallel._pattern_refs(['EMAIL', re.compile(r'a+', re.I)])
+    assert refs == {'EMAIL': 'EMAIL', 'a+': ('a+', re.I | re.UNICODE)}
+    _parallel._init_worker({'s': refs})
+    try:
+        # Constants are the ones compiled when re101 was imported.
+        assert _parallel._worker_sets['s']['EMAIL'] is re101.EMAIL
+        assert _parallel._worker_sets['s']['a+'].flags & re.I
+    finally:
+        _parallel._worker_sets.clear()
+
+
+def test_worker_pool_rejects_zero_workers():
+    with pytest.raises(ValueError, match='workers'):
+        re101.WorkerPool(workers=0)
+
+
+@pytest.mark.skipif(
+    'forkserver' not in multiprocessing.get_all_start_methods(), reason='no forkserver'
+)
+def test_worker_pool_leaves_a_running_forkserver_alone(monkeypatch):
+    server = forkserver.ForkServer()
+    monkeypatch.setattr(forkserver, '_forkserver', server)
+    monkeypatch.setattr(forkserver, 'set_forkserver_preload', server.set_forkserver_preload)
+    context = multiprocessing.get_context('forkserver')
+    _parallel._preload_re101(context)
+    assert server._preload_modules == ['__main__', 're101']
+
+    server._preload_modules = ['__main__']
+    server._forkserver_pid = 1
+    with pytest.warns(RuntimeWarning, match='already running'):
+        _parallel._preload_re101(context)
+    assert server._preload_modules == ['__main__']
@@ -0,0 +1,220 @@
+import array
+import re
+import tracemalloc
+
+import pytest
+
+import re101
+from re101 import ScanMatch, _scan
+
+TEXT = 'mail bob@example.com from 192.168.0.1 or alice@example.org'
+
+
+def test_scan_orders_matches_by_offset():
+    assert re101.scan(TEXT, ['EMAIL', 'IPV4']) == [
+        ScanMatch('EMAIL', 5, 20, 'bob@example.com'),
+        ScanMatch('IPV4', 26, 37, '192.168.0.1'),
+        ScanMatch('EMAIL', 41, 58, 'alice@example.org'),
+    ]
+
+
+def test_scan_accepts_single_name_and_patterns():
+    by_name = re101.scan(TEXT, 'EMAIL')
+    assert by_name == re101.scan(TEXT, re101.EMAIL)
+    assert re101.scan(TEXT, {'mail': re101.EMAIL})[0].pattern == 'mail'
+
+
+def test_scan_names_foreign_patterns_by_source():
+    regex = re.compile(r'\d+\.\d+')
+    assert re101.scan('v 1.5', [regex]) == [ScanMatch(r'\d+\.\d+', 2, 5, '1.5')]
+
+
+def test_scan_pos_endpos():
+    assert re101.scan(TEXT, 'EMAIL', pos=21) == [ScanMatch('EMAIL', 41, 58, 'alice@example.org')]
+    assert re101.scan(TEXT, 'EMAIL', endpos=21) == [ScanMatch('EMAIL', 5, 20, 'bob@example.com')]
+
+
+def test_scan_ties_keep_pattern_order():
+    matches = re101.scan('123-45-6789', ['STRICT_SSN', 'LOOSE_SSN'])
+    assert [m.pattern for m in matches] == ['STRICT_SSN', 'LOOSE_SSN']
+
+
+@pytest.mark.parametrize('bad', ['NOPE', 'MONEYSIGN', 'scan'])
+def test_scan_rejects_unknown_names(bad):
+    with pytest.raises(ValueError, match='not a re101 pattern'):
+        re101.scan(TEXT, bad)
+
+
+PII = ['STRICT_SSN', 'STRICT_CREDIT_CARD', 'EMAIL', 'PASSWORD']
+
+
+def test_contains_any_single_and_records():
+    assert re101.contains_any('ssn 123-45-6789', PII) is True
+    assert re101.contains_any('nothing to see', PII) is False
+    records = ['password: x', 'clean', 'card 4400 6940 3849 3940']
+    assert re101.contains_any(records, PII) == [True, False, True]
+    assert re101.contains_any(iter(records), PII) == [True, False, True]
+
+
+def test_contains_any_tries_cheapest_first():
+    order = [r.pattern for r in _scan._by_cost(_scan._resolve_patterns(PII))]
+    assert order[0] == re101.STRICT_SSN.pattern
+    assert order == sorted(order, key=len)
+
+
+def test_count_single_and_records():
+    text = 'a@b.com c@d.com 123-45-6789'
+    assert re101.count(text, ['EMAIL', 'STRICT_SSN', 'IPV4']) == {
+        'EMAIL': 2,
+        'STRICT_SSN': 1,
+        'IPV4': 0,
+    }
+    assert re101.count([text, 'e@f.com'], 'EMAIL') == {'EMAIL': 3}
+
+
+LOG = ''.join(
+    f'GET /health from 10.0.0.{i % 3} ok\n' if i % 4 else f'mail u{i}@example.com café\n'
+    for i in range(200)
+)
+
+
+def test_line_memo_gives_same_matches_as_scan():
+    memo = re101.LineMemo()
+    patterns = ['EMAIL', 'IPV4']
+    assert re101.scan(LOG, patterns, memo=memo) == re101.scan(LOG, patterns)
+    assert memo.misses == 3 + 50
+    assert memo.hits == 200 - memo.misses
+    assert memo.hit_rate == memo.hits / 200
+    # A second pass is answered entirely from the cache.
+    assert re101.scan(LOG, patterns, memo=memo) == re101.scan(LOG, patterns)
+    assert memo.misses == 53
+
+
+def test_line_memo_pos_endpos_and_last_line():
+    memo = re101.LineMemo()
+    text = 'a 1.2.3.4\nb 1.2.3.4'
+    assert re101.scan(text, 'IPV4', 2, memo=memo) == re101.scan(text, 'IPV4', 2)
+    assert len(memo) == 2  # the last line has no newline, so differs
+
+
+def test_line_memo_matches_each_line_on_its_own():
+    text = '5 apples\n7 pears'
+    assert [m.match for m in re101.scan(text, re101.Number())] == ['5']
+    assert [m.match for m in re101.scan(text, re101.Number(), memo=re101.LineMemo())] == ['5', '7']
+
+
+def test_line_memo_hashes_long_lines():
+    memo = re101.LineMemo(max_key_chars=10)
+    text = 'x' * 50 + ' 10.0.0.1\n' + 'short\n'
+    re101.scan(text, 'IPV4', memo=memo)
+    keys = list(memo._cache)
+    assert isinstance(keys[0], bytes)
+    assert len(keys[0]) == 16
+    assert keys[1] == 'short\n'
+
+
+def test_line_memo_evicts_to_stay_under_cap():
+    memo = re101.LineMemo(max_bytes=2000)
+    text = ''.join(f'line {i} 10.0.0.{i % 256}\n' for i in range(100))
+    assert re101.scan(text, 'IPV4', memo=memo) == re101.scan(text, 'IPV4')
+    assert memo.size <= 2000
+    assert memo.evictions == 100 - len(memo)
+    assert len(memo) < 100
+    # The most recent lines are the ones kept.
+    assert list(memo._cache)[-1] == 'line 99 10.0.0.99\n'
+
+
+def test_line_memo_skips_entries_larger_than_cap():
+    memo = re101.LineMemo(max_bytes=10)
+    assert re101.scan('1.2.3.4\n', 'IPV4', memo=memo)
+    assert len(memo) == 0
+    assert memo.size == 0
+
+
+def test_line_memo_is_bound_to_its_patterns():
+    memo = re101.LineMemo()
+    re101.scan(LOG, 'IPV4', memo=memo)
+    with pytest.raises(ValueError, match='other patterns'):
+        re101.scan(LOG, 'EMAIL', memo=memo)
+    memo.clear()
+    assert (len(memo), memo.hits, memo.misses, memo.hit_rate) == (0, 0, 0, 0.0)
+    re101.scan(LOG, 'EMAIL', memo=memo)
+    assert 'hit rate' in repr(memo)
+
+
+def test_scan_buffer_matches_str_scan():
+    names = ['EMAIL', 'IPV4', 'STRICT_SSN', 'DATETIME', 'US_ZIPCODE']
+    text = 'mail bob@example.com from 10.0.0.7 ssn 123-45-6789 at 2026-10-19T08:30:00Z in 94107'
+    expected = re101.scan(text, names)
+    assert expected
+    for buffer in (text.encode(), bytearray(text.encode()), memoryview(text.encode())):
+        assert re101.scan(buffer, names) == expected
+
+
+def test_scan_buffer_window_offsets_and_isolation():
+    buf = bytearray(64)
+    n = len(b'stale 10.0.0.1 ')
+    buf[:n] = b'stale 10.0.0.1 '
+    packet = b'12.0.0.2 to a@b.com'
+    buf[n : n + len(packet)] = packet
+    got = re101.scan(memoryview(buf), ['IPV4', 'EMAIL'], n, n + len(packet))
+    assert got == [
+        ScanMatch('IPV4', n, n + 8, '12.0.0.2'),
+        ScanMatch('EMAIL', n + 12, n + 19, 'a@b.com'),
+    ]
+    # The window is matched on its own: the stale digit before it does
+    # not stop \b from matching at its start.
+    buf[n - 1 : n] = b'9'
+    assert re101.scan(buf, 'IPV4', n, n + len(packet))[0].start == n
+    # No view is left behind, so the buffer can still be resized.
+    buf.extend(b'more')
+
+
+def test_scan_buffer_non_byte_format_and_utf8():
+    data = 'café a@b.com'.encode()
+    signed = array.array('b')
+    signed.frombytes(data)
+    for view in (memoryview(signed), memoryview(data).cast('c')):
+        (m,) = re101.scan(view, 'EMAIL')
+        # Byte offsets: 'é' is two bytes.
+        assert (m.start, m.end, m.match) == (6, 13, 'a@b.com')
+
+
+def test_buffers_reject_memo_and_non_ascii_patterns():
+    with pytest.raises(TypeError, match='memo'):
+        re101.scan(b'x', 'EMAIL', memo=re101.LineMemo())
+    with pytest.raises(ValueError, match='non-ASCII'):
+        re101.scan(b'$5', 'MONEY')
+    with pytest.raises(ValueError, match='bytes-mode'):
+        re101.scan(b'x', [re.compile(r'\N{BULLET}')])
+
+
+def test_contains_any_and_count_on_buffers():
+    buf = bytearray(b'a@b.com c@d.org 10.0.0.1 ') + bytearray(100)
+    assert re101.contains_any(buf, ['EMAIL', 'IPV4']) is True
+    assert re101.contains_any(memoryview(buf)[16:], 'EMAIL') is False
+    assert re101.count(memoryview(buf), ['EMAIL', 'IPV4']) == {'EMAIL': 2, 'IPV4': 1}
+
+
+def traced_peak(fn):
+    fn()  # Compile and cache the bytes patterns first.
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def test_buffer_scans_do_not_copy_the_window():
+    size = 4 << 20
+    buf = bytearray(size)
+    buf[1000:1020] = b'x a@b.com 10.0.0.1 x'
+    view = memoryview(buf)
+    names = ['EMAIL', 'IPV4']
+    for fn in (
+        lambda: re101.scan(view, names, 500, size - 500),
+        lambda: re101.contains_any(view[size // 2 :], names),
+        lambda: re101.count(buf, names),
+    ):
+        # Decoding or slicing the window would allocate megabytes.
+        assert traced_peak(fn) < 64 << 10
@@ -0,0 +1,125 @@
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import re101
+from re101.sketch import CountMinSketch, HyperLogLog, MatchSketch
+
+
+def _emails(n, seed=0):
+    rng = random.Random(seed)
+    return [f'user{rng.randrange(n)}@example.com' for _ in range(n)]
+
+
+@pytest.mark.parametrize('n', [0, 1, 10, 1000, 50_000])
+def test_hyperloglog_estimate(n):
+    hll = HyperLogLog(12)
+    for i in range(n):
+        hll.add(f'item-{i}')
+        hll.add(f'item-{i}')
+    # 1.04 / sqrt(4096) is about 1.6%; allow three standard errors.
+    assert abs(hll.count() - n) <= max(0.05 * n, 1)
+
+
+def test_hyperloglog_merge_matches_single_sketch():
+    a, b, both = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    for i in range(3000):
+        (a if i % 2 else b).add(str(i))
+        both.add(str(i))
+    assert a.merge(b).registers == both.registers
+    with pytest.raises(ValueError, match='precision'):
+        a.merge(HyperLogLog(11))
+
+
+def test_hyperloglog_round_trip():
+    hll = HyperLogLog(8)
+    for i in range(500):
+        hll.add(str(i))
+    again = HyperLogLog.from_bytes(hll.to_bytes())
+    assert again.precision == 8
+    assert again.registers == hll.registers
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(b'nope')
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(hll.to_bytes()[:-1])
+
+
+@pytest.mark.parametrize('precision', [3, 19])
+def test_hyperloglog_precision_bounds(precision):
+    with pytest.raises(ValueError):
+        HyperLogLog(precision)
+
+
+def test_count_min_never_undercounts():
+    cms = CountMinSketch(width=64, depth=3)
+    truth = {}
+    rng = random.Random(1)
+    for _ in range(5000):
+        item = str(int(rng.paretovariate(1.2)))
+        truth[item] = truth.get(item, 0) + 1
+        cms.add(item)
+    assert cms.total == 5000
+    for item, n in truth.items():
+        assert cms.estimate(item) >= n
+    assert cms.estimate('1') <= truth['1'] + 5000 * 2.72 / 64
+
+
+def test_count_min_merge_and_round_trip():
+    a, b = CountMinSketch(32, 2), CountMinSketch(32, 2)
+    a.add('x', 3)
+    b.add('x', 4)
+    b.add('y')
+    a.merge(b)
+    assert a.estimate('x') >= 7
+    assert a.total == 8
+    again = CountMinSketch.from_bytes(a.to_bytes())
+    assert (again.width, again.depth, again.total) == (32, 2, 8)
+    assert again.counts == a.counts
+    with pytest.raises(ValueError, match='shape'):
+        a.merge(CountMinSketch(16, 2))
+
+
+def test_match_sketch_distinct_and_top():
+    emails = _emails(2000)
+    text = ' '.join(emails + ['10.0.0.1'] * 50 + ['10.0.0.2'])
+    sk = MatchSketch(precision=12, top=3)
+    sk.update(re101.scan(text, ['EMAIL', 'IPV4']))
+    distinct = sk.distinct()
+    assert abs(distinct['EMAIL'] - len(set(emails))) <= 0.05 * len(set(emails))
+    assert distinct['IPV4'] == 2
+    top = sk.top()
+    assert top['IPV4'][0] == ('10.0.0.1', 50)
+    assert len(top['EMAIL']) == 3
+
+
+def test_match_sketch_without_top():
+    sk = MatchSketch(top=0)
+    sk.update(re101.scan('a@b.com', 'EMAIL'))
+    assert sk.patterns['EMAIL'].cms is None
+    assert sk.top() == {'EMAIL': []}
+
+
+def _sketch_part(texts):
+    sk = MatchSketch(precision=10, top=2, width=256)
+    for t in texts:
+        sk.update(re101.scan(t, ['EMAIL', 'IPV4']))
+    return sk.to_bytes()
+
+
+def test_match_sketch_merges_across_processes():
+    # 10.0.0.0 is seen 6 times in 10, 10.0.0.1 3 times, 10.0.0.2 once.
+    texts = [f'ping 10.0.0.{(i % 10 > 5) + (i % 10 > 8)} from u{i}@example.com' for i in range(300)]
+    whole = MatchSketch.from_bytes(_sketch_part(texts))
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        parts = list(pool.map(_sketch_part, [texts[::2], texts[1::2]]))
+    merged = MatchSketch.from_bytes(parts[0]).merge(MatchSketch.from_bytes(parts[1]))
+    assert merged.distinct() == whole.distinct()
+    assert merged.top()['IPV4'] == whole.top()['IPV4'] == [('10.0.0.0', 180), ('10.0.0.1', 90)]
+    assert pickle.loads(pickle.dumps(merged)).distinct() == merged.distinct()
+
+
+def test_match_sketch_merge_rejects_other_parameters():
+    with pytest.raises(ValueError, match='parameters'):
+        MatchSketch(top=1).merge(MatchSketch(top=2))
@@ -0,0 +1,65 @@
+import io
+import tracemalloc
+
+import pytest
+
+import re101
+
+TEXT = (
+    'It was only slowly, and quite really, that the family of Holyoke replied: '
+    'ça va, naïvely_ok 42 times.\n'
+) * 20
+
+
+def words(text):
+    return [m.span() for m in re101.WORD.finditer(text)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 16])
+def test_tokenize_matches_word_across_chunks(chunk_size):
+    assert list(re101.tokenize(TEXT, chunk_size=chunk_size)) == words(TEXT)
+
+
+def test_tokenize_file_and_chunk_stream():
+    assert list(re101.tokenize(io.StringIO(TEXT), chunk_size=10)) == words(TEXT)
+    assert list(re101.tokenize(TEXT.splitlines(keepends=True))) == words(TEXT)
+    # Chunks may cut words anywhere.
+    assert list(re101.tokenize(['sl', 'ow', 'ly go', 'ne'])) == [(0, 6), (7, 11)]
+    assert list(re101.tokenize('')) == []
+
+
+def test_adverb_tags():
+    tagged = list(re101.tokenize(TEXT, adverbs=True, chunk_size=5))
+    got = [TEXT[s:e] for s, e, adverb in tagged if adverb]
+    assert got[:3] == ['only', 'slowly', 'really']
+    expected = [w for w in re101.WORD.findall(TEXT) if w.endswith('ly') and len(w) > 2]
+    assert got == expected
+    # Unlike ADVERB.findall(), "Holy" inside "Holyoke" is not an adverb.
+    assert 'Holy' in re101.ADVERB.findall(TEXT)
+    assert 'Holy' not in got
+
+
+def test_tokenize_arrays():
+    batches = list(re101.tokenize_arrays(TEXT, adverbs=True, chunk_size=100))
+    assert len(batches) > 1
+    spans = [(s, e) for b in batches for s, e in zip(b.start, b.end, strict=True)]
+    assert spans == words(TEXT)
+    flags = [bool(a) for b in batches for a in b.adverb]
+    assert flags == [t[2] for t in re101.tokenize(TEXT, adverbs=True)]
+    assert next(re101.tokenize_arrays(TEXT)).adverb is None
+
+
+def peak_memory(n):
+    source = io.StringIO(TEXT * n)
+    tracemalloc.start()
+    for _ in re101.tokenize(source, adverbs=True):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def test_peak_memory_does_not_grow_with_document():
+    # Both documents span many 64K-character chunks; the StringIO is
+    # created before tracing starts.
+    assert peak_memory(400) < 1.2 * peak_memory(80)
@@ -0,0 +1,123 @@
+import itertools
+import random
+from re import Pattern
+
+import pytest
+
+import re101
+from re101 import validate
+
+from .test_batch import CONSTANTS, VALUES
+
+
+@pytest.mark.parametrize('name', CONSTANTS)
+def test_validators_agree_with_fullmatch(name):
+    regex = getattr(re101, name)
+    check = getattr(validate, name)
+    for value in VALUES:
+        assert check(value) is (regex.fullmatch(value) is not None), value
+
+
+def _octets():
+    digits = '0123456789'
+    for n in range(1, 5):
+        for t in itertools.product(digits, repeat=n):
+            yield ''.join(t)
+
+
+def test_ipv4_agrees_with_regex_on_every_octet():
+    octets = [*_octets(), '', '-1', '1a', '١']
+    for octet in octets:
+        value = f'1.2.3.{octet}'
+        assert validate.IPV4(value) is (re101.IPV4.fullmatch(value) is not None), value
+    for value in ['1.2.3', '1.2.3.4.5', '1..2.3', ' 1.2.3.4', '1.2.3.4\n']:
+        assert validate.IPV4(value) is (re101.IPV4.fullmatch(value) is not None), value
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        '12345',
+        '12345-6789',
+        '1234',
+        '123456',
+        '12345-678',
+        '12345 6789',
+        '1234a',
+        '١' * 5,
+        '12345-',
+    ],
+)
+def test_zipcode_fast_path_agrees_with_regex(value):
+    assert validate.US_ZIPCODE(value) is (re101.US_ZIPCODE.fullmatch(value) is not None)
+
+
+def test_validators_are_cached_and_importable():
+    assert validate.EMAIL is validate.EMAIL
+    from re101.validate import IPV4
+
+    assert IPV4('10.0.0.1')
+
+
+@pytest.mark.parametrize('name', ['MONEYSIGN', 'Number', 'nope'])
+def test_non_patterns_are_not_validators(name):
+    with pytest.raises(AttributeError):
+        getattr(validate, name)
+
+
+def test_validate_many():
+    assert list(validate.validate_many('EMAIL', ['a@b.com', 'x a@b.com'])) == [True, False]
+    assert list(validate.validate_many(re101.Integer(), ['1,000', '1.5'])) == [True, False]
+    number = re101.Number()
+    assert isinstance(number, Pattern)
+    assert list(validate.validate_many(number, ['1.5'])) == [True]
+
+
+def _reference_luhn(number):
+    total = 0
+    for i, d in enumerate(reversed([int(c) for c in number])):
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+# Published test numbers for each brand.
+CARDS = [
+    '4111111111111111',
+    '4012888888881881',
+    '5555555555554444',
+    '378282246310005',
+    '6011111111111117',
+]
+
+
+@pytest.mark.parametrize('number', CARDS)
+def test_luhn_accepts_test_cards(number):
+    assert validate.luhn(number)
+    assert validate.luhn(' '.join([number[:4], number[4:8], number[8:12], number[12:]]))
+    assert validate.luhn(f'{number[:4]}-{number[4:]}')
+    assert not validate.luhn(number[:-1] + str((int(number[-1]) + 1) % 10))
+
+
+def test_luhn_agrees_with_reference():
+    rng = random.Random(41)
+    for _ in range(5000):
+        number = ''.join(rng.choices('0123456789', k=rng.randint(1, 19)))
+        assert validate.luhn(number) is _reference_luhn(number), number
+
+
+@pytest.mark.parametrize('value', ['', ' - ', '4111a11111111111', '4111.1111.1111.1111', '٤x'])
+def test_luhn_rejects_non_numbers(value):
+    assert not validate.luhn(value)
+
+
+def test_luhn_reads_unicode_digits():
+    assert validate.luhn('٤١١١١١١١١١١١١١١١')
+    assert not validate.luhn('٤١١١١١١١١١١١١١١٢')
+
+
+def test_luhn_many():
+    assert list(validate.luhn_many([*CARDS, '4111111111111112'])) == [True] * len(CARDS) + [False]